@@ -6,7 +6,9 @@ CREATE TABLE tournament (
   name VARCHAR(100) NOT NULL,
   start_date DATE NOT NULL,
   end_date DATE NULL,
-  is_active TINYINT(1) NOT NULL DEFAULT 1
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  version INT NOT NULL DEFAULT 0,
+  archived_at DATETIME NULL  -- matches moved to the archive_* tables
 );
 
 -- =========================
@@ -17,7 +19,8 @@ CREATE TABLE team (
   name VARCHAR(100) NOT NULL,
   class_name VARCHAR(20) NOT NULL,
   rating FLOAT NOT NULL,
-  is_deleted TINYINT(1) NOT NULL DEFAULT 0
+  is_deleted TINYINT(1) NOT NULL DEFAULT 0,
+  version INT NOT NULL DEFAULT 0
 );
 
 -- =========================
@@ -30,6 +33,7 @@ CREATE TABLE player (
   last_name VARCHAR(50) NOT NULL,
   birth_date DATE NOT NULL,
   position VARCHAR(3) NOT NULL,
+  version INT NOT NULL DEFAULT 0,
   CONSTRAINT chk_player_position
     CHECK (position IN ('GK','DEF','MID','ATT')),
   CONSTRAINT fk_player_team
@@ -48,6 +52,17 @@ CREATE TABLE matches (
   status VARCHAR(10) NOT NULL,
   is_overtime TINYINT(1) NOT NULL DEFAULT 0,
 
+  -- Bumped on every change except the score counters (optimistic concurrency)
+  version INT NOT NULL DEFAULT 0,
+
+  -- Denormalized from match_event (MatchScoreRepository)
+  home_goals INT NOT NULL DEFAULT 0,
+  away_goals INT NOT NULL DEFAULT 0,
+  home_yellows INT NOT NULL DEFAULT 0,
+  away_yellows INT NOT NULL DEFAULT 0,
+  home_reds INT NOT NULL DEFAULT 0,
+  away_reds INT NOT NULL DEFAULT 0,
+
   CONSTRAINT chk_match_status
     CHECK (status IN ('scheduled','live','finished','cancelled')),
 
@@ -61,7 +76,9 @@ CREATE TABLE matches (
     FOREIGN KEY (away_team_id) REFERENCES team(team_id),
 
   CONSTRAINT chk_match_teams
-    CHECK (home_team_id <> away_team_id)
+    CHECK (home_team_id <> away_team_id),
+
+  INDEX idx_match_status_start (status, start_time)
 );
 
 -- =========================
@@ -70,12 +87,14 @@ CREATE TABLE matches (
 CREATE TABLE match_event (
   event_id INT AUTO_INCREMENT PRIMARY KEY,
   match_id INT NOT NULL,
+  tournament_id INT NOT NULL,  -- of the match; partition key (sql/partition_match_event.sql)
   player_id INT NULL,
   team_id INT NOT NULL,
   minute INT NOT NULL,
   event_type VARCHAR(10) NOT NULL,
   xg FLOAT NULL,
   created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  version INT NOT NULL DEFAULT 0,
 
   CONSTRAINT chk_event_type
     CHECK (event_type IN ('goal','own_goal','yellow','red')),
@@ -89,7 +108,9 @@ CREATE TABLE match_event (
     ON DELETE SET NULL,
 
   CONSTRAINT fk_event_team
-    FOREIGN KEY (team_id) REFERENCES team(team_id)
+    FOREIGN KEY (team_id) REFERENCES team(team_id),
+
+  INDEX idx_event_tournament_match (tournament_id, match_id)
 );
 
 -- =========================
@@ -101,6 +122,7 @@ CREATE TABLE referee (
   email VARCHAR(120) NOT NULL UNIQUE,
   level VARCHAR(10) NOT NULL,
   active TINYINT(1) NOT NULL DEFAULT 1,
+  version INT NOT NULL DEFAULT 0,
 
   CONSTRAINT chk_referee_level
     CHECK (level IN ('student','teacher','external'))
@@ -120,4 +142,189 @@ CREATE TABLE match_referee (
 
   CONSTRAINT fk_mr_referee
     FOREIGN KEY (referee_id) REFERENCES referee(referee_id)
-);
\ No newline at end of file
+);
+
+-- =========================
+-- team_rating_history
+-- =========================
+CREATE TABLE team_rating_history (
+  history_id INT AUTO_INCREMENT PRIMARY KEY,
+  team_id INT NOT NULL,
+  match_id INT NOT NULL,
+  match_time DATETIME NOT NULL,
+  rating_before FLOAT NOT NULL,
+  rating_after FLOAT NOT NULL,
+
+  CONSTRAINT uq_rating_match_team
+    UNIQUE (match_id, team_id),
+
+  INDEX idx_rating_team_time (team_id, match_time),
+
+  CONSTRAINT fk_rating_team
+    FOREIGN KEY (team_id) REFERENCES team(team_id),
+
+  CONSTRAINT fk_rating_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
+
+
+-- =========================
+-- player_tournament_stats (rollup of match_event)
+-- =========================
+CREATE TABLE player_tournament_stats (
+  tournament_id INT NOT NULL,
+  player_id INT NOT NULL,
+  team_id INT NOT NULL,
+  goals INT NOT NULL DEFAULT 0,
+  own_goals INT NOT NULL DEFAULT 0,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  xg_sum FLOAT NOT NULL DEFAULT 0,
+  matches_with_events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, player_id),
+
+  INDEX idx_pts_goals (tournament_id, goals),
+  INDEX idx_pts_cards (tournament_id, reds, yellows),
+
+  CONSTRAINT fk_pts_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_pts_player
+    FOREIGN KEY (player_id) REFERENCES player(player_id)
+    ON DELETE CASCADE
+);
+
+-- =========================
+-- team_tournament_stats (rollup of match_event)
+-- =========================
+CREATE TABLE team_tournament_stats (
+  tournament_id INT NOT NULL,
+  team_id INT NOT NULL,
+  goals INT NOT NULL DEFAULT 0,
+  own_goals INT NOT NULL DEFAULT 0,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  xg_sum FLOAT NOT NULL DEFAULT 0,
+  matches_with_events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, team_id),
+
+  INDEX idx_tts_xg (tournament_id, xg_sum),
+
+  CONSTRAINT fk_tts_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_tts_team
+    FOREIGN KEY (team_id) REFERENCES team(team_id)
+);
+
+-- events per (match, player / team): decides matches_with_events without counting match_event
+CREATE TABLE match_event_presence (
+  tournament_id INT NOT NULL,
+  match_id INT NOT NULL,
+  subject ENUM('player', 'team') NOT NULL,
+  subject_id INT NOT NULL,
+  events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, match_id, subject, subject_id),
+
+  CONSTRAINT fk_mep_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE
+);
+
+
+-- =========================
+-- player_discipline (cards and suspensions per tournament)
+-- =========================
+CREATE TABLE player_discipline (
+  tournament_id INT NOT NULL,
+  player_id INT NOT NULL,
+  team_id INT NOT NULL,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  bans_total INT NOT NULL DEFAULT 0,
+  bans_served INT NOT NULL DEFAULT 0,
+  ban_remaining INT AS (GREATEST(bans_total - bans_served, 0)) STORED,
+  last_card_match_id INT NULL,
+  last_served_match_id INT NULL,
+  PRIMARY KEY (tournament_id, player_id),
+
+  INDEX idx_discipline_team_ban (tournament_id, team_id, ban_remaining),
+
+  CONSTRAINT fk_discipline_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_discipline_player
+    FOREIGN KEY (player_id) REFERENCES player(player_id)
+    ON DELETE CASCADE
+);
+
+
+-- =========================
+-- head_to_head (team pair history, team_low_id < team_high_id)
+-- =========================
+CREATE TABLE head_to_head (
+  team_low_id INT NOT NULL,
+  team_high_id INT NOT NULL,
+  matches INT NOT NULL DEFAULT 0,
+  low_wins INT NOT NULL DEFAULT 0,
+  high_wins INT NOT NULL DEFAULT 0,
+  draws INT NOT NULL DEFAULT 0,
+  low_goals INT NOT NULL DEFAULT 0,
+  high_goals INT NOT NULL DEFAULT 0,
+  last_results JSON NOT NULL,
+  PRIMARY KEY (team_low_id, team_high_id),
+
+  CONSTRAINT chk_h2h_order
+    CHECK (team_low_id < team_high_id),
+
+  CONSTRAINT fk_h2h_low
+    FOREIGN KEY (team_low_id) REFERENCES team(team_id),
+
+  CONSTRAINT fk_h2h_high
+    FOREIGN KEY (team_high_id) REFERENCES team(team_id)
+);
+
+-- matches already counted in head_to_head (keeps the update idempotent)
+CREATE TABLE head_to_head_match (
+  match_id INT PRIMARY KEY,
+
+  CONSTRAINT fk_h2hm_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
+
+-- matches whose suspensions were served (keeps serve_bans idempotent)
+CREATE TABLE ban_served_match (
+  match_id INT PRIMARY KEY,
+
+  CONSTRAINT fk_bsm_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
+
+-- per-table change counters, bumped by every committed write (change notification)
+CREATE TABLE table_version (
+  table_name VARCHAR(64) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
+
+-- client-generated ids of applied writes (offline journal deduplication)
+CREATE TABLE client_write (
+  client_id CHAR(36) PRIMARY KEY,
+  event_id INT NULL,
+  applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =========================
+-- archive of finished tournaments (same columns and indexes, no foreign keys)
+-- =========================
+CREATE TABLE archive_matches LIKE matches;
+CREATE TABLE archive_match_event LIKE match_event;
+CREATE TABLE archive_match_referee LIKE match_referee;
+CREATE TABLE archive_team_rating_history LIKE team_rating_history;
+CREATE TABLE archive_head_to_head_match LIKE head_to_head_match;
+CREATE TABLE archive_ban_served_match LIKE ban_served_match;
@@ -0,0 +1,21 @@
+-- Elo rating history (one row per team per finished match)
+CREATE TABLE IF NOT EXISTS team_rating_history (
+  history_id INT AUTO_INCREMENT PRIMARY KEY,
+  team_id INT NOT NULL,
+  match_id INT NOT NULL,
+  match_time DATETIME NOT NULL,
+  rating_before FLOAT NOT NULL,
+  rating_after FLOAT NOT NULL,
+
+  CONSTRAINT uq_rating_match_team
+    UNIQUE (match_id, team_id),
+
+  INDEX idx_rating_team_time (team_id, match_time),
+
+  CONSTRAINT fk_rating_team
+    FOREIGN KEY (team_id) REFERENCES team(team_id),
+
+  CONSTRAINT fk_rating_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
@@ -0,0 +1,53 @@
+-- Per-tournament player/team statistics maintained on match_event writes.
+-- After creating the tables fill them once with StatisticsService.rebuild().
+
+-- =========================
+-- player_tournament_stats (rollup of match_event)
+-- =========================
+CREATE TABLE IF NOT EXISTS player_tournament_stats (
+  tournament_id INT NOT NULL,
+  player_id INT NOT NULL,
+  team_id INT NOT NULL,
+  goals INT NOT NULL DEFAULT 0,
+  own_goals INT NOT NULL DEFAULT 0,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  xg_sum FLOAT NOT NULL DEFAULT 0,
+  matches_with_events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, player_id),
+
+  INDEX idx_pts_goals (tournament_id, goals),
+  INDEX idx_pts_cards (tournament_id, reds, yellows),
+
+  CONSTRAINT fk_pts_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_pts_player
+    FOREIGN KEY (player_id) REFERENCES player(player_id)
+    ON DELETE CASCADE
+);
+
+-- =========================
+-- team_tournament_stats (rollup of match_event)
+-- =========================
+CREATE TABLE IF NOT EXISTS team_tournament_stats (
+  tournament_id INT NOT NULL,
+  team_id INT NOT NULL,
+  goals INT NOT NULL DEFAULT 0,
+  own_goals INT NOT NULL DEFAULT 0,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  xg_sum FLOAT NOT NULL DEFAULT 0,
+  matches_with_events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, team_id),
+
+  INDEX idx_tts_xg (tournament_id, xg_sum),
+
+  CONSTRAINT fk_tts_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_tts_team
+    FOREIGN KEY (team_id) REFERENCES team(team_id)
+);
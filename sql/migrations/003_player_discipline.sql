@@ -0,0 +1,29 @@
+-- Accumulated cards and active suspensions per tournament.
+-- After creating the table fill it once with DisciplineService.rebuild().
+
+-- =========================
+-- player_discipline (cards and suspensions per tournament)
+-- =========================
+CREATE TABLE IF NOT EXISTS player_discipline (
+  tournament_id INT NOT NULL,
+  player_id INT NOT NULL,
+  team_id INT NOT NULL,
+  yellows INT NOT NULL DEFAULT 0,
+  reds INT NOT NULL DEFAULT 0,
+  bans_total INT NOT NULL DEFAULT 0,
+  bans_served INT NOT NULL DEFAULT 0,
+  ban_remaining INT AS (GREATEST(bans_total - bans_served, 0)) STORED,
+  last_card_match_id INT NULL,
+  last_served_match_id INT NULL,
+  PRIMARY KEY (tournament_id, player_id),
+
+  INDEX idx_discipline_team_ban (tournament_id, team_id, ban_remaining),
+
+  CONSTRAINT fk_discipline_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE,
+
+  CONSTRAINT fk_discipline_player
+    FOREIGN KEY (player_id) REFERENCES player(player_id)
+    ON DELETE CASCADE
+);
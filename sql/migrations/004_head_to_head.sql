@@ -0,0 +1,36 @@
+-- Head-to-head records per team pair.
+-- After creating the tables fill them once with HeadToHeadService.rebuild().
+
+-- =========================
+-- head_to_head (team pair history, team_low_id < team_high_id)
+-- =========================
+CREATE TABLE IF NOT EXISTS head_to_head (
+  team_low_id INT NOT NULL,
+  team_high_id INT NOT NULL,
+  matches INT NOT NULL DEFAULT 0,
+  low_wins INT NOT NULL DEFAULT 0,
+  high_wins INT NOT NULL DEFAULT 0,
+  draws INT NOT NULL DEFAULT 0,
+  low_goals INT NOT NULL DEFAULT 0,
+  high_goals INT NOT NULL DEFAULT 0,
+  last_results JSON NOT NULL,
+  PRIMARY KEY (team_low_id, team_high_id),
+
+  CONSTRAINT chk_h2h_order
+    CHECK (team_low_id < team_high_id),
+
+  CONSTRAINT fk_h2h_low
+    FOREIGN KEY (team_low_id) REFERENCES team(team_id),
+
+  CONSTRAINT fk_h2h_high
+    FOREIGN KEY (team_high_id) REFERENCES team(team_id)
+);
+
+-- matches already counted in head_to_head (keeps the update idempotent)
+CREATE TABLE IF NOT EXISTS head_to_head_match (
+  match_id INT PRIMARY KEY,
+
+  CONSTRAINT fk_h2hm_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
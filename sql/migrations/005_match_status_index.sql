@@ -0,0 +1,5 @@
+-- Index for the match status engine (scheduled -> live -> finished sweep).
+-- Run once; MySQL has no IF NOT EXISTS for indexes.
+
+ALTER TABLE matches
+  ADD INDEX idx_match_status_start (status, start_time);
@@ -0,0 +1,42 @@
+-- Live score and card counters on matches, maintained on match_event writes.
+-- Own goals count for the opponent (same rules as v_match_score).
+-- The UPDATE fills the counters once for existing matches; later drift can be
+-- repaired with MatchScoreRepository.reconcile(). Re-run sql/create_view.sql
+-- afterwards, v_match_score now reads these columns.
+
+ALTER TABLE matches
+  ADD COLUMN home_goals INT NOT NULL DEFAULT 0,
+  ADD COLUMN away_goals INT NOT NULL DEFAULT 0,
+  ADD COLUMN home_yellows INT NOT NULL DEFAULT 0,
+  ADD COLUMN away_yellows INT NOT NULL DEFAULT 0,
+  ADD COLUMN home_reds INT NOT NULL DEFAULT 0,
+  ADD COLUMN away_reds INT NOT NULL DEFAULT 0;
+
+UPDATE matches m
+JOIN (
+  SELECT
+    e.match_id,
+    SUM(CASE
+          WHEN e.event_type = 'goal' AND e.team_id = m2.home_team_id THEN 1
+          WHEN e.event_type = 'own_goal' AND e.team_id = m2.away_team_id THEN 1
+          ELSE 0
+        END) AS home_goals,
+    SUM(CASE
+          WHEN e.event_type = 'goal' AND e.team_id = m2.away_team_id THEN 1
+          WHEN e.event_type = 'own_goal' AND e.team_id = m2.home_team_id THEN 1
+          ELSE 0
+        END) AS away_goals,
+    SUM(e.event_type = 'yellow' AND e.team_id = m2.home_team_id) AS home_yellows,
+    SUM(e.event_type = 'yellow' AND e.team_id = m2.away_team_id) AS away_yellows,
+    SUM(e.event_type = 'red' AND e.team_id = m2.home_team_id) AS home_reds,
+    SUM(e.event_type = 'red' AND e.team_id = m2.away_team_id) AS away_reds
+  FROM match_event e
+  JOIN matches m2 ON m2.match_id = e.match_id
+  GROUP BY e.match_id
+) a ON a.match_id = m.match_id
+SET m.home_goals = a.home_goals,
+    m.away_goals = a.away_goals,
+    m.home_yellows = a.home_yellows,
+    m.away_yellows = a.away_yellows,
+    m.home_reds = a.home_reds,
+    m.away_reds = a.away_reds;
@@ -0,0 +1,11 @@
+-- Row versions for optimistic concurrency (compare-and-swap updates).
+-- Every UPDATE bumps version; an update made with a stale version fails with
+-- ConflictError instead of silently overwriting someone else's change.
+-- The score counters on matches do not bump it.
+
+ALTER TABLE tournament ADD COLUMN version INT NOT NULL DEFAULT 0;
+ALTER TABLE team ADD COLUMN version INT NOT NULL DEFAULT 0;
+ALTER TABLE player ADD COLUMN version INT NOT NULL DEFAULT 0;
+ALTER TABLE matches ADD COLUMN version INT NOT NULL DEFAULT 0;
+ALTER TABLE match_event ADD COLUMN version INT NOT NULL DEFAULT 0;
+ALTER TABLE referee ADD COLUMN version INT NOT NULL DEFAULT 0;
@@ -0,0 +1,9 @@
+-- Per-table change counters for cross-client change notification.
+-- Every committed write made by the app bumps the counters of the tables it
+-- touched (right after its commit); other clients poll this tiny table and
+-- refresh the screens / drop the cached queries of the changed tables.
+
+CREATE TABLE table_version (
+  table_name VARCHAR(64) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
@@ -0,0 +1,10 @@
+-- Client-generated ids of event writes (offline journal, see WriteJournal).
+-- The id is recorded in the same transaction as the event, so replaying a
+-- journal entry that was already committed (e.g. the app crashed before it
+-- could acknowledge it) does not insert the event twice.
+
+CREATE TABLE client_write (
+  client_id CHAR(36) PRIMARY KEY,
+  event_id INT NULL,
+  applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,15 @@
+-- Archive of finished tournaments (ArchiveRepository, python -m src.tools.archive).
+-- Matches of an archived tournament live in the archive_* tables, together with
+-- their events, referee links, rating history and head-to-head markers; the
+-- per-tournament rollups (stats, discipline) stay where they are.
+-- CREATE TABLE ... LIKE keeps columns and indexes but no foreign keys, so the
+-- archive does not block deletes of teams / players / referees. Columns added
+-- to the hot tables later must be added to their archive tables as well.
+
+ALTER TABLE tournament ADD COLUMN archived_at DATETIME NULL;
+
+CREATE TABLE archive_matches LIKE matches;
+CREATE TABLE archive_match_event LIKE match_event;
+CREATE TABLE archive_match_referee LIKE match_referee;
+CREATE TABLE archive_team_rating_history LIKE team_rating_history;
+CREATE TABLE archive_head_to_head_match LIKE head_to_head_match;
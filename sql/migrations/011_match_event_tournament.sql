@@ -0,0 +1,25 @@
+-- Partition key for match_event: the tournament of the event's match, copied
+-- onto the event (kept in sync by MatchEventRepository / MatchRepository.update).
+-- Queries filter on it, so a partitioned match_event (sql/partition_match_event.sql)
+-- only reads the partition of one tournament. Needs migration 010 (archive tables).
+
+ALTER TABLE match_event ADD COLUMN tournament_id INT NULL AFTER match_id;
+
+UPDATE match_event e
+JOIN matches m ON m.match_id = e.match_id
+SET e.tournament_id = m.tournament_id;
+
+ALTER TABLE match_event
+  MODIFY tournament_id INT NOT NULL,
+  ADD INDEX idx_event_tournament_match (tournament_id, match_id);
+
+-- Same column position in the archive, it is copied with SELECT *
+ALTER TABLE archive_match_event ADD COLUMN tournament_id INT NULL AFTER match_id;
+
+UPDATE archive_match_event e
+JOIN archive_matches m ON m.match_id = e.match_id
+SET e.tournament_id = m.tournament_id;
+
+ALTER TABLE archive_match_event
+  MODIFY tournament_id INT NOT NULL,
+  ADD INDEX idx_event_tournament_match (tournament_id, match_id);
@@ -0,0 +1,29 @@
+-- Events per (match, player / team), maintained next to the tournament rollups.
+-- The first event of a player / team in a match inserts the row, the last one
+-- deletes it: the affected-row count decides the matches_with_events delta, so
+-- concurrent first events of one match do not both count (see StatsRepository).
+-- Needs migration 011 (match_event.tournament_id).
+
+CREATE TABLE match_event_presence (
+  tournament_id INT NOT NULL,
+  match_id INT NOT NULL,
+  subject ENUM('player', 'team') NOT NULL,
+  subject_id INT NOT NULL,
+  events INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (tournament_id, match_id, subject, subject_id),
+
+  CONSTRAINT fk_mep_tournament
+    FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id)
+    ON DELETE CASCADE
+);
+
+INSERT INTO match_event_presence (tournament_id, match_id, subject, subject_id, events)
+SELECT tournament_id, match_id, 'player', player_id, COUNT(*)
+FROM match_event
+WHERE player_id IS NOT NULL
+GROUP BY tournament_id, match_id, player_id;
+
+INSERT INTO match_event_presence (tournament_id, match_id, subject, subject_id, events)
+SELECT tournament_id, match_id, 'team', team_id, COUNT(*)
+FROM match_event
+GROUP BY tournament_id, match_id, team_id;
@@ -0,0 +1,21 @@
+-- Matches whose suspensions were served (DisciplineRepository.serve_bans).
+-- The marker is inserted in the same transaction as the bans_served update,
+-- so a retried finish hook cannot serve the bans of a match twice, and the
+-- status sweep reprocesses finished matches without it. Needs migration 010.
+
+CREATE TABLE ban_served_match (
+  match_id INT PRIMARY KEY,
+
+  CONSTRAINT fk_bsm_match
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+    ON DELETE CASCADE
+);
+
+CREATE TABLE archive_ban_served_match LIKE ban_served_match;
+
+-- Matches finished before this migration already went through serve_bans
+INSERT INTO ban_served_match (match_id)
+SELECT match_id FROM matches WHERE status='finished';
+
+INSERT INTO archive_ban_served_match (match_id)
+SELECT match_id FROM archive_matches WHERE status='finished';
@@ -0,0 +1,43 @@
+-- Optional: partition match_event by tournament range (multi-season deployments).
+-- Run after migration 011. Benchmark before and after with
+-- python -m src.tools.partition_benchmark (see README).
+--
+-- MySQL restrictions of partitioned InnoDB tables:
+--   * no foreign keys: the event foreign keys are dropped (their indexes stay).
+--     The application deletes events of deleted matches and clears player_id
+--     of deleted players itself, it does not rely on ON DELETE rules.
+--   * every unique key must contain the partition column: the primary key
+--     becomes (event_id, tournament_id); event_id stays unique (AUTO_INCREMENT).
+-- matches is not partitioned: four tables reference it with foreign keys.
+--
+-- One partition per 10 tournament ids (about a school season). Before the ids
+-- reach the last bound, split pmax:
+--   ALTER TABLE match_event REORGANIZE PARTITION pmax INTO (
+--     PARTITION p10 VALUES LESS THAN (110),
+--     PARTITION pmax VALUES LESS THAN MAXVALUE);
+-- Undo: ALTER TABLE match_event REMOVE PARTITIONING; then re-add the foreign
+-- keys from sql/create_tables.sql.
+
+ALTER TABLE match_event
+  DROP FOREIGN KEY fk_event_match,
+  DROP FOREIGN KEY fk_event_player,
+  DROP FOREIGN KEY fk_event_team;
+
+ALTER TABLE match_event
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (event_id, tournament_id);
+
+ALTER TABLE match_event
+PARTITION BY RANGE (tournament_id) (
+  PARTITION p0 VALUES LESS THAN (10),
+  PARTITION p1 VALUES LESS THAN (20),
+  PARTITION p2 VALUES LESS THAN (30),
+  PARTITION p3 VALUES LESS THAN (40),
+  PARTITION p4 VALUES LESS THAN (50),
+  PARTITION p5 VALUES LESS THAN (60),
+  PARTITION p6 VALUES LESS THAN (70),
+  PARTITION p7 VALUES LESS THAN (80),
+  PARTITION p8 VALUES LESS THAN (90),
+  PARTITION p9 VALUES LESS THAN (100),
+  PARTITION pmax VALUES LESS THAN MAXVALUE
+);
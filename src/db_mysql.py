@@ -1,11 +1,18 @@
 from __future__ import annotations
+import random
+import threading
+import time
 from dataclasses import dataclass
 from contextlib import contextmanager
-from typing import Optional, Any, Dict, Iterator
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Type, TypeVar
 
 import mysql.connector
 from mysql.connector import Error as MySqlError
 
+from src.query_cache import QueryCache, read_tables
+from src.replica import ReplicaMonitor
+from src.table_tracking import TrackingConnection
+
 
 @dataclass(frozen=True)
 class DbConfig:
@@ -14,6 +21,10 @@ class DbConfig:
     user: str
     password: str
     database: str
+    query_cache_mb: int = 0  # 0 = no result cache (see Db.query_cached)
+    change_tracking: bool = True  # bump table_version on writes (see ChangeNotifier)
+    replica: Optional[DbConfig] = None  # read replica for Db.read_conn (None = primary only)
+    replica_max_lag_seconds: float = 5.0
 
 
 class DbError(Exception):
@@ -28,9 +39,139 @@ class ValidationError(DbError):
     pass
 
 
+class ConflictError(DbError):
+    """
+    Optimistic concurrency: the row was changed by someone else since it was
+    read (its version no longer matches). Reload and retry.
+    """
+    pass
+
+
+# Max ids per "WHERE x IN (...)" statement in bulk operations
+IN_CHUNK = 1000
+
+
+def chunked(items: Sequence[Any], size: int = IN_CHUNK) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield list(items[i:i + size])
+
+
+def placeholders(n: int) -> str:
+    return ", ".join(["%s"] * n)
+
+
+def versioned(sql: str, params: tuple, version: Optional[int]) -> tuple[str, tuple]:
+    """
+    Adds the compare-and-swap condition to an "UPDATE ... WHERE <pk>=%s".
+    version None means an unconditional overwrite (e.g. imports).
+    """
+    if version is None:
+        return sql, params
+    return sql + " AND version=%s", (*params, version)
+
+
+def raise_update_miss(cur, table: str, key: str, key_value: Any, label: str) -> None:
+    """
+    Called when a versioned UPDATE matched no row: NotFoundError if the row is
+    gone, ConflictError if it exists with another version.
+    """
+    # Locking read: sees the latest committed row, not the transaction snapshot
+    cur.execute(f"SELECT version FROM {table} WHERE {key}=%s FOR SHARE", (key_value,))
+    row = cur.fetchone()
+    if row is None:
+        raise NotFoundError(f"{label} not found")
+    raise ConflictError(f"{label} was changed by someone else (now version {row['version']}), reload and try again")
+
+
+# InnoDB errors after which the whole transaction can simply be run again
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+RETRYABLE_ERRNOS = frozenset({ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK})
+
+def is_retryable_error(e: BaseException) -> bool:
+    return isinstance(e, MySqlError) and getattr(e, "errno", None) in RETRYABLE_ERRNOS
+
+
+# Client errors meaning the server could not be reached (or the link dropped)
+CR_CONNECTION_ERROR = 2002
+CR_CONN_HOST_ERROR = 2003
+CR_SERVER_GONE_ERROR = 2006
+CR_SERVER_LOST = 2013
+CR_SERVER_LOST_EXTENDED = 2055
+CONNECTION_ERRNOS = frozenset({
+    CR_CONNECTION_ERROR, CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED,
+})
+
+
+def is_connection_error(e: BaseException) -> bool:
+    """
+    True if e (or the MySQL error it wraps) means the database is unreachable,
+    as opposed to an error of the statement itself.
+    """
+    while e is not None:
+        if isinstance(e, MySqlError) and getattr(e, "errno", None) in CONNECTION_ERRNOS:
+            return True
+        e = e.__cause__
+    return False
+
+
+TX_ATTEMPTS = 4
+TX_BACKOFF_BASE = 0.05  # seconds, doubled per retry
+TX_BACKOFF_MAX = 1.0
+
+T = TypeVar("T")
+
+
+class TransactionMetrics:
+    """
+    Counters of Db.run_transaction per transaction name (thread-safe).
+    snapshot() -> {name: {"runs", "retries", "failed", "deadlocks", "lock_timeouts", "conflicts"}}
+    """
+
+    _FIELDS = ("runs", "retries", "failed", "deadlocks", "lock_timeouts", "conflicts")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def add(self, name: str, field: str, n: int = 1) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(name, dict.fromkeys(self._FIELDS, 0))
+            counts[field] += n
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+def backoff_delay(retry: int, base: float = TX_BACKOFF_BASE, cap: float = TX_BACKOFF_MAX) -> float:
+    """
+    Full jitter: uniform in [0, min(cap, base * 2^retry)], so transactions that
+    deadlocked with each other do not retry in lockstep.
+    """
+    return random.uniform(0, min(cap, base * (2 ** retry)))
+
+
 class Db:
     def __init__(self, cfg: DbConfig):
         self.cfg = cfg
+        self.metrics = TransactionMetrics()
+        self.cache: Optional[QueryCache] = (
+            QueryCache(cfg.query_cache_mb * 1024 * 1024) if cfg.query_cache_mb > 0 else None
+        )
+        self.replica: Optional[ReplicaMonitor] = (
+            ReplicaMonitor(cfg.replica, cfg.replica_max_lag_seconds) if cfg.replica is not None else None
+        )
+        # table -> monotonic time of the last write seen (own commits, ChangeNotifier)
+        self._written_at: Dict[str, float] = {}
+        self._written_lock = threading.Lock()
+        # Switched off (with the reason) when the database has no table_version
+        self.change_tracking = cfg.change_tracking
+        self.change_tracking_error: Optional[str] = None
 
     @contextmanager
     def conn(self):
@@ -43,13 +184,132 @@ class Db:
                 password=self.cfg.password,
                 database=self.cfg.database,
             )
-            yield cnx
+            if self.cache is None and not self.change_tracking and self.replica is None:
+                yield cnx
+            else:
+                on_commit = self.note_writes if self.replica is not None else None
+                yield TrackingConnection(
+                    cnx, self.cache, self.change_tracking, on_commit, self._no_version_table
+                )
         except MySqlError as ex:
             raise DbError(f"MySQL error: {ex}") from ex
         finally:
             if cnx is not None:
                 cnx.close()
 
+    @contextmanager
+    def read_conn(self, tables: Iterable[str], replica: bool = True):
+        """
+        Connection for a read-only query over tables: the replica when one is
+        configured and within its lag limit, otherwise the primary (conn()).
+
+        Read-your-writes: tables written recently (by this process, or by other
+        clients as reported by ChangeNotifier) are read from the primary until
+        the replica must have caught up (max lag + one lag check interval).
+        Reads that feed a write (e.g. recomputations) must use conn() or
+        replica=False.
+        """
+        if not replica or self.replica is None or self._recently_written(tables) or not self.replica.usable():
+            if self.replica is not None:
+                self.replica.count(on_replica=False)
+            with self.conn() as cnx:
+                yield cnx
+            return
+
+        try:
+            cnx = self.replica.connect()
+        except MySqlError as ex:
+            # Replica unreachable: fall back to the primary right away
+            self.replica.mark_down(ex)
+            self.replica.count(on_replica=False)
+            with self.conn() as cnx:
+                yield cnx
+            return
+
+        self.replica.count(on_replica=True)
+        try:
+            yield cnx
+        except MySqlError as ex:
+            self.replica.mark_down(ex)
+            raise DbError(f"MySQL error (replica): {ex}") from ex
+        finally:
+            cnx.close()
+
+    def _no_version_table(self, ex: Exception) -> None:
+        self.change_tracking = False
+        self.change_tracking_error = (
+            f"Change tracking is off: {ex} (run sql/migrations/008_table_version.sql)"
+        )
+
+    def note_writes(self, tables: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._written_lock:
+            for t in tables:
+                self._written_at[t] = now
+
+    def _recently_written(self, tables: Iterable[str]) -> bool:
+        window = self.replica.max_lag_seconds + self.replica.check_seconds
+        since = time.monotonic() - window
+        with self._written_lock:
+            return any(self._written_at.get(t, 0.0) > since for t in tables)
+
+    def run_transaction(
+        self,
+        work: Callable[[Any], T],
+        name: str,
+        action: Optional[str] = None,
+        attempts: int = TX_ATTEMPTS,
+        retry_on: Tuple[Type[DbError], ...] = (),
+    ) -> T:
+        """
+        Runs work(cur) in one transaction and commits; returns its result.
+
+        On a deadlock (1213) or lock wait timeout (1205) the transaction is rolled
+        back and work is run again from the start, up to attempts times, with a
+        jittered exponential backoff. work must therefore be a self-contained unit
+        (read what it needs inside, no side effects outside the database).
+        retry_on adds DbError subclasses that are retried the same way (e.g.
+        ConflictError for work that re-reads the row anyway).
+
+        NotFoundError / ValidationError / DbError raised by work are re-raised,
+        other errors are wrapped as DbError("Failed to <action>: ...").
+        Runs, retries and failures are counted in self.metrics under name
+        (a fixed label such as "add_goal"; action may contain ids).
+        """
+        self.metrics.add(name, "runs")
+        with self.conn() as cnx:
+            for attempt in range(1, attempts + 1):
+                try:
+                    cnx.start_transaction()
+                    with self.cursor(cnx) as cur:
+                        result = work(cur)
+                    cnx.commit()
+                    return result
+
+                except Exception as e:
+                    cnx.rollback()
+
+                    if is_retryable_error(e):
+                        self.metrics.add(name, "deadlocks" if e.errno == ER_LOCK_DEADLOCK else "lock_timeouts")
+                        retryable = True
+                    elif retry_on and isinstance(e, retry_on):
+                        self.metrics.add(name, "conflicts")
+                        retryable = True
+                    else:
+                        retryable = False
+
+                    if retryable and attempt < attempts:
+                        self.metrics.add(name, "retries")
+                        time.sleep(backoff_delay(attempt - 1))
+                        continue
+
+                    self.metrics.add(name, "failed")
+                    if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                        raise
+                    raise DbError(f"Failed to {action or name}: {e}") from e
+
+        raise DbError(f"Failed to {action or name}: no attempts")
+
     @contextmanager
     def cursor(self, cnx):
         cur = cnx.cursor(dictionary=True)
@@ -57,3 +317,68 @@ class Db:
             yield cur
         finally:
             cur.close()
+
+    def query_cached(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        replica: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        SELECT through the result cache (opt-in per query; a plain query when
+        the cache is disabled). Results are dropped as soon as this process
+        writes to any table the query reads. Rows are copies, free to modify.
+        Misses are read through read_conn (the replica, if configured).
+
+        replica=False is for reads that feed a write (e.g. import planning):
+        the query goes straight to the primary, past the cache.
+        """
+        params = None if params is None else tuple(params)
+        if not replica:
+            with self.conn() as cnx, self.cursor(cnx) as cur:
+                cur.execute(sql, params)
+                return list(cur.fetchall())
+
+        tables = read_tables(sql)
+        if self.cache is None:
+            with self.read_conn(tables) as cnx, self.cursor(cnx) as cur:
+                cur.execute(sql, params)
+                return list(cur.fetchall())
+
+        key = self.cache.key(sql, params or ())
+        rows = self.cache.get(key)
+        if rows is not None:
+            return rows
+
+        snapshot = self.cache.snapshot(tables)
+        with self.read_conn(tables) as cnx, self.cursor(cnx) as cur:
+            cur.execute(sql, params)
+            rows = list(cur.fetchall())
+        self.cache.put(key, rows, tables, snapshot)
+        return [dict(r) for r in rows]
+
+    def iter_rows(self, sql: str, params: Sequence[Any] = (), batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams a large result set with an unbuffered cursor (rows stay on the
+        server until fetched), so memory does not grow with the table size.
+        The connection is held until the generator is exhausted or closed.
+        """
+        with self.conn() as cnx:
+            cur = cnx.cursor(dictionary=True, buffered=False)
+            try:
+                cur.execute(sql, tuple(params))
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            except MySqlError as ex:
+                raise DbError(f"MySQL error: {ex}") from ex
+            finally:
+                # Closed early: drain the unread result so the cursor can be closed
+                try:
+                    if cnx.unread_result:
+                        cnx.consume_results()
+                except MySqlError:
+                    pass
+                cur.close()
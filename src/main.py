@@ -1,8 +1,7 @@
 import json
 import sys
 
-from db_mysql import Db, DbConfig, DbError
-from src.ui.app import App
+from src.db_mysql import Db, DbConfig, DbError
 
 def load_config(path: str) -> DbConfig:
     try:
@@ -11,12 +10,28 @@ def load_config(path: str) -> DbConfig:
 
         db = data["database"]
 
+        # Optional read replica; missing keys are taken from the primary
+        replica = None
+        if db.get("replica"):
+            r = {**db, **db["replica"]}
+            replica = DbConfig(
+                host=r["host"],
+                port=int(r["port"]),
+                user=r["user"],
+                password=r["password"],
+                database=r["name"],
+            )
+
         return DbConfig(
             host=db["host"],
             port=int(db["port"]),
             user=db["user"],
             password=db["password"],
             database=db["name"],
+            query_cache_mb=int(db.get("query_cache_mb", 0)),
+            change_tracking=bool(db.get("change_tracking", True)),
+            replica=replica,
+            replica_max_lag_seconds=float(db.get("replica_max_lag_seconds", 5.0)),
         )
 
     except FileNotFoundError:
@@ -40,6 +55,9 @@ def test_connection(db: Db) -> None:
 
 
 def main():
+    # Imported here so the command-line tools can reuse load_config without Tk
+    from src.ui.app import App
+
     print("Connecting to database...")
 
     cfg = load_config("src/config.json")
@@ -0,0 +1,13 @@
+from src.models.imports import *
+
+@dataclass
+class HeadToHead:
+    team_low_id: int
+    team_high_id: int
+    matches: int
+    low_wins: int
+    high_wins: int
+    draws: int
+    low_goals: int
+    high_goals: int
+    last_results: list  # newest first: {match_id, start_time, low_goals, high_goals, is_overtime}
@@ -11,3 +11,4 @@ class Match:
     start_time: datetime
     status: MatchStatus
     is_overtime: bool
+    version: Optional[int] = None  # row version for compare-and-swap updates
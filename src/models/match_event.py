@@ -12,3 +12,4 @@ class MatchEvent:
     event_type: MatchEventType
     xg: Optional[float]
     created_at: datetime
+    version: Optional[int] = None  # row version for compare-and-swap updates
@@ -10,3 +10,4 @@ class Player:
     last_name: str
     birth_date: date
     position: PlayerPosition
+    version: Optional[int] = None  # row version for compare-and-swap updates
@@ -0,0 +1,14 @@
+from src.models.imports import *
+
+@dataclass
+class PlayerDiscipline:
+    tournament_id: int
+    player_id: int
+    team_id: int
+    yellows: int
+    reds: int
+    bans_total: int
+    bans_served: int
+    ban_remaining: int
+    last_card_match_id: Optional[int]
+    last_served_match_id: Optional[int]
@@ -0,0 +1,13 @@
+from src.models.imports import *
+
+@dataclass
+class PlayerStats:
+    tournament_id: int
+    player_id: int
+    team_id: int
+    goals: int
+    own_goals: int
+    yellows: int
+    reds: int
+    xg_sum: float
+    matches_with_events: int
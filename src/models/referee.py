@@ -9,3 +9,4 @@ class Referee:
     email: str
     level: RefereeLevel
     active: bool
+    version: Optional[int] = None  # row version for compare-and-swap updates
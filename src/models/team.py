@@ -7,3 +7,4 @@ class Team:
     class_name: str
     rating: float
     is_deleted: bool
+    version: Optional[int] = None  # row version for compare-and-swap updates
@@ -0,0 +1,10 @@
+from src.models.imports import *
+
+@dataclass
+class TeamRatingHistory:
+    history_id: Optional[int]
+    team_id: int
+    match_id: int
+    match_time: datetime
+    rating_before: float
+    rating_after: float
@@ -0,0 +1,12 @@
+from src.models.imports import *
+
+@dataclass
+class TeamStats:
+    tournament_id: int
+    team_id: int
+    goals: int
+    own_goals: int
+    yellows: int
+    reds: int
+    xg_sum: float
+    matches_with_events: int
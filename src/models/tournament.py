@@ -7,3 +7,5 @@ class Tournament:
     start_date: date
     end_date: Optional[date]
     is_active: bool
+    version: Optional[int] = None  # row version for compare-and-swap updates
+    archived_at: Optional[datetime] = None  # matches moved to the archive tables
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Views are invalidated through the tables they read
+VIEW_TABLES: Dict[str, Tuple[str, ...]] = {
+    "v_match_score": ("matches", "team"),
+}
+
+_NAME = r"`?([A-Za-z_][A-Za-z0-9_]*)`?"
+_READ_TABLES = re.compile(rf"\b(?:FROM|JOIN)\s+{_NAME}", re.IGNORECASE)
+
+CacheKey = Tuple[str, Tuple[Any, ...]]
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def expand_views(tables: Iterable[str]) -> FrozenSet[str]:
+    result: Set[str] = set()
+    for t in tables:
+        t = t.lower()
+        result.add(t)
+        result.update(VIEW_TABLES.get(t, ()))
+    return frozenset(result)
+
+
+def read_tables(sql: str) -> FrozenSet[str]:
+    return expand_views(_READ_TABLES.findall(sql))
+
+
+def _size_of(rows: Sequence[dict]) -> int:
+    size = sys.getsizeof(rows)
+    for r in rows:
+        size += sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values())
+    return size
+
+
+class QueryCache:
+    """
+    LRU cache of SELECT results, bounded by the estimated size of the rows.
+
+    Keyed by whitespace-normalized SQL and parameters; every entry remembers
+    the tables it read. Writes made through Db invalidate those tables
+    (table_tracking.TrackingConnection). A per-table generation counter makes
+    sure a read that started before a write cannot store its (now stale)
+    result after it. Writes of other clients are only noticed while a
+    ChangeNotifier is polling, up to one poll interval late.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, Tuple[Tuple[dict, ...], FrozenSet[str], int]] = OrderedDict()
+        self._by_table: Dict[str, Set[CacheKey]] = {}
+        self._generation: Dict[str, int] = {}
+        self._epoch = 0  # bumped by clear()
+
+    @staticmethod
+    def key(sql: str, params: Sequence[Any]) -> CacheKey:
+        return normalize_sql(sql), tuple(tuple(p) if isinstance(p, list) else p for p in params)
+
+    def get(self, key: CacheKey) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers may modify the rows (e.g. 0/1 -> bool), so hand out copies
+            return [dict(r) for r in entry[0]]
+
+    def snapshot(self, tables: FrozenSet[str]) -> Tuple[int, Tuple[int, ...]]:
+        with self._lock:
+            return self._epoch, tuple(self._generation.get(t, 0) for t in sorted(tables))
+
+    def put(self, key: CacheKey, rows: List[dict], tables: FrozenSet[str], snapshot: Tuple[int, Tuple[int, ...]]) -> None:
+        size = _size_of(rows)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            current = (self._epoch, tuple(self._generation.get(t, 0) for t in sorted(tables)))
+            if current != snapshot:
+                return  # a write to one of the tables happened while the query ran
+            self._remove(key)
+            self._entries[key] = (tuple(dict(r) for r in rows), tables, size)
+            self.bytes += size
+            for t in tables:
+                self._by_table.setdefault(t, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for t in tables:
+                self._generation[t] = self._generation.get(t, 0) + 1
+                for key in self._by_table.pop(t, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _rows, tables, size = entry
+        self.bytes -= size
+        for t in tables:
+            keys = self._by_table.get(t)
+            if keys is not None:
+                keys.discard(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error as MySqlError
+
+# How often the replication lag is measured (seconds)
+LAG_CHECK_SECONDS = 2.0
+
+
+class ReplicaMonitor:
+    """
+    Decides whether reads may go to the read replica.
+
+    The replica is used only while its replication lag (Seconds_Behind_Source
+    of SHOW REPLICA STATUS, measured at most every check_seconds) is known and
+    at most max_lag_seconds. Stopped replication (lag NULL), a failed check or
+    a failed connection all mean "use the primary" until the next check.
+    The check needs the REPLICATION CLIENT privilege on the replica.
+    """
+
+    def __init__(self, cfg, max_lag_seconds: float, check_seconds: float = LAG_CHECK_SECONDS):
+        self.cfg = cfg
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.lag: Optional[float] = None
+        self.last_error: Optional[Exception] = None
+
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+        self._lock = threading.Lock()
+        self._usable = False
+        self._next_check = 0.0
+
+    def connect(self):
+        return mysql.connector.connect(
+            host=self.cfg.host,
+            port=self.cfg.port,
+            user=self.cfg.user,
+            password=self.cfg.password,
+            database=self.cfg.database,
+        )
+
+    def usable(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_check:
+                return self._usable
+            # Other readers keep the previous answer while this thread checks
+            self._next_check = now + self.check_seconds
+
+        usable = self._check()
+        with self._lock:
+            self._usable = usable
+        return usable
+
+    def mark_down(self, error: Exception) -> None:
+        """
+        A replica connection failed: route to the primary until the next check.
+        """
+        with self._lock:
+            self.last_error = error
+            self._usable = False
+            self._next_check = time.monotonic() + self.check_seconds
+
+    def count(self, on_replica: bool) -> None:
+        with self._lock:
+            if on_replica:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+
+    def _check(self) -> bool:
+        cnx = None
+        try:
+            cnx = self.connect()
+            cur = cnx.cursor(dictionary=True)
+            try:
+                self.lag = self._read_lag(cur)
+            finally:
+                cur.close()
+            self.last_error = None
+        except MySqlError as ex:
+            self.lag = None
+            self.last_error = ex
+            return False
+        finally:
+            if cnx is not None:
+                cnx.close()
+
+        return self.lag is not None and self.lag <= self.max_lag_seconds
+
+    @staticmethod
+    def _read_lag(cur) -> Optional[float]:
+        try:
+            cur.execute("SHOW REPLICA STATUS")
+            row = cur.fetchone()
+            key = "Seconds_Behind_Source"
+        except MySqlError:
+            # MySQL < 8.0.22 / MariaDB
+            cur.execute("SHOW SLAVE STATUS")
+            row = cur.fetchone()
+            key = "Seconds_Behind_Master"
+
+        if row is None:
+            return None  # not configured as a replica
+        lag = row.get(key)
+        return None if lag is None else float(lag)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "usable": self._usable,
+                "lag": self.lag,
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+            }
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from src.db_mysql import Db, NotFoundError, ValidationError, placeholders
+
+# Matches moved per transaction (their events etc. move with them)
+ARCHIVE_CHUNK = 200
+
+# Tables keyed by match_id that move together with matches; children first
+MATCH_CHILD_TABLES = (
+    "match_event", "match_referee", "team_rating_history", "head_to_head_match", "ban_served_match",
+)
+
+# Tables whose statements also filter on tournament_id (partition key of match_event)
+TOURNAMENT_KEYED = frozenset({"match_event"})
+
+# Columns copied between a table and its archive_ twin. A migration that adds
+# a column to one of these tables must add it to the archive table and here.
+ARCHIVE_COLUMNS = {
+    "matches": (
+        "match_id", "tournament_id", "home_team_id", "away_team_id", "start_time", "status",
+        "is_overtime", "version", "home_goals", "away_goals", "home_yellows", "away_yellows",
+        "home_reds", "away_reds",
+    ),
+    "match_event": (
+        "event_id", "match_id", "tournament_id", "player_id", "team_id", "minute", "event_type",
+        "xg", "created_at", "version",
+    ),
+    "match_referee": ("match_id", "referee_id"),
+    "team_rating_history": (
+        "history_id", "team_id", "match_id", "match_time", "rating_before", "rating_after",
+    ),
+    "head_to_head_match": ("match_id",),
+    "ban_served_match": ("match_id",),
+}
+
+
+def archive_table(table: str) -> str:
+    return f"archive_{table}"
+
+
+class ArchiveRepository:
+    """
+    Moves the matches of a tournament between the hot tables and the archive_*
+    tables (see migration 010).
+
+    Every chunk is its own short transaction: lock up to chunk matches, copy
+    them and their child rows with INSERT ... SELECT (explicit column lists,
+    ARCHIVE_COLUMNS), delete the originals.
+    A job that stops halfway leaves every match either fully archived or fully
+    hot, and running it again continues where it stopped.
+    """
+
+    def __init__(self, db: Db):
+        self.db = db
+
+    def counts(self, tournament_id: int) -> Dict[str, int]:
+        """
+        {"hot": matches in the hot table, "archived": matches in the archive}
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM matches WHERE tournament_id=%s) AS hot,
+                    (SELECT COUNT(*) FROM archive_matches WHERE tournament_id=%s) AS archived
+                """,
+                (tournament_id, tournament_id),
+            )
+            row = cur.fetchone()
+            return {"hot": int(row["hot"]), "archived": int(row["archived"])}
+
+    def check_archivable(self, tournament_id: int) -> None:
+        """
+        Only finished tournaments: no scheduled or live match may be left.
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute("SELECT tournament_id FROM tournament WHERE tournament_id=%s", (tournament_id,))
+            if not cur.fetchone():
+                raise NotFoundError(f"Tournament {tournament_id} not found")
+
+            cur.execute(
+                """
+                SELECT COUNT(*) AS open_matches
+                FROM matches
+                WHERE tournament_id=%s AND status IN ('scheduled', 'live')
+                """,
+                (tournament_id,),
+            )
+            open_matches = int(cur.fetchone()["open_matches"])
+            if open_matches:
+                raise ValidationError(
+                    f"Tournament {tournament_id} still has {open_matches} scheduled/live matches"
+                )
+
+    def archive_chunk(self, tournament_id: int, chunk: int = ARCHIVE_CHUNK) -> int:
+        """
+        Transaction:
+          1) Lock up to chunk matches of the tournament (lowest ids first)
+          2) Copy their child rows and then the matches to the archive tables
+          3) Delete child rows, then the matches, from the hot tables
+        Returns the number of matches moved (0 = nothing left).
+        """
+        def work(cur) -> int:
+            ids = self._lock_ids(cur, "matches", tournament_id, chunk)
+            if ids:
+                self._move(cur, tournament_id, ids, MATCH_CHILD_TABLES + ("matches",), archive_table, lambda t: t)
+            return len(ids)
+
+        return self.db.run_transaction(work, "archive_chunk", f"archive matches of tournament {tournament_id}")
+
+    def restore_chunk(self, tournament_id: int, chunk: int = ARCHIVE_CHUNK) -> int:
+        """
+        Transaction: the reverse of archive_chunk (matches are inserted before
+        their child rows, so the foreign keys of the hot tables hold).
+        Returns the number of matches moved back (0 = nothing left).
+        """
+        def work(cur) -> int:
+            ids = self._lock_ids(cur, "archive_matches", tournament_id, chunk)
+            if ids:
+                self._move(cur, tournament_id, ids, ("matches",) + MATCH_CHILD_TABLES, lambda t: t, archive_table)
+            return len(ids)
+
+        return self.db.run_transaction(work, "restore_chunk", f"restore matches of tournament {tournament_id}")
+
+    def set_archived(self, tournament_id: int, archived: bool) -> None:
+        sql = f"""
+        UPDATE tournament
+        SET archived_at={"NOW()" if archived else "NULL"}, version=version + 1
+        WHERE tournament_id=%s
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id,))
+            if cur.rowcount == 0:
+                raise NotFoundError(f"Tournament {tournament_id} not found")
+            cnx.commit()
+
+    # -------------------------
+    # Helpers (run inside an open transaction)
+    # -------------------------
+    @staticmethod
+    def _lock_ids(cur, table: str, tournament_id: int, chunk: int) -> List[int]:
+        cur.execute(
+            f"""
+            SELECT match_id FROM {table}
+            WHERE tournament_id=%s
+            ORDER BY match_id
+            LIMIT %s
+            FOR UPDATE
+            """,
+            (tournament_id, chunk),
+        )
+        return [int(r["match_id"]) for r in cur.fetchall()]
+
+    @staticmethod
+    def _move(cur, tournament_id: int, ids: List[int], tables, target, source) -> None:
+        """
+        Copies the rows of ids from source(table) to target(table), then
+        deletes them from the sources; both in the order of tables (the hot
+        side needs parents inserted first and children deleted first).
+        """
+        def where(table: str):
+            match_ids = f"match_id IN ({placeholders(len(ids))})"
+            if table in TOURNAMENT_KEYED:
+                return f"tournament_id=%s AND {match_ids}", (tournament_id, *ids)
+            return match_ids, tuple(ids)
+
+        for table in tables:
+            sql, params = where(table)
+            columns = ", ".join(ARCHIVE_COLUMNS[table])
+            cur.execute(
+                f"INSERT INTO {target(table)} ({columns}) SELECT {columns} FROM {source(table)} WHERE {sql}",
+                params,
+            )
+        for table in tables:
+            sql, params = where(table)
+            cur.execute(f"DELETE FROM {source(table)} WHERE {sql}", params)
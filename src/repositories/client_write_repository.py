@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class ClientWriteRepository:
+    """
+    Client-generated write ids (client_write) for idempotent replays.
+    Both methods work on a cursor of an already open transaction.
+    """
+
+    @staticmethod
+    def find(cur, client_id: str) -> Optional[int]:
+        """
+        Returns the event_id of an already applied write, None if it is new.
+        Locks the id, so a concurrent replay of the same write waits here.
+        """
+        cur.execute("SELECT event_id FROM client_write WHERE client_id=%s FOR UPDATE", (client_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        return int(row["event_id"])
+
+    @staticmethod
+    def record(cur, client_id: str, event_id: int) -> None:
+        cur.execute("INSERT INTO client_write (client_id, event_id) VALUES (%s, %s)", (client_id, event_id))
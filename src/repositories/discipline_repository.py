@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, placeholders
+from src.models.player_discipline import PlayerDiscipline
+
+# Every YELLOW_LIMIT yellow cards in a tournament -> YELLOW_BAN_MATCHES suspension
+YELLOW_LIMIT = 3
+YELLOW_BAN_MATCHES = 1
+RED_BAN_MATCHES = 1
+
+# MySQL evaluates SET assignments left to right, so this sees the new counters
+_BANS_TOTAL = f"bans_total = reds * {RED_BAN_MATCHES} + FLOOR(yellows / {YELLOW_LIMIT}) * {YELLOW_BAN_MATCHES}"
+
+
+def bans_for(yellows: int, reds: int) -> int:
+    return reds * RED_BAN_MATCHES + (yellows // YELLOW_LIMIT) * YELLOW_BAN_MATCHES
+
+
+_COLUMNS = """
+tournament_id, player_id, team_id, yellows, reds, bans_total, bans_served,
+ban_remaining, last_card_match_id, last_served_match_id
+"""
+
+
+class DisciplineRepository:
+    """
+    Accumulated cards and suspensions (player_discipline).
+
+    apply_* / check_* work on a cursor of an open event write transaction.
+    """
+
+    def __init__(self, db: Db):
+        self.db = db
+
+    # -------------------------
+    # Incremental maintenance (called inside event write transactions)
+    # -------------------------
+    def check_eligible(self, cur, tournament_id: int, match_id: int, player_id: Optional[int]) -> None:
+        """
+        Lineup check: a suspended player cannot appear in a later match.
+        The match in which the suspension was earned is still allowed.
+        """
+        if player_id is None:
+            return
+        cur.execute(
+            """
+            SELECT ban_remaining, last_card_match_id
+            FROM player_discipline
+            WHERE tournament_id=%s AND player_id=%s
+            """,
+            (tournament_id, player_id),
+        )
+        row = cur.fetchone()
+        if row and row["ban_remaining"] > 0 and row["last_card_match_id"] != match_id:
+            raise ValidationError(
+                f"Player {player_id} is suspended ({row['ban_remaining']} match(es) remaining)."
+            )
+
+    def apply_insert(self, cur, tournament_id: int, e: dict) -> None:
+        self._apply(cur, tournament_id, e, +1)
+
+    def apply_delete(self, cur, tournament_id: int, e: dict) -> None:
+        self._apply(cur, tournament_id, e, -1)
+
+    def remove_matches(self, cur, tournament_ids: List[int], match_ids: List[int]) -> None:
+        """
+        Call before the events of whole matches are deleted: subtracts their
+        cards; served suspensions are kept.
+        """
+        t_marks = placeholders(len(tournament_ids))
+        cur.execute(
+            f"""
+            UPDATE player_discipline d
+            JOIN (
+                SELECT e.tournament_id, e.player_id,
+                       SUM(e.event_type='yellow') AS yellows, SUM(e.event_type='red') AS reds
+                FROM match_event e
+                WHERE e.tournament_id IN ({t_marks})
+                  AND e.match_id IN ({placeholders(len(match_ids))})
+                  AND e.player_id IS NOT NULL
+                  AND e.event_type IN ('yellow', 'red')
+                GROUP BY e.tournament_id, e.player_id
+            ) c ON c.tournament_id = d.tournament_id AND c.player_id = d.player_id
+            SET d.yellows=GREATEST(d.yellows - c.yellows, 0),
+                d.reds=GREATEST(d.reds - c.reds, 0)
+            """,
+            (*tournament_ids, *match_ids),
+        )
+        # Separate statement: a multi-table UPDATE has no left-to-right guarantee
+        cur.execute(
+            f"UPDATE player_discipline SET {_BANS_TOTAL} WHERE tournament_id IN ({t_marks})",
+            tournament_ids,
+        )
+
+    def add_matches(self, cur, tournament_ids: List[int], match_ids: List[int]) -> None:
+        """
+        The reverse of remove_matches(): call after the events of whole matches
+        were moved in (e.g. the match changed tournament); adds their cards.
+        """
+        t_marks = placeholders(len(tournament_ids))
+        cur.execute(
+            f"""
+            INSERT INTO player_discipline
+            (tournament_id, player_id, team_id, yellows, reds, bans_total, last_card_match_id)
+            SELECT e.tournament_id, e.player_id, MAX(e.team_id),
+                   SUM(e.event_type='yellow'), SUM(e.event_type='red'), 0, MAX(e.match_id)
+            FROM match_event e
+            WHERE e.tournament_id IN ({t_marks})
+              AND e.match_id IN ({placeholders(len(match_ids))})
+              AND e.player_id IS NOT NULL
+              AND e.event_type IN ('yellow', 'red')
+            GROUP BY e.tournament_id, e.player_id
+            ON DUPLICATE KEY UPDATE
+                team_id=VALUES(team_id),
+                yellows=yellows + VALUES(yellows),
+                reds=reds + VALUES(reds),
+                last_card_match_id=GREATEST(COALESCE(last_card_match_id, 0), VALUES(last_card_match_id))
+            """,
+            (*tournament_ids, *match_ids),
+        )
+        cur.execute(
+            f"UPDATE player_discipline SET {_BANS_TOTAL} WHERE tournament_id IN ({t_marks})",
+            tournament_ids,
+        )
+
+    def _apply(self, cur, tournament_id: int, e: dict, sign: int) -> None:
+        if e["event_type"] not in ("yellow", "red") or e.get("player_id") is None:
+            return
+
+        yellows = 1 if e["event_type"] == "yellow" else 0
+        reds = 1 if e["event_type"] == "red" else 0
+
+        if sign > 0:
+            cur.execute(
+                f"""
+                INSERT INTO player_discipline
+                (tournament_id, player_id, team_id, yellows, reds, bans_total, last_card_match_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    team_id=VALUES(team_id),
+                    yellows=yellows + VALUES(yellows),
+                    reds=reds + VALUES(reds),
+                    {_BANS_TOTAL},
+                    last_card_match_id=VALUES(last_card_match_id)
+                """,
+                (
+                    tournament_id, e["player_id"], e["team_id"], yellows, reds,
+                    bans_for(yellows, reds), e["match_id"],
+                ),
+            )
+        else:
+            cur.execute(
+                f"""
+                UPDATE player_discipline
+                SET yellows=GREATEST(yellows - %s, 0),
+                    reds=GREATEST(reds - %s, 0),
+                    {_BANS_TOTAL}
+                WHERE tournament_id=%s AND player_id=%s
+                """,
+                (yellows, reds, tournament_id, e["player_id"]),
+            )
+
+    # -------------------------
+    # Serving suspensions
+    # -------------------------
+    def serve_bans(self, match_id: int) -> int:
+        """
+        Called when a match finished: every suspended player of both teams
+        (suspended before this match) has served one match.
+
+        Transaction:
+          1) Insert the ban_served_match marker; skip matches already served
+          2) Serve one match of every suspension of both teams
+
+        Safe to call repeatedly for the same match, also after later matches
+        of the same teams were served. Returns affected players.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        "SELECT tournament_id, home_team_id, away_team_id FROM matches WHERE match_id=%s",
+                        (match_id,),
+                    )
+                    m = cur.fetchone()
+                    if not m:
+                        raise NotFoundError(f"Match {match_id} not found")
+
+                    cur.execute("INSERT IGNORE INTO ban_served_match (match_id) VALUES (%s)", (match_id,))
+                    if cur.rowcount == 0:
+                        cnx.rollback()
+                        return 0
+
+                    cur.execute(
+                        """
+                        UPDATE player_discipline
+                        SET bans_served=bans_served + 1,
+                            last_served_match_id=%s
+                        WHERE tournament_id=%s
+                          AND team_id IN (%s, %s)
+                          AND ban_remaining > 0
+                          AND (last_card_match_id IS NULL OR last_card_match_id <> %s)
+                        """,
+                        (match_id, m["tournament_id"], m["home_team_id"], m["away_team_id"], match_id),
+                    )
+                    affected = cur.rowcount
+
+                cnx.commit()
+                return affected
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to serve suspensions for match {match_id}: {e}") from e
+
+    def settle_bans(self, tournament_id: int) -> int:
+        """
+        Marks every suspension of a tournament as served, if the tournament has
+        no scheduled or live match left (e.g. an imported past season, whose
+        matches never ran through serve_bans), and its finished matches as
+        served (ban_served_match), so the status sweep leaves them alone.
+        Returns affected players (0 while the tournament is still open).
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        """
+                        SELECT COUNT(*) AS open_matches
+                        FROM matches
+                        WHERE tournament_id=%s AND status IN ('scheduled', 'live')
+                        """,
+                        (tournament_id,),
+                    )
+                    if int(cur.fetchone()["open_matches"]):
+                        cnx.rollback()
+                        return 0
+
+                    cur.execute(
+                        """
+                        UPDATE player_discipline
+                        SET bans_served=bans_total
+                        WHERE tournament_id=%s AND bans_served < bans_total
+                        """,
+                        (tournament_id,),
+                    )
+                    affected = cur.rowcount
+                    cur.execute(
+                        """
+                        INSERT IGNORE INTO ban_served_match (match_id)
+                        SELECT match_id FROM matches WHERE tournament_id=%s AND status='finished'
+                        """,
+                        (tournament_id,),
+                    )
+
+                cnx.commit()
+                return affected
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to settle suspensions of tournament {tournament_id}: {e}") from e
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def get(self, tournament_id: int, player_id: int) -> Optional[PlayerDiscipline]:
+        sql = f"""
+        SELECT {_COLUMNS}
+        FROM player_discipline
+        WHERE tournament_id=%s AND player_id=%s
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id, player_id))
+            row = cur.fetchone()
+            return PlayerDiscipline(**row) if row else None
+
+    def suspended_by_player(self, tournament_id: int, team_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        {player_id: matches remaining} for players with an active suspension.
+        Uses idx_discipline_team_ban, so only suspended rows are read.
+        """
+        sql = """
+        SELECT player_id, ban_remaining
+        FROM player_discipline
+        WHERE tournament_id=%s AND ban_remaining > 0
+        """
+        params: list = [tournament_id]
+        team_ids = list(team_ids or [])
+        if team_ids:
+            sql += f" AND team_id IN ({', '.join(['%s'] * len(team_ids))})"
+            params += team_ids
+
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, tuple(params))
+            return {int(r["player_id"]): int(r["ban_remaining"]) for r in cur.fetchall()}
+
+    def list_by_tournament(self, tournament_id: int) -> List[PlayerDiscipline]:
+        sql = f"""
+        SELECT {_COLUMNS}
+        FROM player_discipline
+        WHERE tournament_id=%s
+        ORDER BY ban_remaining DESC, reds DESC, yellows DESC
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id,))
+            return [PlayerDiscipline(**r) for r in cur.fetchall()]
+
+    # -------------------------
+    # Rebuild of card counters from raw events
+    # -------------------------
+    def rebuild(self, tournament_id: int) -> None:
+        """
+        Recounts cards from match_event; served suspensions are kept.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        "UPDATE player_discipline SET yellows=0, reds=0 WHERE tournament_id=%s",
+                        (tournament_id,),
+                    )
+                    cur.execute(
+                        """
+                        INSERT INTO player_discipline
+                        (tournament_id, player_id, team_id, yellows, reds, bans_total, last_card_match_id)
+                        SELECT e.tournament_id, e.player_id, MAX(e.team_id),
+                               SUM(e.event_type='yellow'), SUM(e.event_type='red'), 0, MAX(e.match_id)
+                        FROM match_event e
+                        WHERE e.tournament_id=%s
+                          AND e.player_id IS NOT NULL
+                          AND e.event_type IN ('yellow', 'red')
+                        GROUP BY e.tournament_id, e.player_id
+                        ON DUPLICATE KEY UPDATE
+                            team_id=VALUES(team_id),
+                            yellows=VALUES(yellows),
+                            reds=VALUES(reds),
+                            last_card_match_id=VALUES(last_card_match_id)
+                        """,
+                        (tournament_id,),
+                    )
+                    cur.execute(
+                        f"UPDATE player_discipline SET {_BANS_TOTAL} WHERE tournament_id=%s",
+                        (tournament_id,),
+                    )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to rebuild discipline: {e}") from e
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError
+from src.models.head_to_head import HeadToHead
+
+LAST_RESULTS = 5
+BATCH_SIZE = 1000
+
+
+def pair_key(team_a: int, team_b: int) -> Tuple[int, int]:
+    return (team_a, team_b) if team_a < team_b else (team_b, team_a)
+
+
+def result_entry(result: dict) -> dict:
+    """
+    One match from the pair's (low, high) point of view, stored in last_results.
+    """
+    low, _high = pair_key(result["home_team_id"], result["away_team_id"])
+    home_is_low = result["home_team_id"] == low
+    return {
+        "match_id": result["match_id"],
+        "start_time": result["start_time"].strftime("%Y-%m-%d %H:%M"),
+        "low_goals": result["home_goals"] if home_is_low else result["away_goals"],
+        "high_goals": result["away_goals"] if home_is_low else result["home_goals"],
+        "is_overtime": bool(result["is_overtime"]),
+    }
+
+
+class HeadToHeadRepository:
+    def __init__(self, db: Db):
+        self.db = db
+
+    def get(self, team_a: int, team_b: int) -> Optional[HeadToHead]:
+        """
+        Primary key read of the normalized pair.
+        """
+        low, high = pair_key(team_a, team_b)
+        sql = """
+        SELECT team_low_id, team_high_id, matches, low_wins, high_wins, draws,
+               low_goals, high_goals, last_results
+        FROM head_to_head
+        WHERE team_low_id=%s AND team_high_id=%s
+        """
+        with self.db.read_conn(("head_to_head",)) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (low, high))
+            row = cur.fetchone()
+            if not row:
+                return None
+            row["last_results"] = json.loads(row["last_results"])
+            return HeadToHead(**row)
+
+    def apply_match(self, result: dict) -> bool:
+        """
+        Transaction:
+          1) Mark the match as counted (INSERT IGNORE) - skip if it already was
+          2) Lock / create the pair row and add the result
+          3) Keep only the newest LAST_RESULTS entries in last_results
+
+        Returns False if the match had already been counted.
+        """
+        low, high = pair_key(result["home_team_id"], result["away_team_id"])
+        entry = result_entry(result)
+        lg, hg = entry["low_goals"], entry["high_goals"]
+
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        "INSERT IGNORE INTO head_to_head_match (match_id) VALUES (%s)",
+                        (result["match_id"],),
+                    )
+                    if cur.rowcount == 0:
+                        cnx.rollback()
+                        return False
+
+                    cur.execute(
+                        """
+                        INSERT IGNORE INTO head_to_head (team_low_id, team_high_id, last_results)
+                        VALUES (%s, %s, '[]')
+                        """,
+                        (low, high),
+                    )
+                    cur.execute(
+                        """
+                        SELECT last_results FROM head_to_head
+                        WHERE team_low_id=%s AND team_high_id=%s
+                        FOR UPDATE
+                        """,
+                        (low, high),
+                    )
+                    last = json.loads(cur.fetchone()["last_results"])
+                    last = sorted(last + [entry], key=lambda r: r["start_time"], reverse=True)[:LAST_RESULTS]
+
+                    cur.execute(
+                        """
+                        UPDATE head_to_head
+                        SET matches=matches + 1,
+                            low_wins=low_wins + %s,
+                            high_wins=high_wins + %s,
+                            draws=draws + %s,
+                            low_goals=low_goals + %s,
+                            high_goals=high_goals + %s,
+                            last_results=%s
+                        WHERE team_low_id=%s AND team_high_id=%s
+                        """,
+                        (int(lg > hg), int(hg > lg), int(lg == hg), lg, hg, json.dumps(last), low, high),
+                    )
+
+                cnx.commit()
+                return True
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to update head-to-head for match {result['match_id']}: {e}") from e
+
+    def replace_all(self, records: Dict[Tuple[int, int], dict], match_ids: List[int]) -> None:
+        """
+        Replaces the whole store after a rebuild.
+        records: {(low, high): {matches, low_wins, high_wins, draws, low_goals, high_goals, last_results}}
+        """
+        columns = ("matches", "low_wins", "high_wins", "draws", "low_goals", "high_goals")
+        rows = [
+            (low, high, *(r[c] for c in columns), json.dumps(r["last_results"]))
+            for (low, high), r in records.items()
+        ]
+
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute("DELETE FROM head_to_head")
+                    cur.execute("DELETE FROM head_to_head_match")
+
+                    for i in range(0, len(rows), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            INSERT INTO head_to_head
+                            (team_low_id, team_high_id, matches, low_wins, high_wins, draws,
+                             low_goals, high_goals, last_results)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                            """,
+                            rows[i:i + BATCH_SIZE],
+                        )
+                    for i in range(0, len(match_ids), BATCH_SIZE):
+                        cur.executemany(
+                            "INSERT INTO head_to_head_match (match_id) VALUES (%s)",
+                            [(mid,) for mid in match_ids[i:i + BATCH_SIZE]],
+                        )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to rebuild head-to-head: {e}") from e
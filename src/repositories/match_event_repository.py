@@ -1,58 +1,112 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
-from src.db_mysql import Db, NotFoundError, ValidationError, DbError
+from src.db_mysql import Db, ConflictError, NotFoundError, ValidationError, DbError, placeholders, raise_update_miss
 from src.models.match_event import MatchEvent
+from src.repositories.client_write_repository import ClientWriteRepository
+from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.match_score_repository import MatchScoreRepository, score_column
+from src.repositories.stats_repository import StatsRepository
+
+BATCH_SIZE = 1000
 
 
 class MatchEventRepository:
     def __init__(self, db: Db):
         self.db = db
+        self.stats = StatsRepository(db)
+        self.discipline = DisciplineRepository(db)
+        self.scores = MatchScoreRepository(db)
+        self.client_writes = ClientWriteRepository()
 
-    def get_by_id(self, event_id: int) -> MatchEvent:
+    def get_by_id(self, event_id: int, tournament_id: int) -> MatchEvent:
+        """
+        tournament_id: the tournament of the event's match (partition key).
+        """
         sql = """
-        SELECT event_id, match_id, player_id, team_id, minute, event_type, xg, created_at
+        SELECT event_id, match_id, player_id, team_id, minute, event_type, xg, created_at, version
         FROM match_event
-        WHERE event_id=%s
+        WHERE event_id=%s AND tournament_id=%s
         """
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (event_id,))
+            cur.execute(sql, (event_id, tournament_id))
             row = cur.fetchone()
             if not row:
                 raise NotFoundError(f"MatchEvent {event_id} not found")
             return MatchEvent(**row)
 
-    def list_by_match(self, match_id: int) -> List[MatchEvent]:
+    def list_by_match(self, match_id: int, tournament_id: Optional[int] = None) -> List[MatchEvent]:
+        """
+        The event query carries the partition key as a constant (one partition
+        of a partitioned match_event). Callers that have the match pass its
+        tournament_id; otherwise it is read first (one more round trip).
+        """
         sql = """
-        SELECT event_id, match_id, player_id, team_id, minute, event_type, xg, created_at
+        SELECT event_id, match_id, player_id, team_id, minute, event_type, xg, created_at, version
         FROM match_event
-        WHERE match_id=%s
+        WHERE tournament_id=%s AND match_id=%s
         ORDER BY minute, created_at, event_id
         """
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (match_id,))
+            if tournament_id is None:
+                cur.execute("SELECT tournament_id FROM matches WHERE match_id=%s", (match_id,))
+                match = cur.fetchone()
+                if not match:
+                    return []
+                tournament_id = match["tournament_id"]
+            cur.execute(sql, (tournament_id, match_id))
             return [MatchEvent(**r) for r in cur.fetchall()]
 
-    def insert(self, e: MatchEvent) -> int:
+    def xg_totals_by_team(self, tournament_ids: List[int]) -> Dict[int, float]:
         """
-        created_at is always generated by the database (NOW()) to avoid NULL issues.
+        Historical xG per team in the finished matches of the given tournaments
+        (partition keys): {team_id: xg_sum}. Teams without any xG event are missing.
         """
-        sql = """
-        INSERT INTO match_event (match_id, player_id, team_id, minute, event_type, xg, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, NOW())
+        if not tournament_ids:
+            return {}
+        sql = f"""
+        SELECT e.team_id, SUM(e.xg) AS xg_sum
+        FROM match_event e
+        JOIN matches m ON m.match_id = e.match_id AND m.status = 'finished'
+        WHERE e.tournament_id IN ({placeholders(len(tournament_ids))}) AND e.xg IS NOT NULL
+        GROUP BY e.team_id
         """
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(
-                sql,
-                (e.match_id, e.player_id, e.team_id, e.minute, e.event_type, e.xg),
-            )
-            cnx.commit()
-            return int(cur.lastrowid)
+            cur.execute(sql, tuple(tournament_ids))
+            return {int(r["team_id"]): float(r["xg_sum"] or 0.0) for r in cur.fetchall()}
+
+    def insert(self, e: MatchEvent, client_id: Optional[str] = None) -> int:
+        """
+        created_at is always generated by the database (NOW()) to avoid NULL issues.
+        Tournament statistics and the match score columns are updated in the
+        same transaction.
+        client_id (optional) makes the write idempotent: an event already
+        written under that id is not inserted again, its id is returned.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    event_id = self.insert_event(cur, e, client_id)
+
+                cnx.commit()
+                return event_id
+
+            except Exception as ex:
+                cnx.rollback()
+                if isinstance(ex, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to insert match event: {ex}") from ex
 
-    def update(self, e: MatchEvent) -> None:
+    def update(self, e: MatchEvent, tournament_id: int) -> None:
         """
         created_at is an audit field; we do not update it.
+        Compare-and-swap on e.version (ConflictError if the event changed since
+        it was read); version None overwrites unconditionally.
+        tournament_id: the tournament the event is in now (partition key), i.e.
+        of the match it was read with; e.match_id may name another match.
         """
         if e.event_id is None:
             raise ValueError("event_id is required")
@@ -60,29 +114,83 @@ class MatchEventRepository:
         sql = """
         UPDATE match_event
         SET match_id=%s,
+            tournament_id=%s,
             player_id=%s,
             team_id=%s,
             minute=%s,
             event_type=%s,
-            xg=%s
-        WHERE event_id=%s
+            xg=%s,
+            version=version + 1
+        WHERE event_id=%s AND tournament_id=%s
         """
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(
-                sql,
-                (e.match_id, e.player_id, e.team_id, e.minute, e.event_type, e.xg, e.event_id),
-            )
-            if cur.rowcount == 0:
-                raise NotFoundError(f"MatchEvent {e.event_id} not found")
-            cnx.commit()
-
-    def delete(self, event_id: int) -> None:
-        sql = "DELETE FROM match_event WHERE event_id=%s"
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (event_id,))
-            if cur.rowcount == 0:
-                raise NotFoundError(f"MatchEvent {event_id} not found")
-            cnx.commit()
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    old = self._get_event_for_update(cur, e.event_id, tournament_id)
+                    if e.version is not None and old["version"] != e.version:
+                        raise ConflictError(
+                            f"MatchEvent {e.event_id} was changed by someone else "
+                            f"(now version {old['version']}), reload and try again"
+                        )
+                    old_match = self._get_match(cur, old["match_id"])
+                    new_match = self._get_match(cur, e.match_id)
+
+                    if (old["match_id"], old["player_id"]) != (e.match_id, e.player_id):
+                        self.discipline.check_eligible(cur, new_match["tournament_id"], e.match_id, e.player_id)
+
+                    # A new tournament moves the row to another partition
+                    cur.execute(
+                        sql,
+                        (
+                            e.match_id, new_match["tournament_id"], e.player_id, e.team_id,
+                            e.minute, e.event_type, e.xg, e.event_id, tournament_id,
+                        ),
+                    )
+
+                    row = self._event_row(e)
+                    self.stats.apply_update(cur, old_match["tournament_id"], old, new_match["tournament_id"], row)
+                    self.discipline.apply_delete(cur, old_match["tournament_id"], old)
+                    self.discipline.apply_insert(cur, new_match["tournament_id"], row)
+                    self.scores.apply_delete(cur, old_match, old)
+                    self.scores.apply_insert(cur, new_match, row)
+
+                cnx.commit()
+
+            except Exception as ex:
+                cnx.rollback()
+                if isinstance(ex, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to update match event {e.event_id}: {ex}") from ex
+
+    def delete(self, event_id: int, tournament_id: int) -> None:
+        """
+        tournament_id: the tournament of the event's match (partition key).
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    old = self._get_event_for_update(cur, event_id, tournament_id)
+                    match = self._get_match(cur, old["match_id"])
+
+                    cur.execute(
+                        "DELETE FROM match_event WHERE event_id=%s AND tournament_id=%s",
+                        (event_id, tournament_id),
+                    )
+                    self.stats.apply_delete(cur, match["tournament_id"], old)
+                    self.discipline.apply_delete(cur, match["tournament_id"], old)
+                    self.scores.apply_delete(cur, match, old)
+
+                cnx.commit()
+
+            except Exception as ex:
+                cnx.rollback()
+                if isinstance(ex, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to delete match event {event_id}: {ex}") from ex
 
     def add_goal_transaction(
         self,
@@ -91,54 +199,255 @@ class MatchEventRepository:
         player_id: Optional[int],
         minute: int,
         xg: Optional[float] = None,
+        client_id: Optional[str] = None,
     ) -> int:
         """
         Transaction:
-          1) Lock match row (FOR UPDATE) and validate status
+          1) Read the match (no lock) and validate status
           2) Insert goal event (created_at via NOW())
-          3) If match was scheduled, switch it to live
+          3) Update tournament statistics
+          4) One guarded UPDATE of the match: score +1 and scheduled -> live,
+             only if the match version is still the one read in 1)
+
+        Suspended players are rejected before the insert. Concurrent goals of one
+        match do not wait for each other (the row is locked only by the final
+        UPDATE until commit; step 3 locks just the presence rows of the scorer
+        and the team, see StatsRepository). If the match was changed meanwhile (status, teams),
+        the whole unit is run again from 1) (Db.run_transaction, also on
+        deadlock / lock wait timeout); a match finished or cancelled meanwhile
+        ends with ValidationError.
+        client_id: as in insert().
         """
+        self.check_minute(minute)
+
+        def work(cur) -> int:
+            return self.add_goal(cur, match_id, team_id, player_id, minute, xg, client_id)
+
+        return self.db.run_transaction(work, "add_goal", "add goal transaction", retry_on=(ConflictError,))
+
+    # -------------------------
+    # Writes on a cursor of an open transaction (also batched by journal replays)
+    # -------------------------
+    @staticmethod
+    def check_minute(minute: int) -> None:
         if minute < 0 or minute > 200:
             raise ValidationError("minute out of range (0..200)")
 
+    def insert_event(self, cur, e: MatchEvent, client_id: Optional[str] = None) -> int:
+        """
+        Body of insert(): event row, statistics, suspensions and score columns.
+        Like add_goal(), refuses finished / cancelled matches and teams that do
+        not play the match (also when a journaled event is replayed).
+        """
+        if client_id is not None:
+            done = self.client_writes.find(cur, client_id)
+            if done is not None:
+                return done
+
+        match = self._get_match(cur, e.match_id)
+        self._check_open(match)
+        if e.team_id not in (match["home_team_id"], match["away_team_id"]):
+            raise ValidationError(f"team {e.team_id} does not play match {e.match_id}")
+        self.discipline.check_eligible(cur, match["tournament_id"], e.match_id, e.player_id)
+
+        cur.execute(
+            """
+            INSERT INTO match_event (match_id, tournament_id, player_id, team_id, minute, event_type, xg, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+            """,
+            (e.match_id, match["tournament_id"], e.player_id, e.team_id, e.minute, e.event_type, e.xg),
+        )
+        event_id = int(cur.lastrowid)
+
+        row = self._event_row(e)
+        self.stats.apply_insert(cur, match["tournament_id"], row)
+        self.discipline.apply_insert(cur, match["tournament_id"], row)
+        self.scores.apply_insert(cur, match, row)
+
+        if client_id is not None:
+            self.client_writes.record(cur, client_id, event_id)
+        return event_id
+
+    def add_goal(
+        self,
+        cur,
+        match_id: int,
+        team_id: int,
+        player_id: Optional[int],
+        minute: int,
+        xg: Optional[float] = None,
+        client_id: Optional[str] = None,
+    ) -> int:
+        """
+        Body of add_goal_transaction() (steps 1-4). ConflictError means the
+        match changed since it was read; run the whole transaction again.
+        """
+        if client_id is not None:
+            done = self.client_writes.find(cur, client_id)
+            if done is not None:
+                return done
+
+        match = self._get_match(cur, match_id)
+        self._check_open(match)
+        if team_id not in (match["home_team_id"], match["away_team_id"]):
+            raise ValidationError(f"team {team_id} does not play match {match_id}")
+
+        self.discipline.check_eligible(cur, match["tournament_id"], match_id, player_id)
+
+        cur.execute(
+            """
+            INSERT INTO match_event
+            (match_id, tournament_id, player_id, team_id, minute, event_type, xg, created_at)
+            VALUES (%s, %s, %s, %s, %s, 'goal', %s, NOW())
+            """,
+            (match_id, match["tournament_id"], player_id, team_id, minute, xg),
+        )
+        event_id = int(cur.lastrowid)
+
+        row = {
+            "match_id": match_id,
+            "player_id": player_id,
+            "team_id": team_id,
+            "event_type": "goal",
+            "xg": xg,
+        }
+        self.stats.apply_insert(cur, match["tournament_id"], row)
+
+        # version is read before "status" is assigned (left to right)
+        column = score_column(match, row)
+        cur.execute(
+            f"""
+            UPDATE matches
+            SET version=version + (status='scheduled'),
+                status=IF(status='scheduled', 'live', status),
+                {column}={column} + 1
+            WHERE match_id=%s AND version=%s
+            """,
+            (match_id, match["version"]),
+        )
+        if cur.rowcount == 0:
+            self._check_open(self._get_match(cur, match_id, latest=True))
+            raise_update_miss(cur, "matches", "match_id", match_id, f"Match {match_id}")
+
+        if client_id is not None:
+            self.client_writes.record(cur, client_id, event_id)
+        return event_id
+
+    # -------------------------
+    # Bulk paths for imports
+    # -------------------------
+    def match_ids_with_events(self, tournament_id: int) -> Set[int]:
+        """
+        Matches of one tournament (partition key) that have at least one event.
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute("SELECT DISTINCT match_id FROM match_event WHERE tournament_id=%s", (tournament_id,))
+            return {int(r["match_id"]) for r in cur.fetchall()}
+
+    def insert_many(self, events: Iterable[MatchEvent]) -> int:
+        """
+        Batched INSERT of historical events in one transaction (consumed lazily).
+
+        Rollups, suspensions and score columns are NOT maintained row by row
+        here; the caller rebuilds them once per tournament afterwards
+        (stats / discipline rebuild, scores reconcile).
+        If the iterable raises, everything is rolled back.
+        """
+        sql = """
+        INSERT INTO match_event (match_id, tournament_id, player_id, team_id, minute, event_type, xg, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+        """
+        count = 0
         with self.db.conn() as cnx:
             try:
                 cnx.start_transaction()
 
                 with self.db.cursor(cnx) as cur:
-                    cur.execute(
-                        "SELECT status FROM matches WHERE match_id=%s FOR UPDATE",
-                        (match_id,),
-                    )
-                    row = cur.fetchone()
-                    if not row:
-                        raise NotFoundError(f"Match {match_id} not found")
-
-                    status = row["status"]
-                    if status in ("finished", "cancelled"):
-                        raise ValidationError("cannot add event to finished/cancelled match")
-
-                    cur.execute(
-                        """
-                        INSERT INTO match_event
-                        (match_id, player_id, team_id, minute, event_type, xg, created_at)
-                        VALUES (%s, %s, %s, %s, 'goal', %s, NOW())
-                        """,
-                        (match_id, player_id, team_id, minute, xg),
-                    )
-                    event_id = int(cur.lastrowid)
-
-                    if status == "scheduled":
-                        cur.execute(
-                            "UPDATE matches SET status='live' WHERE match_id=%s",
-                            (match_id,),
-                        )
+                    batch: List[MatchEvent] = []
+                    for e in events:
+                        batch.append(e)
+                        if len(batch) >= BATCH_SIZE:
+                            count += self._insert_batch(cur, sql, batch)
+                            batch = []
+                    if batch:
+                        count += self._insert_batch(cur, sql, batch)
 
                 cnx.commit()
-                return event_id
+                return count
 
-            except Exception as e:
+            except Exception as ex:
                 cnx.rollback()
-                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                if isinstance(ex, (NotFoundError, ValidationError, DbError)):
                     raise
-                raise DbError(f"Failed to add goal transaction: {e}") from e
+                raise DbError(f"Failed to import match events: {ex}") from ex
+
+    # -------------------------
+    # Helpers (run inside an open transaction)
+    # -------------------------
+    @staticmethod
+    def _insert_batch(cur, sql: str, batch: List[MatchEvent]) -> int:
+        match_ids = sorted({e.match_id for e in batch})
+        cur.execute(
+            f"SELECT match_id, tournament_id FROM matches WHERE match_id IN ({placeholders(len(match_ids))})",
+            match_ids,
+        )
+        tournaments = {int(r["match_id"]): int(r["tournament_id"]) for r in cur.fetchall()}
+        missing = set(match_ids) - set(tournaments)
+        if missing:
+            raise NotFoundError(f"Matches not found: {sorted(missing)}")
+
+        cur.executemany(
+            sql,
+            [
+                (e.match_id, tournaments[e.match_id], e.player_id, e.team_id, e.minute, e.event_type, e.xg)
+                for e in batch
+            ],
+        )
+        return len(batch)
+
+    @staticmethod
+    def _get_match(cur, match_id: int, latest: bool = False) -> dict:
+        sql = """
+        SELECT match_id, tournament_id, status, home_team_id, away_team_id, version
+        FROM matches
+        WHERE match_id=%s
+        """
+        if latest:
+            # Locking read: the committed row instead of the transaction snapshot
+            sql += " FOR SHARE"
+        cur.execute(sql, (match_id,))
+        row = cur.fetchone()
+        if not row:
+            raise NotFoundError(f"Match {match_id} not found")
+        return row
+
+    @staticmethod
+    def _check_open(match: dict) -> None:
+        if match["status"] in ("finished", "cancelled"):
+            raise ValidationError("cannot add event to finished/cancelled match")
+
+    @staticmethod
+    def _get_event_for_update(cur, event_id: int, tournament_id: int) -> dict:
+        cur.execute(
+            """
+            SELECT event_id, match_id, player_id, team_id, minute, event_type, xg, version
+            FROM match_event
+            WHERE event_id=%s AND tournament_id=%s
+            FOR UPDATE
+            """,
+            (event_id, tournament_id),
+        )
+        row = cur.fetchone()
+        if not row:
+            raise NotFoundError(f"MatchEvent {event_id} not found")
+        return row
+
+    @staticmethod
+    def _event_row(e: MatchEvent) -> dict:
+        return {
+            "match_id": e.match_id,
+            "player_id": e.player_id,
+            "team_id": e.team_id,
+            "event_type": e.event_type,
+            "xg": e.xg,
+        }
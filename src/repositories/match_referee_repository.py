@@ -1,7 +1,37 @@
-from typing import List
-from src.db_mysql import Db
+from typing import Dict, Iterable, List, Set, Tuple
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, chunked, placeholders
 from src.models.match_referee import MatchReferee
 
+
+def reassign_referees(cur, match_id: int, referee_ids: Iterable[int]) -> Tuple[List[int], List[int]]:
+    """
+    Cursor-level set diff (caller owns the transaction): locks the current rows,
+    deletes only removed referees and inserts only added ones.
+    Returns (added, removed).
+    """
+    cur.execute(
+        "SELECT referee_id FROM match_referee WHERE match_id=%s FOR UPDATE",
+        (match_id,),
+    )
+    current = {int(r["referee_id"]) for r in cur.fetchall()}
+    wanted = set(referee_ids)
+
+    added = sorted(wanted - current)
+    removed = sorted(current - wanted)
+
+    if removed:
+        cur.execute(
+            f"DELETE FROM match_referee WHERE match_id=%s AND referee_id IN ({placeholders(len(removed))})",
+            (match_id, *removed),
+        )
+    if added:
+        cur.executemany(
+            "INSERT INTO match_referee (match_id, referee_id) VALUES (%s, %s)",
+            [(match_id, rid) for rid in added],
+        )
+    return added, removed
+
+
 class MatchRefereeRepository:
     def __init__(self, db: Db):
         self.db = db
@@ -30,16 +60,90 @@ class MatchRefereeRepository:
             cnx.commit()
 
     def replace_match_referees_transaction(self, match_id: int, referee_ids: List[int]) -> None:
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+        """
+        Kept for existing callers; only the difference is written (see reassign).
+        """
+        self.reassign(match_id, referee_ids)
+
+    def reassign(self, match_id: int, referee_ids: Iterable[int]) -> Tuple[List[int], List[int]]:
+        """
+        Transaction:
+          1) Lock the match's current referee rows
+          2) DELETE removed referees, INSERT added ones (unchanged rows are not touched)
+
+        Returns (added, removed) referee ids. Retried on deadlock / lock wait timeout.
+        """
+        referee_ids = list(referee_ids)  # may be run more than once
+        return self.db.run_transaction(
+            lambda cur: reassign_referees(cur, match_id, referee_ids),
+            "reassign_referees",
+            f"reassign referees for match {match_id}",
+        )
+
+    def reassign_many(self, assignments: Dict[int, Iterable[int]]) -> Tuple[int, int]:
+        """
+        Re-staffs many matches at once: {match_id: referee_ids}.
+
+        Transaction:
+          1) Check that all matches exist and lock their current referee rows
+             (one SELECT per IN_CHUNK matches)
+          2) DELETE all removed (match, referee) pairs, INSERT all added pairs,
+             both batched
+
+        Every match must keep at least one referee. Returns (added, removed) pair counts.
+        """
+        wanted: Dict[int, Set[int]] = {mid: set(refs) for mid, refs in assignments.items()}
+        empty = sorted(mid for mid, refs in wanted.items() if not refs)
+        if empty:
+            raise ValidationError(f"At least one referee must be selected (matches {empty}).")
+
+        match_ids = sorted(wanted)
+        with self.db.conn() as cnx:
             try:
                 cnx.start_transaction()
-                cur.execute("DELETE FROM match_referee WHERE match_id=%s", (match_id,))
-                for rid in referee_ids:
-                    cur.execute(
-                        "INSERT INTO match_referee (match_id, referee_id) VALUES (%s, %s)",
-                        (match_id, rid),
-                    )
+
+                with self.db.cursor(cnx) as cur:
+                    current: Dict[int, Set[int]] = {mid: set() for mid in match_ids}
+                    found: Set[int] = set()
+                    for chunk in chunked(match_ids):
+                        marks = placeholders(len(chunk))
+                        cur.execute(f"SELECT match_id FROM matches WHERE match_id IN ({marks})", chunk)
+                        found.update(int(r["match_id"]) for r in cur.fetchall())
+                        cur.execute(
+                            f"""
+                            SELECT match_id, referee_id FROM match_referee
+                            WHERE match_id IN ({marks})
+                            FOR UPDATE
+                            """,
+                            chunk,
+                        )
+                        for r in cur.fetchall():
+                            current[int(r["match_id"])].add(int(r["referee_id"]))
+
+                    missing = sorted(set(match_ids) - found)
+                    if missing:
+                        raise NotFoundError(f"Matches not found: {missing}")
+
+                    added = [(mid, rid) for mid in match_ids for rid in sorted(wanted[mid] - current[mid])]
+                    removed = [(mid, rid) for mid in match_ids for rid in sorted(current[mid] - wanted[mid])]
+
+                    for chunk in chunked(removed):
+                        pairs = ", ".join(["(%s, %s)"] * len(chunk))
+                        cur.execute(
+                            f"DELETE FROM match_referee WHERE (match_id, referee_id) IN ({pairs})",
+                            [v for pair in chunk for v in pair],
+                        )
+                    for chunk in chunked(added):
+                        cur.executemany(
+                            "INSERT INTO match_referee (match_id, referee_id) VALUES (%s, %s)",
+                            chunk,
+                        )
+
                 cnx.commit()
-            except Exception:
+                return len(added), len(removed)
+
+            except Exception as e:
                 cnx.rollback()
-                raise
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to reassign referees: {e}") from e
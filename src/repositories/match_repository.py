@@ -1,19 +1,72 @@
 from __future__ import annotations
-from typing import List
-from src.db_mysql import Db, NotFoundError, DbError, ValidationError
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.db_mysql import Db, NotFoundError, DbError, ValidationError, chunked, placeholders, raise_update_miss, versioned
 from src.models.match import Match
+from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.match_referee_repository import reassign_referees
+from src.repositories.match_score_repository import recompute_scores
+from src.repositories.stats_repository import StatsRepository
+
+# Goals per side are the denormalized counters kept by MatchScoreRepository
+_RESULT_SELECT = """
+SELECT
+    m.match_id,
+    m.tournament_id,
+    m.home_team_id,
+    m.away_team_id,
+    m.start_time,
+    m.status,
+    m.is_overtime,
+    m.home_goals,
+    m.away_goals
+FROM matches m
+"""
+
+BATCH_SIZE = 1000
+
+# (tournament_id, home_team_id, away_team_id, start_time) identifies a match in imports
+MatchKey = Tuple[int, int, int, datetime]
+
+
+def match_key(m: Match) -> MatchKey:
+    return (m.tournament_id, m.home_team_id, m.away_team_id, m.start_time)
+
+
+# Manual status changes (set_status, set_status_many, update). Finished is
+# final: rating, head-to-head and served suspensions are already applied.
+# Setting the current status again is always allowed (e.g. finish hooks re-run).
+STATUS_TRANSITIONS = {
+    "scheduled": frozenset({"live", "finished", "cancelled"}),
+    "live": frozenset({"scheduled", "finished", "cancelled"}),
+    "cancelled": frozenset({"scheduled"}),
+    "finished": frozenset(),
+}
+
+
+def _check_transitions(rows: Iterable[dict], status: str) -> None:
+    refused = sorted(
+        (int(r["match_id"]), r["status"])
+        for r in rows
+        if r["status"] != status and status not in STATUS_TRANSITIONS.get(r["status"], ())
+    )
+    if refused:
+        details = ", ".join(f"{match_id} ({current})" for match_id, current in refused)
+        raise ValidationError(f"Cannot change the status to {status}: {details}")
 
 
 class MatchRepository:
     def __init__(self, db: Db):
         self.db = db
+        self.stats = StatsRepository(db)
+        self.discipline = DisciplineRepository(db)
 
     # -------------------------
     # Basic CRUD operations
     # -------------------------
     def get_by_id(self, match_id: int) -> Match:
         sql = """
-        SELECT match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime
+        SELECT match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime, version
         FROM matches
         WHERE match_id=%s
         """
@@ -29,7 +82,7 @@ class MatchRepository:
 
     def list_by_tournament(self, tournament_id: int) -> List[Match]:
         sql = """
-        SELECT match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime
+        SELECT match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime, version
         FROM matches
         WHERE tournament_id=%s
         ORDER BY start_time DESC
@@ -64,6 +117,20 @@ class MatchRepository:
             return int(cur.lastrowid)
 
     def update(self, m: Match) -> None:
+        """
+        Compare-and-swap on m.version (ConflictError if the match changed since
+        it was read); version None overwrites unconditionally.
+
+        Transaction:
+          1) Lock the match row, read its tournament and teams, check the
+             status change (STATUS_TRANSITIONS)
+          2) Update the match
+          3) If the tournament or the teams changed: subtract the match's events
+             from the statistics / discipline of the old tournament, move the
+             events (tournament_id, team of the side that changed) and add them
+             to the new one
+          4) Recompute the score counters (home/away may have been swapped)
+        """
         if m.match_id is None:
             raise ValueError("match_id is required")
 
@@ -74,44 +141,121 @@ class MatchRepository:
             away_team_id=%s,
             start_time=%s,
             status=%s,
-            is_overtime=%s
+            is_overtime=%s,
+            version=version + 1
         WHERE match_id=%s
         """
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(
-                sql,
-                (
-                    m.tournament_id,
-                    m.home_team_id,
-                    m.away_team_id,
-                    m.start_time,
-                    m.status,
-                    int(m.is_overtime),
-                    m.match_id,
-                ),
-            )
-            if cur.rowcount == 0:
-                raise NotFoundError(f"Match {m.match_id} not found")
+        params = (
+            m.tournament_id,
+            m.home_team_id,
+            m.away_team_id,
+            m.start_time,
+            m.status,
+            int(m.is_overtime),
+            m.match_id,
+        )
+        sql, params = versioned(sql, params, m.version)
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
 
-            cnx.commit()
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        """
+                        SELECT match_id, tournament_id, home_team_id, away_team_id, status
+                        FROM matches WHERE match_id=%s FOR UPDATE
+                        """,
+                        (m.match_id,),
+                    )
+                    before = cur.fetchone()
+                    if not before:
+                        raise NotFoundError(f"Match {m.match_id} not found")
+                    _check_transitions([before], m.status)
+
+                    cur.execute(sql, params)
+                    if cur.rowcount == 0:
+                        raise_update_miss(cur, "matches", "match_id", m.match_id, f"Match {m.match_id}")
+
+                    if (before["tournament_id"], before["home_team_id"], before["away_team_id"]) != (
+                        m.tournament_id, m.home_team_id, m.away_team_id
+                    ):
+                        self._move_events(cur, m, before)
 
-    def delete(self, match_id: int) -> None:
+                    # Home/away may have changed, so the score sides are recomputed
+                    recompute_scores(cur, [m.tournament_id], [m.match_id])
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to update match {m.match_id}: {e}") from e
+
+    def _move_events(self, cur, m: Match, before: dict) -> None:
+        """
+        Events carry the tournament of their match (partition key) and the team
+        of their side: both follow the match, and the rollups move with them.
         """
-        Deletes a match including all referee relations (match_referee).
-        This prevents foreign key constraint errors.
+        old_tournament = [before["tournament_id"]]
+        self.stats.remove_matches(cur, old_tournament, [m.match_id])
+        self.discipline.remove_matches(cur, old_tournament, [m.match_id])
+
+        # CASE sees the old team_id, so swapping home and away works too
+        cur.execute(
+            """
+            UPDATE match_event
+            SET tournament_id=%s,
+                team_id=CASE team_id WHEN %s THEN %s WHEN %s THEN %s ELSE team_id END
+            WHERE tournament_id=%s AND match_id=%s
+            """,
+            (
+                m.tournament_id,
+                before["home_team_id"], m.home_team_id,
+                before["away_team_id"], m.away_team_id,
+                before["tournament_id"], m.match_id,
+            ),
+        )
+
+        new_tournament = [m.tournament_id]
+        self.stats.add_matches(cur, new_tournament, [m.match_id])
+        self.discipline.add_matches(cur, new_tournament, [m.match_id])
+
+    def delete(self, match_id: int) -> bool:
+        """
+        Deletes a match including all referee relations (match_referee) and
+        events. This prevents foreign key constraint errors; events are
+        deleted explicitly because a partitioned match_event has no cascade.
+        Returns True if the match was finished: its rating and head-to-head
+        contribution is still in the teams / pairs (MatchStatusService.delete
+        recomputes them).
+        Retried on deadlock / lock wait timeout (Db.run_transaction).
+        """
+
+        def work(cur) -> bool:
+            rows = self._delete_matches(cur, [match_id])
+            if not rows:
+                raise NotFoundError(f"Match {match_id} not found")
+            return rows[0]["status"] == "finished"
+
+        return self.db.run_transaction(work, "delete_match", f"delete match {match_id}")
+
+    def set_status(self, match_id: int, status: str) -> None:
+        """
+        Transaction: lock the match, check the change (STATUS_TRANSITIONS), update.
         """
         with self.db.conn() as cnx:
             try:
                 cnx.start_transaction()
 
                 with self.db.cursor(cnx) as cur:
-                    # Delete M:N relations first
-                    cur.execute("DELETE FROM match_referee WHERE match_id=%s", (match_id,))
-
-                    # Delete the match itself
-                    cur.execute("DELETE FROM matches WHERE match_id=%s", (match_id,))
-                    if cur.rowcount == 0:
+                    cur.execute("SELECT match_id, status FROM matches WHERE match_id=%s FOR UPDATE", (match_id,))
+                    row = cur.fetchone()
+                    if not row:
                         raise NotFoundError(f"Match {match_id} not found")
+                    _check_transitions([row], status)
+
+                    cur.execute("UPDATE matches SET status=%s, version=version + 1 WHERE match_id=%s", (status, match_id))
 
                 cnx.commit()
 
@@ -119,24 +263,75 @@ class MatchRepository:
                 cnx.rollback()
                 if isinstance(e, (NotFoundError, ValidationError, DbError)):
                     raise
-                raise DbError(f"Failed to delete match {match_id}: {e}") from e
+                raise DbError(f"Failed to set status of match {match_id}: {e}") from e
 
-    # -------------------------
-    # D1 requirement:
-    # One UI action -> multiple tables
-    # Transaction over matches + match_referee
-    # -------------------------
-    def create_match_with_referees(self, m: Match, referee_ids: List[int]) -> int:
+    def set_status_many(self, match_ids: Iterable[int], status: str) -> int:
         """
-        Transaction:
-          1) Insert into matches
-          2) Insert into match_referee (M:N relation)
+        Transaction: one UPDATE ... WHERE match_id IN (...) per IN_CHUNK ids.
+        All ids must exist and allow the change (STATUS_TRANSITIONS), nothing
+        is changed otherwise. Returns the number of changed rows.
         """
-        if not referee_ids:
-            raise ValidationError("At least one referee must be selected.")
-        if m.home_team_id == m.away_team_id:
-            raise ValidationError("Home and Away teams must be different.")
+        ids = sorted(set(match_ids))
+        changed = 0
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for chunk in chunked(ids):
+                        marks = placeholders(len(chunk))
+                        cur.execute(
+                            f"SELECT match_id, status FROM matches WHERE match_id IN ({marks}) FOR UPDATE", chunk
+                        )
+                        rows = cur.fetchall()
+                        missing = set(chunk) - {int(r["match_id"]) for r in rows}
+                        if missing:
+                            raise NotFoundError(f"Matches not found: {sorted(missing)}")
+                        _check_transitions(rows, status)
+
+                        cur.execute(f"UPDATE matches SET status=%s, version=version + 1 WHERE match_id IN ({marks})", (status, *chunk))
+                        changed += cur.rowcount
 
+                cnx.commit()
+                return changed
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to set status of matches: {e}") from e
+
+    def list_unprocessed_finished(self, limit: int) -> List[int]:
+        """
+        Finished matches whose finish hooks did not complete: no rating
+        history, no served-suspensions marker or no head-to-head marker
+        (oldest first, so ratings are applied in match order).
+        """
+        sql = """
+        SELECT m.match_id
+        FROM matches m
+        WHERE m.status='finished'
+          AND (
+            NOT EXISTS (SELECT 1 FROM team_rating_history h WHERE h.match_id = m.match_id)
+            OR NOT EXISTS (SELECT 1 FROM ban_served_match b WHERE b.match_id = m.match_id)
+            OR NOT EXISTS (SELECT 1 FROM head_to_head_match x WHERE x.match_id = m.match_id)
+          )
+        ORDER BY m.start_time, m.match_id
+        LIMIT %s
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (limit,))
+            return [int(r["match_id"]) for r in cur.fetchall()]
+
+    def advance_status(self, from_status: str, to_status: str, started_before: datetime, limit: int) -> List[int]:
+        """
+        Transaction (one batch of the status engine):
+          1) Lock up to limit matches in from_status with start_time <= started_before
+             (range scan on idx_match_status_start, oldest first)
+          2) Move exactly those to to_status with one UPDATE ... IN
+
+        Returns the ids that changed; an empty list means nothing is due.
+        """
         with self.db.conn() as cnx:
             try:
                 cnx.start_transaction()
@@ -144,69 +339,340 @@ class MatchRepository:
                 with self.db.cursor(cnx) as cur:
                     cur.execute(
                         """
-                        INSERT INTO matches
-                        (tournament_id, home_team_id, away_team_id, start_time, status, is_overtime)
-                        VALUES (%s, %s, %s, %s, %s, %s)
+                        SELECT match_id FROM matches
+                        WHERE status=%s AND start_time <= %s
+                        ORDER BY start_time, match_id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
                         """,
-                        (
-                            m.tournament_id,
-                            m.home_team_id,
-                            m.away_team_id,
-                            m.start_time,
-                            m.status,
-                            int(m.is_overtime),
-                        ),
+                        (from_status, started_before, limit),
                     )
-                    match_id = int(cur.lastrowid)
+                    ids = [int(r["match_id"]) for r in cur.fetchall()]
+                    if ids:
+                        cur.execute(
+                            f"""
+                            UPDATE matches
+                            SET status=%s, version=version + 1
+                            WHERE status=%s AND match_id IN ({placeholders(len(ids))})
+                            """,
+                            (to_status, from_status, *ids),
+                        )
 
-                    cur.executemany(
-                        """
-                        INSERT INTO match_referee (match_id, referee_id)
-                        VALUES (%s, %s)
-                        """,
-                        [(match_id, rid) for rid in referee_ids],
-                    )
+                cnx.commit()
+                return ids
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to move matches from {from_status} to {to_status}: {e}") from e
+
+    def delete_many(self, match_ids: Iterable[int]) -> List[int]:
+        """
+        Transaction (per IN_CHUNK ids, see _delete_matches):
+          1) Lock the matches
+          2) Subtract their events from the statistics and discipline rollups
+          3) DELETE referee relations and events, then the matches
+        If any id does not exist, nothing is deleted.
+        Returns the ids of deleted matches that were finished (see delete()).
+        """
+        ids = sorted(set(match_ids))
+        rows: List[dict] = []
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for chunk in chunked(ids):
+                        rows += self._delete_matches(cur, chunk)
+
+                if len(rows) != len(ids):
+                    raise NotFoundError(f"{len(ids) - len(rows)} of {len(ids)} matches not found")
 
                 cnx.commit()
-                return match_id
+                return [int(r["match_id"]) for r in rows if r["status"] == "finished"]
 
             except Exception as e:
                 cnx.rollback()
                 if isinstance(e, (NotFoundError, ValidationError, DbError)):
                     raise
-                raise DbError(f"Failed to create match with referees: {e}") from e
+                raise DbError(f"Failed to delete matches: {e}") from e
+
+    def _delete_matches(self, cur, ids: List[int]) -> List[dict]:
+        """
+        Body of delete / delete_many (inside an open transaction). The rollups
+        lose the deleted events in the same transaction; rating history and
+        the head-to-head / served-suspensions markers go by cascade. Returns
+        the deleted rows (match_id, tournament_id, status).
+        """
+        marks = placeholders(len(ids))
+        cur.execute(f"SELECT match_id, tournament_id, status FROM matches WHERE match_id IN ({marks}) FOR UPDATE", ids)
+        rows = cur.fetchall()
+        if not rows:
+            return []
+
+        found = sorted(int(r["match_id"]) for r in rows)
+        tournament_ids = sorted({int(r["tournament_id"]) for r in rows})
+        self.stats.remove_matches(cur, tournament_ids, found)
+        self.discipline.remove_matches(cur, tournament_ids, found)
+
+        marks = placeholders(len(found))
+        cur.execute(f"DELETE FROM match_referee WHERE match_id IN ({marks})", found)
+        cur.execute(
+            f"DELETE FROM match_event WHERE tournament_id IN ({placeholders(len(tournament_ids))}) AND match_id IN ({marks})",
+            (*tournament_ids, *found),
+        )
+        cur.execute(f"DELETE FROM matches WHERE match_id IN ({marks})", found)
+        return rows
+
+    # -------------------------
+    # Results (score columns kept by MatchScoreRepository)
+    # -------------------------
+    def get_result(self, match_id: int) -> dict:
+        """
+        Returns one match with home_goals / away_goals (primary key read).
+        """
+        sql = _RESULT_SELECT + " WHERE m.match_id=%s"
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (match_id,))
+            row = cur.fetchone()
+            if not row:
+                raise NotFoundError(f"Match {match_id} not found")
+            return self._result_row(row)
+
+    def list_finished_results(
+        self,
+        tournament_id: Optional[int] = None,
+        replica: bool = False,
+        include_archived: bool = False,
+    ) -> list[dict]:
+        """
+        Returns finished matches with scores in chronological order
+        (all tournaments, or only one if tournament_id is given).
+        Goals come from the score columns, no aggregation over match_event.
+        replica=True allows the read replica (display only, not for rebuilds).
+        include_archived=True adds the matches of archived tournaments
+        (archive_matches, see ArchiveRepository); rows then carry "archived".
+        """
+        where = " WHERE m.status='finished' "
+        params: tuple = ()
+        if tournament_id is not None:
+            where += " AND m.tournament_id=%s "
+            params = (tournament_id,)
+
+        tables: Tuple[str, ...] = ("matches",)
+        sql = _RESULT_SELECT + where + " ORDER BY m.start_time, m.match_id"
+        if include_archived:
+            hot = _RESULT_SELECT.replace("FROM matches m", ", 0 AS archived FROM matches m")
+            archived = _RESULT_SELECT.replace("FROM matches m", ", 1 AS archived FROM archive_matches m")
+            sql = f"({hot}{where}) UNION ALL ({archived}{where}) ORDER BY start_time, match_id"
+            params = params * 2
+            tables += ("archive_matches",)
+
+        with self.db.read_conn(tables, replica) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, params)
+            return [self._result_row(r) for r in cur.fetchall()]
+
+    def team_ids_by_tournament(self, tournament_id: int, replica: bool = False) -> List[int]:
+        """
+        Teams that play at least one match of the tournament, in any status.
+        """
+        sql = """
+        SELECT home_team_id AS team_id FROM matches WHERE tournament_id=%s
+        UNION
+        SELECT away_team_id AS team_id FROM matches WHERE tournament_id=%s
+        """
+        with self.db.read_conn(("matches",), replica) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id, tournament_id))
+            return sorted(int(r["team_id"]) for r in cur.fetchall())
+
+    def finished_by_team(self, team_ids: List[int], replica: bool = False) -> Dict[int, Dict[int, int]]:
+        """
+        Finished matches of the given teams per tournament:
+        {team_id: {tournament_id: matches}} (one query, archived tournaments not included).
+        """
+        if not team_ids:
+            return {}
+        marks = placeholders(len(team_ids))
+        sql = f"""
+        SELECT team_id, tournament_id, COUNT(*) AS matches
+        FROM (
+            SELECT home_team_id AS team_id, tournament_id FROM matches
+            WHERE status='finished' AND home_team_id IN ({marks})
+            UNION ALL
+            SELECT away_team_id AS team_id, tournament_id FROM matches
+            WHERE status='finished' AND away_team_id IN ({marks})
+        ) t
+        GROUP BY team_id, tournament_id
+        """
+        with self.db.read_conn(("matches",), replica) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (*team_ids, *team_ids))
+            result: Dict[int, Dict[int, int]] = {}
+            for r in cur.fetchall():
+                result.setdefault(int(r["team_id"]), {})[int(r["tournament_id"])] = int(r["matches"])
+            return result
+
+    @staticmethod
+    def _result_row(row: dict) -> dict:
+        if "archived" in row:
+            row["archived"] = bool(row["archived"])
+        row["is_overtime"] = bool(row["is_overtime"])
+        row["home_goals"] = int(row["home_goals"])
+        row["away_goals"] = int(row["away_goals"])
+        return row
+
+    # -------------------------
+    # D1 requirement:
+    # One UI action -> multiple tables
+    # Transaction over matches + match_referee
+    # -------------------------
+    def create_match_with_referees(self, m: Match, referee_ids: List[int]) -> int:
+        """
+        Transaction (retried on deadlock / lock wait timeout):
+          1) Insert into matches
+          2) Insert into match_referee (M:N relation)
+        """
+        if not referee_ids:
+            raise ValidationError("At least one referee must be selected.")
+        if m.home_team_id == m.away_team_id:
+            raise ValidationError("Home and Away teams must be different.")
+
+        def work(cur) -> int:
+            cur.execute(
+                """
+                INSERT INTO matches
+                (tournament_id, home_team_id, away_team_id, start_time, status, is_overtime)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    m.tournament_id,
+                    m.home_team_id,
+                    m.away_team_id,
+                    m.start_time,
+                    m.status,
+                    int(m.is_overtime),
+                ),
+            )
+            match_id = int(cur.lastrowid)
+
+            cur.executemany(
+                """
+                INSERT INTO match_referee (match_id, referee_id)
+                VALUES (%s, %s)
+                """,
+                [(match_id, rid) for rid in referee_ids],
+            )
+            return match_id
+
+        return self.db.run_transaction(work, "create_match", "create match with referees")
 
     def set_referees(self, match_id: int, referee_ids: List[int]) -> None:
         """
-        Replaces all referees for a match using a transaction.
+        Sets the referees of a match using a transaction; only added and
+        removed referees are written. Retried on deadlock / lock wait timeout.
         """
         if not referee_ids:
             raise ValidationError("At least one referee must be selected.")
 
+        def work(cur) -> None:
+            # Ensure match exists
+            cur.execute("SELECT match_id FROM matches WHERE match_id=%s", (match_id,))
+            if not cur.fetchone():
+                raise NotFoundError(f"Match {match_id} not found")
+
+            # Write only the difference
+            reassign_referees(cur, match_id, referee_ids)
+
+        self.db.run_transaction(work, "set_referees", f"set referees for match {match_id}")
+
+    # -------------------------
+    # Bulk paths for imports
+    # -------------------------
+    def list_keys(self) -> Dict[MatchKey, Match]:
+        """
+        All matches keyed by their natural key (one query, used as an import lookup map).
+        """
+        sql = """
+        SELECT match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime, version
+        FROM matches
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql)
+            result: Dict[MatchKey, Match] = {}
+            for r in cur.fetchall():
+                r["is_overtime"] = bool(r["is_overtime"])
+                m = Match(**r)
+                result[match_key(m)] = m
+            return result
+
+    def insert_many_with_referees(self, items: Iterable[Tuple[Match, List[int]]]) -> int:
+        """
+        Transaction (items are consumed lazily, BATCH_SIZE at a time):
+          1) Batched INSERT into matches
+          2) Read the new ids back by natural key (one query per batch)
+          3) Batched INSERT into match_referee
+
+        Natural keys must be unique within items and not exist yet.
+        If the iterable raises (e.g. an import validation error), everything is rolled back.
+        """
+        count = 0
         with self.db.conn() as cnx:
             try:
                 cnx.start_transaction()
 
                 with self.db.cursor(cnx) as cur:
-                    # Ensure match exists
-                    cur.execute("SELECT match_id FROM matches WHERE match_id=%s", (match_id,))
-                    if not cur.fetchone():
-                        raise NotFoundError(f"Match {match_id} not found")
-
-                    # Replace relations
-                    cur.execute("DELETE FROM match_referee WHERE match_id=%s", (match_id,))
-                    cur.executemany(
-                        "INSERT INTO match_referee (match_id, referee_id) VALUES (%s, %s)",
-                        [(match_id, rid) for rid in referee_ids],
-                    )
+                    batch: List[Tuple[Match, List[int]]] = []
+                    for item in items:
+                        batch.append(item)
+                        if len(batch) >= BATCH_SIZE:
+                            count += self._insert_batch(cur, batch)
+                            batch = []
+                    if batch:
+                        count += self._insert_batch(cur, batch)
 
                 cnx.commit()
+                return count
 
             except Exception as e:
                 cnx.rollback()
                 if isinstance(e, (NotFoundError, ValidationError, DbError)):
                     raise
-                raise DbError(f"Failed to set referees for match {match_id}: {e}") from e
+                raise DbError(f"Failed to import matches: {e}") from e
+
+    @staticmethod
+    def _insert_batch(cur, batch: List[Tuple[Match, List[int]]]) -> int:
+        cur.executemany(
+            """
+            INSERT INTO matches
+            (tournament_id, home_team_id, away_team_id, start_time, status, is_overtime)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            [
+                (m.tournament_id, m.home_team_id, m.away_team_id, m.start_time, m.status, int(m.is_overtime))
+                for m, _refs in batch
+            ],
+        )
+
+        # Multi-row inserts do not report every generated id, so read them back
+        keys = [match_key(m) for m, _refs in batch]
+        key_rows = ", ".join(["(%s, %s, %s, %s)"] * len(keys))
+        cur.execute(
+            f"""
+            SELECT match_id, tournament_id, home_team_id, away_team_id, start_time
+            FROM matches
+            WHERE (tournament_id, home_team_id, away_team_id, start_time) IN ({key_rows})
+            """,
+            [v for key in keys for v in key],
+        )
+        ids = {
+            (r["tournament_id"], r["home_team_id"], r["away_team_id"], r["start_time"]): int(r["match_id"])
+            for r in cur.fetchall()
+        }
+
+        links = [(ids[match_key(m)], rid) for m, refs in batch for rid in refs]
+        if links:
+            cur.executemany("INSERT INTO match_referee (match_id, referee_id) VALUES (%s, %s)", links)
+        return len(batch)
 
     # -------------------------
     # Listing for GUI (with joined names)
@@ -224,7 +690,9 @@ class MatchRepository:
             at.name AS away_team_name,
             DATE_FORMAT(m.start_time, '%%Y-%%m-%%d %%H:%%i') AS start_time,
             m.status,
-            m.is_overtime
+            m.is_overtime,
+            m.home_goals,
+            m.away_goals
         FROM matches m
         LEFT JOIN tournament t ON t.tournament_id = m.tournament_id
         LEFT JOIN team ht ON ht.team_id = m.home_team_id
@@ -232,12 +700,10 @@ class MatchRepository:
         ORDER BY m.start_time DESC, m.match_id DESC
         LIMIT 200
         """
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql)
-            rows = list(cur.fetchall())
-            for r in rows:
-                r["is_overtime"] = bool(r["is_overtime"])
-            return rows
+        rows = self.db.query_cached(sql)
+        for r in rows:
+            r["is_overtime"] = bool(r["is_overtime"])
+        return rows
 
     def get_referee_ids(self, match_id: int) -> List[int]:
         """
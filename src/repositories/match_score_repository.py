@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, chunked, placeholders, raise_update_miss
+
+SCORE_COLUMNS = ("home_goals", "away_goals", "home_yellows", "away_yellows", "home_reds", "away_reds")
+
+# Same rules as v_match_score: own goals count for the opponent
+_SCORE_AGGREGATE = """
+SELECT
+    e.match_id,
+    SUM(CASE
+            WHEN e.event_type = 'goal' AND e.team_id = m.home_team_id THEN 1
+            WHEN e.event_type = 'own_goal' AND e.team_id = m.away_team_id THEN 1
+            ELSE 0
+        END) AS home_goals,
+    SUM(CASE
+            WHEN e.event_type = 'goal' AND e.team_id = m.away_team_id THEN 1
+            WHEN e.event_type = 'own_goal' AND e.team_id = m.home_team_id THEN 1
+            ELSE 0
+        END) AS away_goals,
+    SUM(e.event_type = 'yellow' AND e.team_id = m.home_team_id) AS home_yellows,
+    SUM(e.event_type = 'yellow' AND e.team_id = m.away_team_id) AS away_yellows,
+    SUM(e.event_type = 'red' AND e.team_id = m.home_team_id) AS home_reds,
+    SUM(e.event_type = 'red' AND e.team_id = m.away_team_id) AS away_reds
+FROM match_event e
+JOIN matches m ON m.match_id = e.match_id
+"""
+
+
+def score_column(match: dict, e: dict) -> Optional[str]:
+    """
+    Which score column of the match one event changes (None for an event of a
+    team that does not play the match).
+    """
+    is_home = e["team_id"] == match["home_team_id"]
+    is_away = e["team_id"] == match["away_team_id"]
+    if not (is_home or is_away):
+        return None
+
+    event_type = e["event_type"]
+    if event_type == "goal":
+        return "home_goals" if is_home else "away_goals"
+    if event_type == "own_goal":
+        return "away_goals" if is_home else "home_goals"
+    if event_type == "yellow":
+        return "home_yellows" if is_home else "away_yellows"
+    return "home_reds" if is_home else "away_reds"
+
+
+def recompute_scores(cur, tournament_ids: List[int], match_ids: List[int]) -> None:
+    """
+    Recomputes the counters of the given matches from match_event
+    (one UPDATE ... JOIN per IN_CHUNK matches, on the caller's cursor).
+    tournament_ids are the tournaments of those matches, so the event scan
+    stays in their partitions.
+    """
+    assign = ", ".join(f"m.{c}=COALESCE(a.{c}, 0)" for c in SCORE_COLUMNS)
+    t_marks = placeholders(len(tournament_ids))
+    for chunk in chunked(match_ids):
+        marks = placeholders(len(chunk))
+        cur.execute(
+            f"""
+            UPDATE matches m
+            LEFT JOIN (
+                {_SCORE_AGGREGATE}
+                WHERE e.tournament_id IN ({t_marks}) AND e.match_id IN ({marks})
+                GROUP BY e.match_id
+            ) a
+                ON a.match_id = m.match_id
+            SET {assign}
+            WHERE m.match_id IN ({marks})
+            """,
+            (*tournament_ids, *chunk, *chunk),
+        )
+
+
+class MatchScoreRepository:
+    """
+    Denormalized score and card counters on matches (home_goals, away_goals, ...).
+
+    The apply_* methods run on the cursor of the event write transaction, so
+    the event and the counters commit (or roll back) together. match must be
+    a row with match_id, home_team_id and away_team_id, read without a lock:
+    the counter UPDATE only applies while the teams are still the ones read
+    (they decide the column), otherwise ConflictError rolls the event back.
+    Other changes of the match (status, version) do not matter here, and
+    counter changes do not bump the version, so concurrent events of one
+    match never conflict with each other or with the status engine.
+    """
+
+    def __init__(self, db: Db):
+        self.db = db
+
+    # -------------------------
+    # Incremental maintenance (called inside event write transactions)
+    # -------------------------
+    def apply_insert(self, cur, match: dict, e: dict) -> None:
+        self._apply(cur, match, e, +1)
+
+    def apply_delete(self, cur, match: dict, e: dict) -> None:
+        self._apply(cur, match, e, -1)
+
+    @staticmethod
+    def _apply(cur, match: dict, e: dict, sign: int) -> None:
+        column = score_column(match, e)
+        if column is None:
+            return
+        cur.execute(
+            f"""
+            UPDATE matches
+            SET {column}={column} + %s
+            WHERE match_id=%s AND home_team_id=%s AND away_team_id=%s
+            """,
+            (sign, match["match_id"], match["home_team_id"], match["away_team_id"]),
+        )
+        if cur.rowcount == 0:
+            raise_update_miss(cur, "matches", "match_id", match["match_id"], f"Match {match['match_id']}")
+
+    # -------------------------
+    # Reconciliation against raw events
+    # -------------------------
+    def find_mismatches(self, tournament_id: Optional[int] = None) -> List[dict]:
+        """
+        Matches whose stored counters differ from match_event (one query).
+        Rows contain match_id, tournament_id plus stored_<column> and actual_<column>.
+        """
+        stored = ", ".join(f"m.{c} AS stored_{c}" for c in SCORE_COLUMNS)
+        actual = ", ".join(f"COALESCE(a.{c}, 0) AS actual_{c}" for c in SCORE_COLUMNS)
+        differs = " OR ".join(f"m.{c} <> COALESCE(a.{c}, 0)" for c in SCORE_COLUMNS)
+
+        inner_where, outer_where, params = "", "", ()
+        if tournament_id is not None:
+            inner_where = " WHERE e.tournament_id=%s"
+            outer_where = " AND m.tournament_id=%s"
+            params = (tournament_id, tournament_id)
+
+        sql = f"""
+        SELECT m.match_id, m.tournament_id, {stored}, {actual}
+        FROM matches m
+        LEFT JOIN ({_SCORE_AGGREGATE}{inner_where} GROUP BY e.match_id) a
+            ON a.match_id = m.match_id
+        WHERE ({differs}){outer_where}
+        ORDER BY m.match_id
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, params)
+            return list(cur.fetchall())
+
+    def reconcile(self, tournament_id: Optional[int] = None) -> int:
+        """
+        Transaction:
+          1) Find matches whose counters differ from match_event
+          2) Recompute exactly those (recompute_scores)
+
+        Returns the number of repaired matches.
+        """
+        rows = self.find_mismatches(tournament_id)
+        if not rows:
+            return 0
+        match_ids = [int(r["match_id"]) for r in rows]
+        tournament_ids = sorted({int(r["tournament_id"]) for r in rows})
+
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    recompute_scores(cur, tournament_ids, match_ids)
+
+                cnx.commit()
+                return len(match_ids)
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to reconcile match scores: {e}") from e
@@ -1,7 +1,9 @@
-from typing import List
-from src.db_mysql import Db, NotFoundError
+from typing import Iterable, List, Sequence
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, chunked, placeholders, raise_update_miss, versioned
 from src.models.player import Player
 
+BATCH_SIZE = 1000
+
 
 class PlayerRepository:
     def __init__(self, db: Db):
@@ -9,7 +11,7 @@ class PlayerRepository:
 
     def get_by_id(self, player_id: int) -> Player:
         sql = """
-        SELECT player_id, team_id, first_name, last_name, birth_date, position
+        SELECT player_id, team_id, first_name, last_name, birth_date, position, version
         FROM player
         WHERE player_id=%s
         """
@@ -25,7 +27,7 @@ class PlayerRepository:
         Returns all players (no team filter).
         """
         sql = """
-        SELECT player_id, team_id, first_name, last_name, birth_date, position
+        SELECT player_id, team_id, first_name, last_name, birth_date, position, version
         FROM player
         ORDER BY last_name, first_name
         """
@@ -35,7 +37,7 @@ class PlayerRepository:
 
     def list_by_team(self, team_id: int) -> List[Player]:
         sql = """
-        SELECT player_id, team_id, first_name, last_name, birth_date, position
+        SELECT player_id, team_id, first_name, last_name, birth_date, position, version
         FROM player
         WHERE team_id=%s
         ORDER BY last_name, first_name
@@ -55,24 +57,109 @@ class PlayerRepository:
             return int(cur.lastrowid)
 
     def update(self, p: Player) -> None:
+        """
+        Compare-and-swap on p.version (ConflictError if the row changed since
+        it was read); version None overwrites unconditionally.
+        """
         if p.player_id is None:
             raise ValueError("player_id is required")
 
         sql = """
         UPDATE player
-        SET team_id=%s, first_name=%s, last_name=%s, birth_date=%s, position=%s
+        SET team_id=%s, first_name=%s, last_name=%s, birth_date=%s, position=%s, version=version + 1
         WHERE player_id=%s
         """
+        sql, params = versioned(
+            sql, (p.team_id, p.first_name, p.last_name, p.birth_date, p.position, p.player_id), p.version
+        )
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (p.team_id, p.first_name, p.last_name, p.birth_date, p.position, p.player_id))
+            cur.execute(sql, params)
             if cur.rowcount == 0:
-                raise NotFoundError(f"Player {p.player_id} not found")
+                raise_update_miss(cur, "player", "player_id", p.player_id, f"Player {p.player_id}")
             cnx.commit()
 
     def delete(self, player_id: int) -> None:
+        """
+        Events of the player are kept without player_id (done here, a
+        partitioned match_event has no ON DELETE SET NULL).
+        """
         sql = "DELETE FROM player WHERE player_id=%s"
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute("UPDATE match_event SET player_id=NULL WHERE player_id=%s", (player_id,))
             cur.execute(sql, (player_id,))
             if cur.rowcount == 0:
                 raise NotFoundError(f"Player {player_id} not found")
             cnx.commit()
+
+    def delete_many(self, player_ids: Iterable[int]) -> int:
+        """
+        Transaction: one DELETE ... WHERE player_id IN (...) per IN_CHUNK ids
+        (their events are kept without player_id, as in delete()).
+        If any id does not exist, nothing is deleted.
+        """
+        ids = sorted(set(player_ids))
+        deleted = 0
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for chunk in chunked(ids):
+                        marks = placeholders(len(chunk))
+                        cur.execute(f"UPDATE match_event SET player_id=NULL WHERE player_id IN ({marks})", chunk)
+                        cur.execute(f"DELETE FROM player WHERE player_id IN ({marks})", chunk)
+                        deleted += cur.rowcount
+
+                if deleted != len(ids):
+                    raise NotFoundError(f"{len(ids) - deleted} of {len(ids)} players not found")
+
+                cnx.commit()
+                return deleted
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to delete players: {e}") from e
+
+    def save_many(self, to_insert: Sequence[Player], to_update: Sequence[Player]) -> None:
+        """
+        Bulk write used by imports: batched INSERTs and UPDATEs in one transaction.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for i in range(0, len(to_insert), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            INSERT INTO player (team_id, first_name, last_name, birth_date, position)
+                            VALUES (%s, %s, %s, %s, %s)
+                            """,
+                            [
+                                (p.team_id, p.first_name, p.last_name, p.birth_date, p.position)
+                                for p in to_insert[i:i + BATCH_SIZE]
+                            ],
+                        )
+                    for i in range(0, len(to_update), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            UPDATE player
+                            SET team_id=%s, first_name=%s, last_name=%s, birth_date=%s, position=%s,
+                                version=version + 1
+                            WHERE player_id=%s
+                            """,
+                            [
+                                (p.team_id, p.first_name, p.last_name, p.birth_date, p.position, p.player_id)
+                                for p in to_update[i:i + BATCH_SIZE]
+                            ],
+                        )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to save players: {e}") from e
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Sequence
 
-from src.db_mysql import Db, NotFoundError
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, raise_update_miss, versioned
 from src.models.referee import Referee
 
+BATCH_SIZE = 1000
+
 
 class RefereeRepository:
     def __init__(self, db: Db):
@@ -12,7 +14,7 @@ class RefereeRepository:
 
     def get_by_id(self, referee_id: int) -> Referee:
         sql = """
-        SELECT referee_id, full_name, email, level, active
+        SELECT referee_id, full_name, email, level, active, version
         FROM referee
         WHERE referee_id=%s
         """
@@ -25,35 +27,31 @@ class RefereeRepository:
             row["active"] = bool(row["active"])
             return Referee(**row)
 
-    def list(self, active_only: bool = False) -> List[Referee]:
+    def list(self, active_only: bool = False, replica: bool = True) -> List[Referee]:
         """
         Returns list of referees.
         If active_only=True, only active referees are returned.
+        replica=False reads the primary (lists that decide inserts vs updates).
         """
         if active_only:
             sql = """
-            SELECT referee_id, full_name, email, level, active
+            SELECT referee_id, full_name, email, level, active, version
             FROM referee
             WHERE active=1
             ORDER BY full_name
             """
-            params = ()
         else:
             sql = """
-            SELECT referee_id, full_name, email, level, active
+            SELECT referee_id, full_name, email, level, active, version
             FROM referee
             ORDER BY full_name
             """
-            params = ()
-
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
 
-            for r in rows:
-                r["active"] = bool(r["active"])
+        rows = self.db.query_cached(sql, replica=replica)
+        for r in rows:
+            r["active"] = bool(r["active"])
 
-            return [Referee(**r) for r in rows]
+        return [Referee(**r) for r in rows]
 
     def insert(self, r: Referee) -> int:
         sql = """
@@ -69,6 +67,10 @@ class RefereeRepository:
             return int(cur.lastrowid)
 
     def update(self, r: Referee) -> None:
+        """
+        Compare-and-swap on r.version (ConflictError if the row changed since
+        it was read); version None overwrites unconditionally.
+        """
         if r.referee_id is None:
             raise ValueError("referee_id is required")
 
@@ -77,16 +79,15 @@ class RefereeRepository:
         SET full_name=%s,
             email=%s,
             level=%s,
-            active=%s
+            active=%s,
+            version=version + 1
         WHERE referee_id=%s
         """
+        sql, params = versioned(sql, (r.full_name, r.email, r.level, int(r.active), r.referee_id), r.version)
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(
-                sql,
-                (r.full_name, r.email, r.level, int(r.active), r.referee_id),
-            )
+            cur.execute(sql, params)
             if cur.rowcount == 0:
-                raise NotFoundError(f"Referee {r.referee_id} not found")
+                raise_update_miss(cur, "referee", "referee_id", r.referee_id, f"Referee {r.referee_id}")
             cnx.commit()
 
     def delete(self, referee_id: int) -> None:
@@ -96,3 +97,41 @@ class RefereeRepository:
             if cur.rowcount == 0:
                 raise NotFoundError(f"Referee {referee_id} not found")
             cnx.commit()
+
+    def save_many(self, to_insert: Sequence[Referee], to_update: Sequence[Referee]) -> None:
+        """
+        Bulk write used by imports: batched INSERTs and UPDATEs in one transaction.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for i in range(0, len(to_insert), BATCH_SIZE):
+                        cur.executemany(
+                            "INSERT INTO referee (full_name, email, level, active) VALUES (%s, %s, %s, %s)",
+                            [
+                                (r.full_name, r.email, r.level, int(r.active))
+                                for r in to_insert[i:i + BATCH_SIZE]
+                            ],
+                        )
+                    for i in range(0, len(to_update), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            UPDATE referee
+                            SET full_name=%s, email=%s, level=%s, active=%s, version=version + 1
+                            WHERE referee_id=%s
+                            """,
+                            [
+                                (r.full_name, r.email, r.level, int(r.active), r.referee_id)
+                                for r in to_update[i:i + BATCH_SIZE]
+                            ],
+                        )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to save referees: {e}") from e
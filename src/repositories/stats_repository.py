@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, placeholders
+from src.models.player_stats import PlayerStats
+from src.models.team_stats import TeamStats
+
+MAX_LEADERBOARD = 100
+
+_COUNTER_COLUMNS = {
+    "goal": "goals",
+    "own_goal": "own_goals",
+    "yellow": "yellows",
+    "red": "reds",
+}
+
+_STATS_COLUMNS = "goals, own_goals, yellows, reds, xg_sum, matches_with_events"
+
+# match_event_presence.subject per event column
+_SUBJECTS = {"player_id": "player", "team_id": "team"}
+
+# Rollup columns of a group of match_event rows, in _STATS_COLUMNS order
+_AGGREGATES = """
+    SUM(e.event_type='goal'),
+    SUM(e.event_type='own_goal'),
+    SUM(e.event_type='yellow'),
+    SUM(e.event_type='red'),
+    COALESCE(SUM(e.xg), 0),
+    COUNT(DISTINCT e.match_id)
+"""
+
+_ADD_COUNTERS = ", ".join(f"{c}={c} + VALUES({c})" for c in _STATS_COLUMNS.split(", "))
+
+
+class StatsRepository:
+    """
+    Per-tournament rollups of match_event (player_tournament_stats, team_tournament_stats).
+
+    The apply_* methods work on a cursor of an already open transaction, so the
+    event write and the rollup update commit (or roll back) together.
+    matches_with_events follows match_event_presence (events per match and
+    player / team): its row is created by the first event and deleted with the
+    last one, and the affected-row count decides the delta. The row lock of
+    the upsert orders concurrent first events of one player / team, the match
+    row itself is not locked.
+    """
+
+    def __init__(self, db: Db):
+        self.db = db
+
+    # -------------------------
+    # Incremental maintenance (called inside event write transactions)
+    # -------------------------
+    def apply_insert(self, cur, tournament_id: int, e: dict) -> None:
+        """
+        Call after the event row was inserted.
+        """
+        self._apply(
+            cur, tournament_id, e, +1,
+            self._enter(cur, tournament_id, e, "player_id"),
+            self._enter(cur, tournament_id, e, "team_id"),
+        )
+
+    def apply_delete(self, cur, tournament_id: int, e: dict) -> None:
+        """
+        Call after the event row was deleted.
+        """
+        self._apply(
+            cur, tournament_id, e, -1,
+            -self._leave(cur, tournament_id, e, "player_id"),
+            -self._leave(cur, tournament_id, e, "team_id"),
+        )
+
+    def apply_update(self, cur, old_tournament_id: int, old: dict, new_tournament_id: int, new: dict) -> None:
+        """
+        Call after the event row was updated (old / new are the row values).
+        """
+        old_deltas = []
+        new_deltas = []
+        for key in ("player_id", "team_id"):
+            if old["match_id"] == new["match_id"] and old[key] == new[key]:
+                old_deltas.append(0)
+                new_deltas.append(0)
+            else:
+                old_deltas.append(-self._leave(cur, old_tournament_id, old, key))
+                new_deltas.append(self._enter(cur, new_tournament_id, new, key))
+
+        self._apply(cur, old_tournament_id, old, -1, *old_deltas)
+        self._apply(cur, new_tournament_id, new, +1, *new_deltas)
+
+    def remove_matches(self, cur, tournament_ids: List[int], match_ids: List[int]) -> None:
+        """
+        Call before the events of whole matches are deleted: subtracts them in
+        two UPDATE ... JOIN statements (matches_with_events drops by the number
+        of those matches a player / team had events in).
+        """
+        where = (
+            f"e.tournament_id IN ({placeholders(len(tournament_ids))})"
+            f" AND e.match_id IN ({placeholders(len(match_ids))})"
+        )
+        aggregates = """
+            SUM(e.event_type='goal') AS goals,
+            SUM(e.event_type='own_goal') AS own_goals,
+            SUM(e.event_type='yellow') AS yellows,
+            SUM(e.event_type='red') AS reds,
+            COALESCE(SUM(e.xg), 0) AS xg_sum,
+            COUNT(DISTINCT e.match_id) AS matches_with_events
+        """
+        subtract = ", ".join(f"s.{c}=s.{c} - d.{c}" for c in _STATS_COLUMNS.split(", "))
+        params = (*tournament_ids, *match_ids)
+
+        cur.execute(
+            f"""
+            UPDATE player_tournament_stats s
+            JOIN (
+                SELECT e.tournament_id, e.player_id, {aggregates}
+                FROM match_event e
+                WHERE {where} AND e.player_id IS NOT NULL
+                GROUP BY e.tournament_id, e.player_id
+            ) d ON d.tournament_id = s.tournament_id AND d.player_id = s.player_id
+            SET {subtract}
+            """,
+            params,
+        )
+        cur.execute(
+            f"""
+            UPDATE team_tournament_stats s
+            JOIN (
+                SELECT e.tournament_id, e.team_id, {aggregates}
+                FROM match_event e
+                WHERE {where}
+                GROUP BY e.tournament_id, e.team_id
+            ) d ON d.tournament_id = s.tournament_id AND d.team_id = s.team_id
+            SET {subtract}
+            """,
+            params,
+        )
+        cur.execute(
+            "DELETE FROM match_event_presence WHERE tournament_id IN "
+            f"({placeholders(len(tournament_ids))}) AND match_id IN ({placeholders(len(match_ids))})",
+            params,
+        )
+
+    def add_matches(self, cur, tournament_ids: List[int], match_ids: List[int]) -> None:
+        """
+        The reverse of remove_matches(): call after the events of whole matches
+        were moved in (e.g. the match changed tournament or teams); adds them
+        and their presence rows with INSERT ... SELECT ... ON DUPLICATE KEY UPDATE.
+        """
+        where = (
+            f"e.tournament_id IN ({placeholders(len(tournament_ids))})"
+            f" AND e.match_id IN ({placeholders(len(match_ids))})"
+        )
+        params = (*tournament_ids, *match_ids)
+
+        cur.execute(
+            f"""
+            INSERT INTO player_tournament_stats
+            (tournament_id, player_id, team_id, {_STATS_COLUMNS})
+            SELECT e.tournament_id, e.player_id, MAX(e.team_id), {_AGGREGATES}
+            FROM match_event e
+            WHERE {where} AND e.player_id IS NOT NULL
+            GROUP BY e.tournament_id, e.player_id
+            ON DUPLICATE KEY UPDATE team_id=VALUES(team_id), {_ADD_COUNTERS}
+            """,
+            params,
+        )
+        cur.execute(
+            f"""
+            INSERT INTO team_tournament_stats
+            (tournament_id, team_id, {_STATS_COLUMNS})
+            SELECT e.tournament_id, e.team_id, {_AGGREGATES}
+            FROM match_event e
+            WHERE {where}
+            GROUP BY e.tournament_id, e.team_id
+            ON DUPLICATE KEY UPDATE {_ADD_COUNTERS}
+            """,
+            params,
+        )
+        cur.execute(
+            f"""
+            INSERT INTO match_event_presence (tournament_id, match_id, subject, subject_id, events)
+            SELECT * FROM (
+                SELECT e.tournament_id, e.match_id, 'player' AS subject, e.player_id AS subject_id, COUNT(*) AS n
+                FROM match_event e
+                WHERE {where} AND e.player_id IS NOT NULL
+                GROUP BY e.tournament_id, e.match_id, e.player_id
+                UNION ALL
+                SELECT e.tournament_id, e.match_id, 'team', e.team_id, COUNT(*)
+                FROM match_event e
+                WHERE {where}
+                GROUP BY e.tournament_id, e.match_id, e.team_id
+            ) p
+            ON DUPLICATE KEY UPDATE events=events + VALUES(events)
+            """,
+            params + params,
+        )
+
+    @staticmethod
+    def _enter(cur, tournament_id: int, e: dict, key: str) -> int:
+        """
+        1 if e is the first event of its player / team in the match: the upsert
+        inserted the presence row (1 affected row) instead of updating it (2).
+        """
+        if e.get(key) is None:
+            return 0
+        cur.execute(
+            """
+            INSERT INTO match_event_presence (tournament_id, match_id, subject, subject_id, events)
+            VALUES (%s, %s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE events=events + 1
+            """,
+            (tournament_id, e["match_id"], _SUBJECTS[key], e[key]),
+        )
+        return 1 if cur.rowcount == 1 else 0
+
+    @staticmethod
+    def _leave(cur, tournament_id: int, e: dict, key: str) -> int:
+        """
+        1 if e was the last event of its player / team in the match (the
+        presence row dropped to 0 and was deleted).
+        """
+        if e.get(key) is None:
+            return 0
+        params = (tournament_id, e["match_id"], _SUBJECTS[key], e[key])
+        where = "WHERE tournament_id=%s AND match_id=%s AND subject=%s AND subject_id=%s"
+        cur.execute(f"UPDATE match_event_presence SET events=events - 1 {where}", params)
+        cur.execute(f"DELETE FROM match_event_presence {where} AND events <= 0", params)
+        return 1 if cur.rowcount == 1 else 0
+
+    def _apply(self, cur, tournament_id: int, e: dict, sign: int, player_matches: int, team_matches: int) -> None:
+        """
+        sign=+1 adds the event, sign=-1 removes it.
+        player_matches / team_matches are the signed changes of matches_with_events.
+        """
+        counters = {c: 0 for c in _COUNTER_COLUMNS.values()}
+        counters[_COUNTER_COLUMNS[e["event_type"]]] = sign
+        xg = sign * float(e.get("xg") or 0.0)
+        values = (
+            counters["goals"], counters["own_goals"], counters["yellows"], counters["reds"], xg,
+        )
+
+        if e.get("player_id") is not None:
+            cur.execute(
+                f"""
+                INSERT INTO player_tournament_stats
+                (tournament_id, player_id, team_id, {_STATS_COLUMNS})
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    team_id=VALUES(team_id),
+                    goals=goals + VALUES(goals),
+                    own_goals=own_goals + VALUES(own_goals),
+                    yellows=yellows + VALUES(yellows),
+                    reds=reds + VALUES(reds),
+                    xg_sum=xg_sum + VALUES(xg_sum),
+                    matches_with_events=matches_with_events + VALUES(matches_with_events)
+                """,
+                (tournament_id, e["player_id"], e["team_id"], *values, player_matches),
+            )
+
+        cur.execute(
+            f"""
+            INSERT INTO team_tournament_stats
+            (tournament_id, team_id, {_STATS_COLUMNS})
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                goals=goals + VALUES(goals),
+                own_goals=own_goals + VALUES(own_goals),
+                yellows=yellows + VALUES(yellows),
+                reds=reds + VALUES(reds),
+                xg_sum=xg_sum + VALUES(xg_sum),
+                matches_with_events=matches_with_events + VALUES(matches_with_events)
+            """,
+            (tournament_id, e["team_id"], *values, team_matches),
+        )
+
+    # -------------------------
+    # Reads (served from the summary tables only, replica-safe)
+    # -------------------------
+    def get_player_stats(self, tournament_id: int, player_id: int) -> PlayerStats:
+        sql = f"""
+        SELECT tournament_id, player_id, team_id, {_STATS_COLUMNS}
+        FROM player_tournament_stats
+        WHERE tournament_id=%s AND player_id=%s
+        """
+        with self.db.read_conn(("player_tournament_stats",)) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id, player_id))
+            row = cur.fetchone()
+            if not row:
+                raise NotFoundError(f"No stats for player {player_id} in tournament {tournament_id}")
+            return PlayerStats(**row)
+
+    def list_team_stats(self, tournament_id: int) -> List[TeamStats]:
+        sql = f"""
+        SELECT tournament_id, team_id, {_STATS_COLUMNS}
+        FROM team_tournament_stats
+        WHERE tournament_id=%s
+        ORDER BY goals DESC, xg_sum DESC
+        """
+        with self.db.read_conn(("team_tournament_stats",)) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id,))
+            return [TeamStats(**r) for r in cur.fetchall()]
+
+    def top_players(self, tournament_id: int, order_by: str, limit: int = 10) -> list[dict]:
+        """
+        Top-k players of a tournament with names for GUI tables.
+        order_by: 'goals' (scorers) or 'cards' (reds, then yellows).
+        """
+        order = {
+            "goals": "s.goals DESC, s.xg_sum DESC",
+            "cards": "s.reds DESC, s.yellows DESC",
+        }.get(order_by)
+        if order is None:
+            raise ValidationError(f"Unknown leaderboard: {order_by}")
+
+        limit = max(1, min(int(limit), MAX_LEADERBOARD))
+        sql = f"""
+        SELECT
+            s.player_id,
+            p.first_name,
+            p.last_name,
+            s.team_id,
+            t.name AS team_name,
+            s.{_STATS_COLUMNS.replace(", ", ", s.")}
+        FROM player_tournament_stats s
+        JOIN player p ON p.player_id = s.player_id
+        LEFT JOIN team t ON t.team_id = s.team_id
+        WHERE s.tournament_id=%s
+        ORDER BY {order}, s.player_id
+        LIMIT {limit}
+        """
+        with self.db.read_conn(("player_tournament_stats", "player", "team")) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (tournament_id,))
+            return list(cur.fetchall())
+
+    # -------------------------
+    # Full rebuild from raw events (after migrations or bulk imports)
+    # -------------------------
+    def rebuild(self, tournament_id: Optional[int] = None) -> None:
+        """
+        Transaction:
+          1) Delete rollup and presence rows (all or one tournament)
+          2) Re-aggregate them from match_event in INSERT ... SELECT statements
+        A full rebuild keeps the rollups of archived tournaments (their events
+        are no longer in match_event).
+        """
+        # Events carry the tournament (partition key): no join with matches
+        where = "" if tournament_id is None else " WHERE e.tournament_id=%s"
+        params = () if tournament_id is None else (tournament_id,)
+        delete_where = (
+            " WHERE tournament_id NOT IN (SELECT tournament_id FROM tournament WHERE archived_at IS NOT NULL)"
+            if tournament_id is None else " WHERE tournament_id=%s"
+        )
+
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute("DELETE FROM player_tournament_stats" + delete_where, params)
+                    cur.execute("DELETE FROM team_tournament_stats" + delete_where, params)
+                    cur.execute("DELETE FROM match_event_presence" + delete_where, params)
+
+                    # Players normally score for one team; MAX() just picks a deterministic one
+                    cur.execute(
+                        f"""
+                        INSERT INTO player_tournament_stats
+                        (tournament_id, player_id, team_id, {_STATS_COLUMNS})
+                        SELECT e.tournament_id, e.player_id, MAX(e.team_id), {_AGGREGATES}
+                        FROM match_event e
+                        {where}{" AND" if where else " WHERE"} e.player_id IS NOT NULL
+                        GROUP BY e.tournament_id, e.player_id
+                        """,
+                        params,
+                    )
+                    cur.execute(
+                        f"""
+                        INSERT INTO team_tournament_stats
+                        (tournament_id, team_id, {_STATS_COLUMNS})
+                        SELECT e.tournament_id, e.team_id, {_AGGREGATES}
+                        FROM match_event e
+                        {where}
+                        GROUP BY e.tournament_id, e.team_id
+                        """,
+                        params,
+                    )
+                    cur.execute(
+                        f"""
+                        INSERT INTO match_event_presence (tournament_id, match_id, subject, subject_id, events)
+                        SELECT e.tournament_id, e.match_id, 'player', e.player_id, COUNT(*)
+                        FROM match_event e
+                        {where}{" AND" if where else " WHERE"} e.player_id IS NOT NULL
+                        GROUP BY e.tournament_id, e.match_id, e.player_id
+                        UNION ALL
+                        SELECT e.tournament_id, e.match_id, 'team', e.team_id, COUNT(*)
+                        FROM match_event e
+                        {where}
+                        GROUP BY e.tournament_id, e.match_id, e.team_id
+                        """,
+                        params + params,
+                    )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to rebuild statistics: {e}") from e
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from src.db_mysql import Db
+from src.table_tracking import VERSION_TABLE
+
+
+class TableVersionRepository:
+    """
+    Per-table change counters (table_version), bumped by every committed write
+    made through Db (table_tracking.TrackingConnection).
+    """
+
+    def __init__(self, db: Db):
+        self.db = db
+
+    def get_all(self) -> Dict[str, int]:
+        """
+        One row per table, so the cost does not depend on the amount of data.
+        """
+        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(f"SELECT table_name, version FROM {VERSION_TABLE}")
+            return {r["table_name"]: int(r["version"]) for r in cur.fetchall()}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError
+from src.models.team_rating_history import TeamRatingHistory
+
+BATCH_SIZE = 1000
+
+
+class TeamRatingHistoryRepository:
+    def __init__(self, db: Db):
+        self.db = db
+
+    def list_by_team(self, team_id: int) -> List[TeamRatingHistory]:
+        """
+        Returns the rating timeline of a team (oldest first), ready for charting.
+        """
+        sql = """
+        SELECT history_id, team_id, match_id, match_time, rating_before, rating_after
+        FROM team_rating_history
+        WHERE team_id=%s
+        ORDER BY match_time, match_id
+        """
+        with self.db.read_conn(("team_rating_history",)) as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(sql, (team_id,))
+            return [TeamRatingHistory(**r) for r in cur.fetchall()]
+
+    def apply_match(
+        self,
+        result: dict,
+        delta_fn: Callable[[float, float], float],
+    ) -> Optional[float]:
+        """
+        Transaction:
+          1) Skip matches that already have rating history (idempotent)
+          2) Lock both team rows (FOR UPDATE) and read current ratings
+          3) Update ratings by delta_fn(home_rating, away_rating) and store history
+
+        Returns the home team delta, or None if the match was already rated.
+        """
+        match_id = result["match_id"]
+        home_id = result["home_team_id"]
+        away_id = result["away_team_id"]
+
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute(
+                        "SELECT 1 AS rated FROM team_rating_history WHERE match_id=%s LIMIT 1",
+                        (match_id,),
+                    )
+                    if cur.fetchone():
+                        cnx.rollback()
+                        return None
+
+                    cur.execute(
+                        "SELECT team_id, rating FROM team WHERE team_id IN (%s, %s) FOR UPDATE",
+                        (home_id, away_id),
+                    )
+                    ratings = {int(r["team_id"]): float(r["rating"]) for r in cur.fetchall()}
+                    if home_id not in ratings or away_id not in ratings:
+                        raise NotFoundError(f"Teams of match {match_id} not found")
+
+                    home_before = ratings[home_id]
+                    away_before = ratings[away_id]
+                    delta = delta_fn(home_before, away_before)
+
+                    cur.executemany(
+                        "UPDATE team SET rating=%s, version=version + 1 WHERE team_id=%s",
+                        [(home_before + delta, home_id), (away_before - delta, away_id)],
+                    )
+                    cur.executemany(
+                        """
+                        INSERT INTO team_rating_history
+                        (team_id, match_id, match_time, rating_before, rating_after)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (home_id, match_id, result["start_time"], home_before, home_before + delta),
+                            (away_id, match_id, result["start_time"], away_before, away_before - delta),
+                        ],
+                    )
+
+                cnx.commit()
+                return delta
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to apply rating for match {match_id}: {e}") from e
+
+    def replace_all(
+        self,
+        ratings: Dict[int, float],
+        history: Sequence[Tuple[int, int, object, float, float]],
+    ) -> None:
+        """
+        Replaces the whole rating history after a full replay.
+        history rows: (team_id, match_id, match_time, rating_before, rating_after)
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    cur.execute("DELETE FROM team_rating_history")
+
+                    cur.executemany(
+                        "UPDATE team SET rating=%s, version=version + 1 WHERE team_id=%s",
+                        [(rating, team_id) for team_id, rating in ratings.items()],
+                    )
+
+                    for i in range(0, len(history), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            INSERT INTO team_rating_history
+                            (team_id, match_id, match_time, rating_before, rating_after)
+                            VALUES (%s, %s, %s, %s, %s)
+                            """,
+                            list(history[i:i + BATCH_SIZE]),
+                        )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to replace rating history: {e}") from e
@@ -1,7 +1,9 @@
-from typing import List
-from src.db_mysql import Db, NotFoundError
+from typing import Iterable, List, Sequence, Set
+from src.db_mysql import Db, NotFoundError, ValidationError, DbError, chunked, placeholders, raise_update_miss, versioned
 from src.models.team import Team
 
+BATCH_SIZE = 1000
+
 
 class TeamRepository:
     def __init__(self, db: Db):
@@ -9,7 +11,7 @@ class TeamRepository:
 
     def get_by_id(self, team_id: int, include_deleted: bool = False) -> Team:
         sql = """
-        SELECT team_id, name, class_name, rating, is_deleted
+        SELECT team_id, name, class_name, rating, is_deleted, version
         FROM team
         WHERE team_id=%s
         """
@@ -23,18 +25,27 @@ class TeamRepository:
                 raise NotFoundError(f"Team {team_id} not found")
             return Team(**row)
 
-    def list(self, include_deleted: bool = False) -> List[Team]:
+    def list(self, include_deleted: bool = False, replica: bool = True) -> List[Team]:
+        """
+        replica=False reads the primary (lists that decide inserts vs updates).
+        """
         sql = """
-        SELECT team_id, name, class_name, rating, is_deleted
+        SELECT team_id, name, class_name, rating, is_deleted, version
         FROM team
         """
         if not include_deleted:
             sql += " WHERE is_deleted=0"
         sql += " ORDER BY class_name, name"
 
+        return [Team(**r) for r in self.db.query_cached(sql, replica=replica)]
+
+    def list_ids(self) -> Set[int]:
+        """
+        All team ids (including soft-deleted), e.g. for import foreign key checks.
+        """
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql)
-            return [Team(**r) for r in cur.fetchall()]
+            cur.execute("SELECT team_id FROM team")
+            return {int(r["team_id"]) for r in cur.fetchall()}
 
     def insert(self, team: Team) -> int:
         sql = """
@@ -47,22 +58,29 @@ class TeamRepository:
             return int(cur.lastrowid)
 
     def update(self, team: Team) -> None:
+        """
+        Compare-and-swap on team.version (ConflictError if the row changed since
+        it was read); version None overwrites unconditionally.
+        """
         if team.team_id is None:
             raise ValueError("team_id is required")
 
         sql = """
         UPDATE team
-        SET name=%s, class_name=%s, rating=%s, is_deleted=%s
+        SET name=%s, class_name=%s, rating=%s, is_deleted=%s, version=version + 1
         WHERE team_id=%s
         """
+        sql, params = versioned(
+            sql, (team.name, team.class_name, team.rating, int(team.is_deleted), team.team_id), team.version
+        )
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (team.name, team.class_name, team.rating, int(team.is_deleted), team.team_id))
+            cur.execute(sql, params)
             if cur.rowcount == 0:
-                raise NotFoundError(f"Team {team.team_id} not found")
+                raise_update_miss(cur, "team", "team_id", team.team_id, f"Team {team.team_id}")
             cnx.commit()
 
     def soft_delete(self, team_id: int) -> None:
-        sql = "UPDATE team SET is_deleted=1 WHERE team_id=%s"
+        sql = "UPDATE team SET is_deleted=1, version=version + 1 WHERE team_id=%s"
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
             cur.execute(sql, (team_id,))
             if cur.rowcount == 0:
@@ -70,9 +88,89 @@ class TeamRepository:
             cnx.commit()
 
     def restore(self, team_id: int) -> None:
-        sql = "UPDATE team SET is_deleted=0 WHERE team_id=%s"
+        sql = "UPDATE team SET is_deleted=0, version=version + 1 WHERE team_id=%s"
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
             cur.execute(sql, (team_id,))
             if cur.rowcount == 0:
                 raise NotFoundError(f"Team {team_id} not found")
             cnx.commit()
+
+    def soft_delete_many(self, team_ids: Iterable[int]) -> int:
+        return self._set_deleted_many(team_ids, True)
+
+    def restore_many(self, team_ids: Iterable[int]) -> int:
+        return self._set_deleted_many(team_ids, False)
+
+    def _set_deleted_many(self, team_ids: Iterable[int], deleted: bool) -> int:
+        """
+        Transaction: one UPDATE ... WHERE team_id IN (...) per IN_CHUNK ids.
+        All ids must exist (nothing is changed otherwise). Returns the number of changed rows.
+        """
+        ids = sorted(set(team_ids))
+        changed = 0
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for chunk in chunked(ids):
+                        marks = placeholders(len(chunk))
+                        cur.execute(f"SELECT team_id FROM team WHERE team_id IN ({marks}) FOR UPDATE", chunk)
+                        missing = set(chunk) - {int(r["team_id"]) for r in cur.fetchall()}
+                        if missing:
+                            raise NotFoundError(f"Teams not found: {sorted(missing)}")
+
+                        cur.execute(
+                            f"UPDATE team SET is_deleted=%s, version=version + 1 WHERE team_id IN ({marks})",
+                            (int(deleted), *chunk),
+                        )
+                        changed += cur.rowcount
+
+                cnx.commit()
+                return changed
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to update teams: {e}") from e
+
+    def save_many(self, to_insert: Sequence[Team], to_update: Sequence[Team]) -> None:
+        """
+        Bulk write used by imports: batched INSERTs and UPDATEs in one transaction.
+        Updates change name and class_name only; rating (kept by the rating
+        service) and is_deleted are set on insert and never overwritten here.
+        """
+        with self.db.conn() as cnx:
+            try:
+                cnx.start_transaction()
+
+                with self.db.cursor(cnx) as cur:
+                    for i in range(0, len(to_insert), BATCH_SIZE):
+                        cur.executemany(
+                            "INSERT INTO team (name, class_name, rating, is_deleted) VALUES (%s, %s, %s, %s)",
+                            [
+                                (t.name, t.class_name, t.rating, int(t.is_deleted))
+                                for t in to_insert[i:i + BATCH_SIZE]
+                            ],
+                        )
+                    for i in range(0, len(to_update), BATCH_SIZE):
+                        cur.executemany(
+                            """
+                            UPDATE team
+                            SET name=%s, class_name=%s, version=version + 1
+                            WHERE team_id=%s
+                            """,
+                            [
+                                (t.name, t.class_name, t.team_id)
+                                for t in to_update[i:i + BATCH_SIZE]
+                            ],
+                        )
+
+                cnx.commit()
+
+            except Exception as e:
+                cnx.rollback()
+                if isinstance(e, (NotFoundError, ValidationError, DbError)):
+                    raise
+                raise DbError(f"Failed to save teams: {e}") from e
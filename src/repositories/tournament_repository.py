@@ -1,5 +1,5 @@
 from typing import List
-from src.db_mysql import Db, NotFoundError
+from src.db_mysql import Db, NotFoundError, ValidationError, raise_update_miss, versioned
 from src.models.tournament import Tournament
 
 
@@ -9,7 +9,7 @@ class TournamentRepository:
 
     def get_by_id(self, tournament_id: int) -> Tournament:
         sql = """
-        SELECT tournament_id, name, start_date, end_date, is_active
+        SELECT tournament_id, name, start_date, end_date, is_active, version, archived_at
         FROM tournament
         WHERE tournament_id=%s
         """
@@ -20,15 +20,16 @@ class TournamentRepository:
                 raise NotFoundError(f"Tournament {tournament_id} not found")
             return Tournament(**row)
 
-    def list(self) -> List[Tournament]:
+    def list(self, replica: bool = True) -> List[Tournament]:
+        """
+        replica=False reads the primary (lists that decide inserts vs updates).
+        """
         sql = """
-        SELECT tournament_id, name, start_date, end_date, is_active
+        SELECT tournament_id, name, start_date, end_date, is_active, version, archived_at
         FROM tournament
         ORDER BY start_date DESC
         """
-        with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql)
-            return [Tournament(**r) for r in cur.fetchall()]
+        return [Tournament(**r) for r in self.db.query_cached(sql, replica=replica)]
 
     def insert(self, t: Tournament) -> int:
         sql = """
@@ -41,23 +42,46 @@ class TournamentRepository:
             return int(cur.lastrowid)
 
     def update(self, t: Tournament) -> None:
+        """
+        Compare-and-swap on t.version (ConflictError if the row changed since
+        it was read); version None overwrites unconditionally.
+        """
         if t.tournament_id is None:
             raise ValueError("tournament_id is required")
 
         sql = """
         UPDATE tournament
-        SET name=%s, start_date=%s, end_date=%s, is_active=%s
+        SET name=%s, start_date=%s, end_date=%s, is_active=%s, version=version + 1
         WHERE tournament_id=%s
         """
+        sql, params = versioned(sql, (t.name, t.start_date, t.end_date, int(t.is_active), t.tournament_id), t.version)
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
-            cur.execute(sql, (t.name, t.start_date, t.end_date, int(t.is_active), t.tournament_id))
+            cur.execute(sql, params)
             if cur.rowcount == 0:
-                raise NotFoundError(f"Tournament {t.tournament_id} not found")
+                raise_update_miss(
+                    cur, "tournament", "tournament_id", t.tournament_id, f"Tournament {t.tournament_id}"
+                )
             cnx.commit()
 
     def delete(self, tournament_id: int) -> None:
+        """
+        Only a tournament without matches (hot or archived) can be deleted,
+        instead of failing on the foreign keys in the middle of the delete.
+        """
         sql = "DELETE FROM tournament WHERE tournament_id=%s"
         with self.db.conn() as cnx, self.db.cursor(cnx) as cur:
+            cur.execute(
+                """
+                SELECT
+                    EXISTS(SELECT 1 FROM matches WHERE tournament_id=%s) AS has_matches,
+                    EXISTS(SELECT 1 FROM archive_matches WHERE tournament_id=%s) AS has_archived
+                """,
+                (tournament_id, tournament_id),
+            )
+            row = cur.fetchone()
+            if row["has_matches"] or row["has_archived"]:
+                raise ValidationError(f"Tournament {tournament_id} still has matches (hot or archived)")
+
             cur.execute(sql, (tournament_id,))
             if cur.rowcount == 0:
                 raise NotFoundError(f"Tournament {tournament_id} not found")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.repositories.archive_repository import ARCHIVE_CHUNK, ArchiveRepository
+
+# Pause between chunks, so other transactions get the locks in between
+CHUNK_PAUSE_SECONDS = 0.05
+
+
+@dataclass
+class ArchiveResult:
+    tournament_id: int
+    matches: int
+    chunks: int
+    seconds: float
+
+
+class ArchiveService:
+    """
+    Archive job for finished tournaments: moves all matches (with events,
+    referee links, rating history and head-to-head markers) to the archive
+    tables in small transactions, then marks the tournament archived_at.
+    restore() moves everything back.
+
+    Standings, statistics screens and simulations only see hot matches; the
+    tournament rollups (player/team stats, discipline) are kept. A full
+    rating replay (RatingService) only replays hot matches, so restore the
+    archive first if ratings must include old tournaments.
+    """
+
+    def __init__(
+        self,
+        repo: ArchiveRepository,
+        chunk: int = ARCHIVE_CHUNK,
+        pause_seconds: float = CHUNK_PAUSE_SECONDS,
+    ):
+        self.repo = repo
+        self.chunk = chunk
+        self.pause_seconds = pause_seconds
+
+    def archive(self, tournament_id: int, progress: Optional[Callable[[int], None]] = None) -> ArchiveResult:
+        self.repo.check_archivable(tournament_id)
+        result = self._run(tournament_id, self.repo.archive_chunk, progress)
+        self.repo.set_archived(tournament_id, True)
+        return result
+
+    def restore(self, tournament_id: int, progress: Optional[Callable[[int], None]] = None) -> ArchiveResult:
+        # Not archived any more as soon as the first match is back
+        self.repo.set_archived(tournament_id, False)
+        return self._run(tournament_id, self.repo.restore_chunk, progress)
+
+    def _run(self, tournament_id: int, move_chunk, progress) -> ArchiveResult:
+        started = time.perf_counter()
+        moved = 0
+        chunks = 0
+        while True:
+            n = move_chunk(tournament_id, self.chunk)
+            if n == 0:
+                break
+            moved += n
+            chunks += 1
+            if progress is not None:
+                progress(moved)
+            time.sleep(self.pause_seconds)
+
+        return ArchiveResult(tournament_id, moved, chunks, time.perf_counter() - started)
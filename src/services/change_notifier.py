@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.db_mysql import Db, DbError
+from src.repositories.table_version_repository import TableVersionRepository
+
+DEFAULT_POLL_SECONDS = 3.0
+
+
+class ChangeNotifier:
+    """
+    Notices writes of other clients (other laptops on the same database).
+
+    A daemon thread reads the table_version counters every interval (one tiny
+    query) and compares them with the previous poll. Changed tables are dropped
+    from the local query cache right away, read from the primary until the
+    replica caught up (Db.note_writes) and queued for the UI; dispatch()
+    runs on the Tk thread and calls the screens subscribed to those tables.
+    Own writes bump the counters too, so they are reported like any other.
+    """
+
+    def __init__(self, db: Db, interval_seconds: float = DEFAULT_POLL_SECONDS):
+        self.db = db
+        self.repo = TableVersionRepository(db)
+        self.interval_seconds = interval_seconds
+        self.last_error: Optional[Exception] = None
+
+        self._versions: Optional[Dict[str, int]] = None
+        self._changes: "queue.Queue[Set[str]]" = queue.Queue()
+        # (widget, tables, callback); only touched from the Tk thread
+        self._subscribers: List[Tuple[object, FrozenSet[str], Callable[[], None]]] = []
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Polling (worker thread)
+    # -------------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def poll_once(self) -> Set[str]:
+        """
+        Returns the tables whose counter changed since the previous poll
+        (nothing on the first poll, which only records the baseline).
+        """
+        current = self.repo.get_all()
+        previous, self._versions = self._versions, current
+        if previous is None:
+            return set()
+
+        changed = {t for t, v in current.items() if previous.get(t) != v}
+        if changed:
+            self.db.note_writes(changed)
+            if self.db.cache is not None:
+                self.db.cache.invalidate(changed)
+            self._changes.put(changed)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+                self.last_error = None
+            except DbError as e:
+                self.last_error = e
+            self._stop.wait(self.interval_seconds)
+
+    # -------------------------
+    # Subscribers (Tk thread)
+    # -------------------------
+    def subscribe(self, widget, tables: Iterable[str], callback: Callable[[], None]) -> None:
+        """
+        callback runs when one of tables changed, as long as widget exists
+        (screens are destroyed on navigation and drop out automatically).
+        """
+        self._subscribers.append((widget, frozenset(tables), callback))
+
+    def dispatch(self) -> None:
+        changed: Set[str] = set()
+        while True:
+            try:
+                changed |= self._changes.get_nowait()
+            except queue.Empty:
+                break
+        if not changed:
+            return
+
+        alive = []
+        for widget, tables, callback in self._subscribers:
+            if not widget.winfo_exists():
+                continue
+            alive.append((widget, tables, callback))
+            if tables & changed:
+                callback()
+        self._subscribers = alive
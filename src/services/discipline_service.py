@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from src.models.player_discipline import PlayerDiscipline
+from src.repositories.discipline_repository import DisciplineRepository
+
+
+@dataclass
+class Eligibility:
+    """
+    Snapshot of active suspensions of one tournament; lookups are O(1).
+    """
+    tournament_id: int
+    suspended: Dict[int, int] = field(default_factory=dict)  # player_id -> matches remaining
+
+    def is_eligible(self, player_id: int) -> bool:
+        return player_id not in self.suspended
+
+    def remaining(self, player_id: int) -> int:
+        return self.suspended.get(player_id, 0)
+
+
+class DisciplineService:
+    def __init__(self, repo: DisciplineRepository):
+        self.repo = repo
+
+    def eligibility(self, tournament_id: int, team_ids: Optional[Iterable[int]] = None) -> Eligibility:
+        """
+        Loads suspended players once (one indexed query), e.g. for a match lineup.
+        """
+        return Eligibility(tournament_id, self.repo.suspended_by_player(tournament_id, team_ids))
+
+    def is_eligible(self, tournament_id: int, player_id: int) -> bool:
+        row = self.repo.get(tournament_id, player_id)
+        return row is None or row.ban_remaining == 0
+
+    def on_match_finished(self, match_id: int) -> int:
+        return self.repo.serve_bans(match_id)
+
+    def overview(self, tournament_id: int) -> List[PlayerDiscipline]:
+        return self.repo.list_by_tournament(tournament_id)
+
+    def rebuild(self, tournament_id: int) -> None:
+        self.repo.rebuild(tournament_id)
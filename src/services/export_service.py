@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.db_mysql import Db, ValidationError
+
+FORMATS = ("csv", "jsonl")
+
+# table -> (columns, FROM/WHERE template, tournament filter or None)
+# Teams, players and referees are shared between tournaments and always exported whole.
+_EXPORTS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "tournaments": (
+        "tournament_id, name, start_date, end_date, is_active",
+        "FROM tournament",
+        "tournament_id=%s",
+    ),
+    "teams": (
+        "team_id, name, class_name, rating, is_deleted",
+        "FROM team",
+        None,
+    ),
+    "players": (
+        "player_id, team_id, first_name, last_name, birth_date, position",
+        "FROM player",
+        None,
+    ),
+    "referees": (
+        "referee_id, full_name, email, level, active",
+        "FROM referee",
+        None,
+    ),
+    "matches": (
+        "match_id, tournament_id, home_team_id, away_team_id, start_time, status, is_overtime",
+        "FROM matches",
+        "tournament_id=%s",
+    ),
+    "match_referees": (
+        "mr.match_id, mr.referee_id",
+        "FROM match_referee mr JOIN matches m ON m.match_id = mr.match_id",
+        "m.tournament_id=%s",
+    ),
+    "match_events": (
+        "e.event_id, e.match_id, e.player_id, e.team_id, e.minute, e.event_type, e.xg, e.created_at",
+        "FROM match_event e",
+        "e.tournament_id=%s",
+    ),
+}
+
+_ORDER_BY = {
+    "tournaments": "tournament_id",
+    "teams": "team_id",
+    "players": "player_id",
+    "referees": "referee_id",
+    "matches": "match_id",
+    "match_referees": "mr.match_id, mr.referee_id",
+    "match_events": "e.event_id",
+}
+
+TABLES = tuple(_EXPORTS)
+
+
+@dataclass
+class ExportResult:
+    table: str
+    path: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _write_csv(f, rows: Iterator[dict], columns: List[str]) -> int:
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([_plain(row[c]) for c in columns])
+        count += 1
+    return count
+
+
+def _write_jsonl(f, rows: Iterator[dict], columns: List[str]) -> int:
+    count = 0
+    for row in rows:
+        f.write(json.dumps({c: _plain(row[c]) for c in columns}, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+class ExportService:
+    """
+    Streams tables to CSV or JSON Lines (optionally gzip-compressed).
+    Rows flow from an unbuffered cursor through generators straight into the
+    file, so memory stays constant regardless of table size.
+    """
+
+    def __init__(self, db: Db, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+
+    def export_table(
+        self,
+        table: str,
+        path: str,
+        fmt: str = "csv",
+        compress: bool = False,
+        tournament_id: Optional[int] = None,
+    ) -> ExportResult:
+        if table not in _EXPORTS:
+            raise ValidationError(f"Unknown export table: {table}")
+        if fmt not in FORMATS:
+            raise ValidationError(f"Unknown export format: {fmt}")
+
+        select, source, tournament_filter = _EXPORTS[table]
+        sql = f"SELECT {select} {source}"
+        params: tuple = ()
+        if tournament_id is not None and tournament_filter is not None:
+            sql += f" WHERE {tournament_filter}"
+            params = (tournament_id,)
+        sql += f" ORDER BY {_ORDER_BY[table]}"
+
+        # "e.event_id" -> "event_id" (dictionary cursor keys)
+        columns = [c.strip().split(".")[-1] for c in select.split(",")]
+        write: Callable = _write_csv if fmt == "csv" else _write_jsonl
+
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+
+        started = time.perf_counter()
+        rows = self.db.iter_rows(sql, params, self.batch_size)
+        try:
+            if compress:
+                with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+                    count = write(f, rows, columns)
+            else:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    count = write(f, rows, columns)
+        finally:
+            rows.close()
+
+        return ExportResult(table=table, path=path, rows=count, seconds=time.perf_counter() - started)
+
+    def export_all(
+        self,
+        directory: str,
+        fmt: str = "csv",
+        compress: bool = False,
+        tournament_id: Optional[int] = None,
+        tables: Iterable[str] = TABLES,
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
+    ) -> List[ExportResult]:
+        """
+        Exports every table into directory/<table>.<fmt>[.gz].
+        on_progress(tables_done, tables_total, table) is called after each table.
+        """
+        os.makedirs(directory, exist_ok=True)
+        tables = list(tables)
+        results = []
+        for table in tables:
+            results.append(
+                self.export_table(
+                    table,
+                    os.path.join(directory, f"{table}.{fmt}"),
+                    fmt=fmt,
+                    compress=compress,
+                    tournament_id=tournament_id,
+                )
+            )
+            if on_progress:
+                on_progress(len(results), len(tables), table)
+        return results
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from src.repositories.head_to_head_repository import (
+    HeadToHeadRepository,
+    LAST_RESULTS,
+    pair_key,
+    result_entry,
+)
+from src.repositories.match_repository import MatchRepository
+
+
+@dataclass
+class HeadToHeadRecord:
+    """
+    Head-to-head from team_id's point of view.
+    """
+    team_id: int
+    opponent_id: int
+    matches: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    # newest first: {match_id, start_time, goals_for, goals_against, is_overtime}
+    last_results: List[dict] = field(default_factory=list)
+
+
+class HeadToHeadService:
+    def __init__(self, repo: HeadToHeadRepository, match_repo: MatchRepository):
+        self.repo = repo
+        self.match_repo = match_repo
+
+    def between(self, team_id: int, opponent_id: int) -> HeadToHeadRecord:
+        """
+        One primary key read, oriented to team_id.
+        """
+        h2h = self.repo.get(team_id, opponent_id)
+        record = HeadToHeadRecord(team_id=team_id, opponent_id=opponent_id)
+        if h2h is None:
+            return record
+
+        is_low = team_id == h2h.team_low_id
+        record.matches = h2h.matches
+        record.draws = h2h.draws
+        record.wins = h2h.low_wins if is_low else h2h.high_wins
+        record.losses = h2h.high_wins if is_low else h2h.low_wins
+        record.goals_for = h2h.low_goals if is_low else h2h.high_goals
+        record.goals_against = h2h.high_goals if is_low else h2h.low_goals
+        record.last_results = [
+            {
+                "match_id": r["match_id"],
+                "start_time": r["start_time"],
+                "goals_for": r["low_goals"] if is_low else r["high_goals"],
+                "goals_against": r["high_goals"] if is_low else r["low_goals"],
+                "is_overtime": r["is_overtime"],
+            }
+            for r in h2h.last_results
+        ]
+        return record
+
+    def on_match_finished(self, match_id: int) -> bool:
+        result = self.match_repo.get_result(match_id)
+        if result["status"] != "finished":
+            return False
+        return self.repo.apply_match(result)
+
+    def rebuild(self) -> int:
+        """
+        Recomputes every pair from all finished matches (one query), including
+        the archived ones, so pairs keep the history of archived tournaments.
+        Returns number of pairs.
+        """
+        results = self.match_repo.list_finished_results(include_archived=True)
+        records: Dict[Tuple[int, int], dict] = {}
+
+        for r in results:
+            key = pair_key(r["home_team_id"], r["away_team_id"])
+            rec = records.get(key)
+            if rec is None:
+                rec = records[key] = {
+                    "matches": 0, "low_wins": 0, "high_wins": 0, "draws": 0,
+                    "low_goals": 0, "high_goals": 0, "last_results": [],
+                }
+
+            entry = result_entry(r)
+            lg, hg = entry["low_goals"], entry["high_goals"]
+            rec["matches"] += 1
+            rec["low_wins"] += int(lg > hg)
+            rec["high_wins"] += int(hg > lg)
+            rec["draws"] += int(lg == hg)
+            rec["low_goals"] += lg
+            rec["high_goals"] += hg
+
+            # results are chronological, keep the newest LAST_RESULTS at the front
+            rec["last_results"].insert(0, entry)
+            del rec["last_results"][LAST_RESULTS:]
+
+        # Markers only for hot matches; archived ones keep theirs in the archive
+        self.repo.replace_all(records, [r["match_id"] for r in results if not r["archived"]])
+        return len(records)
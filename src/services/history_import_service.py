@@ -0,0 +1,474 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, get_args
+
+from src.models.match import Match, MatchStatus
+from src.models.match_event import MatchEvent, MatchEventType
+from src.models.referee import Referee, RefereeLevel
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.match_repository import MatchKey, MatchRepository, match_key
+from src.repositories.player_repository import PlayerRepository
+from src.repositories.referee_repository import RefereeRepository
+from src.repositories.team_repository import TeamRepository
+from src.repositories.tournament_repository import TournamentRepository
+from src.services.head_to_head_service import HeadToHeadService
+from src.services.import_service import UpsertResult
+from src.services.import_validation import ImportValidationError, RowError, ValidationReport, RowChecker
+from src.services.rating_service import RatingService
+
+LEVELS = frozenset(get_args(RefereeLevel))
+STATUSES = frozenset(get_args(MatchStatus))
+EVENT_TYPES = frozenset(get_args(MatchEventType))
+
+MAX_MINUTE = 200
+
+# Separator of list values (referees) in CSV cells
+LIST_SEPARATOR = ";"
+
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+
+# -------------------------
+# Streaming readers (CSV / JSON Lines)
+# -------------------------
+def _cell(value) -> str:
+    """
+    JSON values normalized to the same text form as CSV cells.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(_cell(v) for v in value)
+    return str(value)
+
+
+def record_format(path: str) -> str:
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def iter_records(path: str, errors: List[RowError]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yields (line, record) one at a time; the file is never loaded whole.
+    Lines that are not a JSON object are reported into errors and skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if record_format(path) == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                obj = json.loads(text)
+            except ValueError as e:
+                errors.append(RowError(line, "-", f"invalid JSON: {e}"))
+                continue
+            if not isinstance(obj, dict):
+                errors.append(RowError(line, "-", "expected a JSON object"))
+                continue
+            yield line, {k: _cell(v) for k, v in obj.items()}
+
+
+def _names(values: Iterable[Tuple[str, int]]) -> Dict[str, Optional[int]]:
+    """
+    casefolded name -> id; None marks a name shared by several rows (ambiguous).
+    """
+    result: Dict[str, Optional[int]] = {}
+    for name, id_ in values:
+        key = name.strip().casefold()
+        result[key] = None if key in result and result[key] != id_ else id_
+    return result
+
+
+class _Checker(RowChecker):
+    """
+    Row checker with reference resolution through prefetched lookup maps.
+    """
+
+    def ref(
+        self,
+        id_field: str,
+        name_field: str,
+        ids: Set[int] | Dict[int, object],
+        names: Dict[str, Optional[int]],
+        what: str,
+    ) -> Optional[int]:
+        raw_id = (self.row.get(id_field) or "").strip()
+        if raw_id:
+            try:
+                value = int(raw_id)
+            except ValueError:
+                self.error(id_field, f"'{raw_id}' is not an integer")
+                return None
+            if value not in ids:
+                self.error(id_field, f"{what} {value} does not exist")
+                return None
+            return value
+
+        name = (self.row.get(name_field) or "").strip()
+        if not name:
+            self.error(name_field, f"{id_field} or {name_field} is required")
+            return None
+        key = name.casefold()
+        if key not in names:
+            self.error(name_field, f"{what} '{name}' does not exist")
+            return None
+        if names[key] is None:
+            self.error(name_field, f"{what} '{name}' is ambiguous, use {id_field}")
+            return None
+        return names[key]
+
+    def flag(self, name: str, default: bool) -> bool:
+        raw = (self.row.get(name) or "").strip().lower()
+        if not raw:
+            return default
+        if raw in _TRUE:
+            return True
+        if raw in _FALSE:
+            return False
+        self.error(name, f"'{raw}' is not a boolean (1/0)")
+        return default
+
+    def choice(self, name: str, allowed: frozenset) -> str:
+        value = (self.row.get(name) or "").strip()
+        if not value:
+            self.error(name, "required")
+        elif value not in allowed:
+            self.error(name, f"'{value}' is not one of {', '.join(sorted(allowed))}")
+        return value
+
+
+@dataclass
+class _Lookups:
+    """
+    Reference maps built once per import (one query per table).
+    """
+    tournament_ids: Set[int]
+    tournament_names: Dict[str, Optional[int]]
+    team_ids: Set[int]
+    team_names: Dict[str, Optional[int]]
+    referee_ids: Set[int]
+    referee_emails: Dict[str, Optional[int]]
+    player_team: Dict[int, int]
+    # (team_id, "first last") -> player_id
+    player_names: Dict[Tuple[int, str], Optional[int]]
+    matches: Dict[MatchKey, Match]
+    matches_by_id: Dict[int, Match]
+
+
+class HistoryImportService:
+    """
+    Streaming importers for referees, matches (with referees) and match events,
+    from CSV or JSON Lines (.jsonl). Meant for loading whole past seasons.
+
+    References can be given as ids (tournament_id, home_team_id, player_id, ...)
+    or by name (tournament, home_team, player = "First Last", referee e-mails);
+    they are resolved through lookup maps built once per import, so no row
+    needs a query. Records are validated while they stream into batched
+    inserts inside one transaction; if any record is invalid, the transaction
+    is rolled back and the complete report is raised as ImportValidationError.
+
+    Imported finished matches are history, not results that just came in:
+    after a match or event import the ratings are replayed and head-to-head
+    rebuilt (so the status sweep sees them as processed and never rates them
+    one by one on top of today's ratings), and the suspensions of imported
+    tournaments without open matches are settled as served.
+    """
+
+    def __init__(
+        self,
+        tournament_repo: TournamentRepository,
+        team_repo: TeamRepository,
+        player_repo: PlayerRepository,
+        referee_repo: RefereeRepository,
+        match_repo: MatchRepository,
+        event_repo: MatchEventRepository,
+        h2h_service: Optional[HeadToHeadService] = None,
+        rating_service: Optional[RatingService] = None,
+    ):
+        self.tournament_repo = tournament_repo
+        self.team_repo = team_repo
+        self.player_repo = player_repo
+        self.referee_repo = referee_repo
+        self.match_repo = match_repo
+        self.event_repo = event_repo
+        self.h2h_service = h2h_service
+        self.rating_service = rating_service
+
+    def _lookups(self) -> _Lookups:
+        # Primary reads: the lookups decide what the import inserts
+        tournaments = self.tournament_repo.list(replica=False)
+        teams = self.team_repo.list(include_deleted=True, replica=False)
+        referees = self.referee_repo.list(replica=False)
+        players = self.player_repo.list_all()
+        matches = self.match_repo.list_keys()
+        return _Lookups(
+            tournament_ids={t.tournament_id for t in tournaments},
+            tournament_names=_names((t.name, t.tournament_id) for t in tournaments),
+            team_ids={t.team_id for t in teams},
+            team_names=_names((t.name, t.team_id) for t in teams),
+            referee_ids={r.referee_id for r in referees},
+            referee_emails=_names((r.email, r.referee_id) for r in referees),
+            player_team={p.player_id: p.team_id for p in players},
+            player_names=self._player_names(players),
+            matches=matches,
+            matches_by_id={m.match_id: m for m in matches.values()},
+        )
+
+    @staticmethod
+    def _player_names(players) -> Dict[Tuple[int, str], Optional[int]]:
+        result: Dict[Tuple[int, str], Optional[int]] = {}
+        for p in players:
+            key = (p.team_id, " ".join(f"{p.first_name} {p.last_name}".split()).casefold())
+            result[key] = None if key in result else p.player_id
+        return result
+
+    # -------------------------
+    # Referees (upsert by e-mail)
+    # -------------------------
+    def import_referees(self, path: str) -> UpsertResult:
+        """
+        Columns: full_name, email, level, active (optional, default 1).
+        Referees are matched to existing ones by e-mail (case-insensitive).
+        """
+        report: ValidationReport[Referee] = ValidationReport(path)
+        existing = {r.email.strip().casefold(): r for r in self.referee_repo.list(replica=False)}
+        incoming: Dict[str, Referee] = {}
+
+        for line, row in iter_records(path, report.errors):
+            c = _Checker(row, line, report.errors)
+            full_name = c.text("full_name")
+            email = c.text("email")
+            level = c.choice("level", LEVELS)
+            active = c.flag("active", True)
+            if not c.failed:
+                incoming[email.casefold()] = Referee(None, full_name, email, level, active)
+
+        if not report.ok:
+            raise ImportValidationError(report)
+
+        to_insert, to_update, unchanged = [], [], 0
+        for key, r in incoming.items():
+            current = existing.get(key)
+            if current is None:
+                to_insert.append(r)
+            elif (r.full_name, r.email, r.level, r.active) != (
+                current.full_name, current.email, current.level, current.active
+            ):
+                to_update.append(replace(r, referee_id=current.referee_id))
+            else:
+                unchanged += 1
+
+        self.referee_repo.save_many(to_insert, to_update)
+        return UpsertResult(len(to_insert), len(to_update), unchanged)
+
+    # -------------------------
+    # Matches with referee lists
+    # -------------------------
+    def import_matches(self, path: str) -> UpsertResult:
+        """
+        Columns: tournament_id | tournament, home_team_id | home_team,
+        away_team_id | away_team, start_time (YYYY-MM-DD HH:MM), status,
+        is_overtime (optional), referee_ids | referees (e-mails), separated by ';'
+        in CSV or as a JSON list.
+
+        Matches that already exist (same tournament, teams and start time) are skipped.
+        """
+        lookups = self._lookups()
+        report: ValidationReport[Match] = ValidationReport(path)
+        tournaments: Set[int] = set()
+        skipped = 0
+
+        def records() -> Iterator[Tuple[Match, List[int]]]:
+            nonlocal skipped
+            seen: Dict[MatchKey, int] = {}
+
+            for line, row in iter_records(path, report.errors):
+                c = _Checker(row, line, report.errors)
+                tournament_id = c.ref("tournament_id", "tournament", lookups.tournament_ids,
+                                      lookups.tournament_names, "tournament")
+                home = c.ref("home_team_id", "home_team", lookups.team_ids, lookups.team_names, "team")
+                away = c.ref("away_team_id", "away_team", lookups.team_ids, lookups.team_names, "team")
+                if home is not None and home == away:
+                    c.error("away_team", "home and away teams must be different")
+                start_time = c.convert("start_time", datetime.fromisoformat, "a date and time")
+                status = c.choice("status", STATUSES)
+                is_overtime = c.flag("is_overtime", False)
+                referee_ids = self._referees(c, lookups)
+
+                if c.failed:
+                    continue
+
+                m = Match(None, tournament_id, home, away, start_time, status, is_overtime)
+                key = match_key(m)
+                if key in seen:
+                    c.error("start_time", f"duplicate of the match on line {seen[key]}")
+                    continue
+                seen[key] = line
+                if key in lookups.matches:
+                    skipped += 1
+                    continue
+                tournaments.add(tournament_id)
+                yield m, referee_ids
+
+            # Raised inside the writer's transaction, so nothing is kept
+            if not report.ok:
+                raise ImportValidationError(report)
+
+        inserted = self.match_repo.insert_many_with_referees(records())
+        if inserted:
+            self._settle_history(tournaments)
+        return UpsertResult(inserted=inserted, unchanged=skipped)
+
+    @staticmethod
+    def _referees(c: _Checker, lookups: _Lookups) -> List[int]:
+        ids: List[int] = []
+        raw_ids = (c.row.get("referee_ids") or "").strip()
+        raw_emails = (c.row.get("referees") or "").strip()
+
+        for part in filter(None, (p.strip() for p in raw_ids.split(LIST_SEPARATOR))):
+            if not part.isdigit() or int(part) not in lookups.referee_ids:
+                c.error("referee_ids", f"referee {part} does not exist")
+            else:
+                ids.append(int(part))
+        for part in filter(None, (p.strip() for p in raw_emails.split(LIST_SEPARATOR))):
+            referee_id = lookups.referee_emails.get(part.casefold())
+            if referee_id is None:
+                c.error("referees", f"referee '{part}' does not exist")
+            else:
+                ids.append(referee_id)
+
+        if not ids and not c.failed:
+            c.error("referees", "at least one referee is required")
+        return sorted(set(ids))
+
+    # -------------------------
+    # Match events
+    # -------------------------
+    def import_events(self, path: str) -> UpsertResult:
+        """
+        Columns: match_id (or tournament/home_team/away_team/start_time as in the
+        match file), team_id | team, player_id | player ("First Last", optional),
+        minute, event_type, xg (optional).
+
+        Events of matches that already had events before the import are skipped,
+        so re-running a file does not double them. Suspension checks are not
+        applied to history; statistics, discipline and match scores are rebuilt
+        afterwards for every affected tournament, then ratings and head-to-head
+        (if configured) are recomputed with the new scores.
+        """
+        lookups = self._lookups()
+        # Per tournament, read the first time the file refers to it
+        had_events: Dict[int, Set[int]] = {}
+        report: ValidationReport[MatchEvent] = ValidationReport(path)
+        tournaments: Set[int] = set()
+        skipped = 0
+
+        def records() -> Iterator[MatchEvent]:
+            nonlocal skipped
+            for line, row in iter_records(path, report.errors):
+                c = _Checker(row, line, report.errors)
+                match = self._match(c, lookups)
+                team_id = c.ref("team_id", "team", lookups.team_ids, lookups.team_names, "team")
+                if match is not None and team_id is not None and team_id not in (
+                    match.home_team_id, match.away_team_id
+                ):
+                    c.error("team", f"team {team_id} does not play match {match.match_id}")
+                player_id = self._player(c, lookups, team_id)
+                minute = c.convert("minute", int, "an integer")
+                if minute is not None and not 0 <= minute <= MAX_MINUTE:
+                    c.error("minute", f"out of range (0..{MAX_MINUTE})")
+                event_type = c.choice("event_type", EVENT_TYPES)
+                xg = None
+                if (row.get("xg") or "").strip():
+                    xg = c.convert("xg", float, "a number")
+
+                if c.failed:
+                    continue
+                if match.tournament_id not in had_events:
+                    had_events[match.tournament_id] = self.event_repo.match_ids_with_events(match.tournament_id)
+                if match.match_id in had_events[match.tournament_id]:
+                    skipped += 1
+                    continue
+                tournaments.add(match.tournament_id)
+                yield MatchEvent(None, match.match_id, player_id, team_id, minute, event_type, xg, None)
+
+            if not report.ok:
+                raise ImportValidationError(report)
+
+        inserted = self.event_repo.insert_many(records())
+
+        for tournament_id in sorted(tournaments):
+            self.event_repo.stats.rebuild(tournament_id)
+            self.event_repo.discipline.rebuild(tournament_id)
+            self.event_repo.scores.reconcile(tournament_id)
+        if inserted:
+            self._settle_history(tournaments)
+
+        return UpsertResult(inserted=inserted, unchanged=skipped)
+
+    def _settle_history(self, tournament_ids: Set[int]) -> None:
+        """
+        Derived data of imported matches, recomputed in time order: full rating
+        replay (imported matches may predate the current ratings), head-to-head
+        rebuild, and suspensions of closed imported tournaments marked served.
+        """
+        if self.rating_service is not None:
+            self.rating_service.replay_all()
+        if self.h2h_service is not None:
+            self.h2h_service.rebuild()
+        for tournament_id in sorted(tournament_ids):
+            self.event_repo.discipline.settle_bans(tournament_id)
+
+    @staticmethod
+    def _match(c: _Checker, lookups: _Lookups) -> Optional[Match]:
+        raw_id = (c.row.get("match_id") or "").strip()
+        if raw_id:
+            match_id = c.convert("match_id", int, "an integer")
+            if match_id is None:
+                return None
+            match = lookups.matches_by_id.get(match_id)
+            if match is None:
+                c.error("match_id", f"match {match_id} does not exist")
+            return match
+
+        tournament_id = c.ref("tournament_id", "tournament", lookups.tournament_ids,
+                              lookups.tournament_names, "tournament")
+        home = c.ref("home_team_id", "home_team", lookups.team_ids, lookups.team_names, "team")
+        away = c.ref("away_team_id", "away_team", lookups.team_ids, lookups.team_names, "team")
+        start_time = c.convert("start_time", datetime.fromisoformat, "a date and time")
+        if None in (tournament_id, home, away, start_time):
+            return None
+
+        match = lookups.matches.get((tournament_id, home, away, start_time))
+        if match is None:
+            c.error("match_id", "no match with this tournament, teams and start time")
+        return match
+
+    @staticmethod
+    def _player(c: _Checker, lookups: _Lookups, team_id: Optional[int]) -> Optional[int]:
+        raw_id = (c.row.get("player_id") or "").strip()
+        if raw_id:
+            return c.ref("player_id", "player", lookups.player_team, {}, "player")
+
+        name = (c.row.get("player") or "").strip()
+        if not name or team_id is None:
+            return None
+        key = (team_id, " ".join(name.split()).casefold())
+        if key not in lookups.player_names:
+            c.error("player", f"player '{name}' not found in team {team_id}")
+            return None
+        if lookups.player_names[key] is None:
+            c.error("player", f"player '{name}' is ambiguous, use player_id")
+            return None
+        return lookups.player_names[key]
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.db_mysql import ValidationError
+from src.services.import_service import (
+    PLAYER_COMPARE,
+    TEAM_COMPARE,
+    ImportService,
+    UpsertResult,
+    natural_key,
+    plan_upsert_keyed,
+)
+from src.services.import_validation import (
+    ImportValidationError,
+    ValidationReport,
+    validate_player_rows,
+    validate_team_rows,
+)
+
+CHUNK_ROWS = 1000
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+# Job states
+PENDING = "pending"
+VALIDATING = "validating"
+WRITING = "writing"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+@dataclass
+class Checkpoint:
+    """
+    Saved next to the imported file after every committed chunk.
+    Only valid for the same file (size and modification time).
+    """
+    kind: str
+    upsert: bool
+    size: int
+    mtime_ns: int
+    validated: bool = False
+    offset: int = 0  # byte offset right after the last committed row
+    line: int = 2  # record number of the next row (header is 1)
+    chunks: int = 0  # committed chunks
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @staticmethod
+    def path_for(path: str) -> str:
+        return path + CHECKPOINT_SUFFIX
+
+    @classmethod
+    def load(cls, path: str) -> Optional[Checkpoint]:
+        try:
+            with open(cls.path_for(path), encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path: str) -> None:
+        # Write + rename, so a crash never leaves a half-written checkpoint
+        tmp = self.path_for(path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp, self.path_for(path))
+
+    @classmethod
+    def discard(cls, path: str) -> None:
+        try:
+            os.remove(cls.path_for(path))
+        except FileNotFoundError:
+            pass
+
+    def matches(self, path: str, kind: str, upsert: bool) -> bool:
+        st = os.stat(path)
+        return (self.kind, self.upsert, self.size, self.mtime_ns) == (kind, upsert, st.st_size, st.st_mtime_ns)
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    state: str = PENDING
+    rows: int = 0  # rows validated / committed (including a resumed part)
+    bytes_done: int = 0
+    bytes_total: int = 0
+    rows_per_sec: float = 0.0
+    eta_seconds: Optional[float] = None
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_done / self.bytes_total if self.bytes_total else 0.0
+
+
+def _records(path: str, offset: int) -> Iterator[Tuple[List[str], dict, int]]:
+    """
+    Yields (header, row, byte offset after the row), starting at offset.
+
+    The file is read in binary and decoded line by line, so the offset of every
+    row is exact (text-mode tell() is not available while iterating); csv pulls
+    one line at a time, so quoted multi-line cells are still handled.
+    """
+    with open(path, "rb") as f:
+        pos = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal pos
+            while True:
+                raw = f.readline()
+                if not raw:
+                    return
+                pos += len(raw)
+                yield raw.decode("utf-8-sig" if pos == len(raw) else "utf-8")
+
+        source = lines()
+        header = next(csv.reader(source), None)
+        if header is None:
+            return
+        if offset > pos:
+            f.seek(offset)
+            pos = offset
+
+        for values in csv.reader(source):
+            yield header, dict(zip(header, values)), pos
+
+
+class ImportJob:
+    """
+    Team / player CSV import running on a background thread.
+
+      1) Validation pass over the whole file (nothing is written if a row is invalid)
+      2) Write pass in chunks of CHUNK_ROWS rows, one transaction per chunk;
+         a checkpoint (byte offset + counters) is saved after every commit
+
+    cancel() stops after the current chunk. A cancelled or failed job can be
+    started again for the same file: it skips validation and seeks straight to
+    the checkpoint offset. In upsert mode resuming is idempotent anyway; in plain
+    insert mode the checkpoint is what prevents duplicates (a crash between a
+    chunk commit and the checkpoint write can repeat that one chunk).
+    """
+
+    def __init__(
+        self,
+        service: ImportService,
+        kind: str,
+        path: str,
+        upsert: bool = True,
+        chunk_rows: int = CHUNK_ROWS,
+    ):
+        if kind not in ("teams", "players"):
+            raise ValidationError(f"Unknown import kind: {kind}")
+
+        self.service = service
+        self.kind = kind
+        self.path = path
+        self.upsert = upsert
+        self.chunk_rows = chunk_rows
+
+        self.progress = ImportProgress()
+        self.result: Optional[UpsertResult] = None
+        self.error: Optional[Exception] = None
+
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._team_ids = None
+
+    # -------------------------
+    # Control (called from the UI thread)
+    # -------------------------
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def resumable(path: str, kind: str, upsert: bool) -> Optional[Checkpoint]:
+        cp = Checkpoint.load(path)
+        if cp is not None and cp.matches(path, kind, upsert):
+            return cp
+        return None
+
+    # -------------------------
+    # Worker thread
+    # -------------------------
+    def _run(self) -> None:
+        try:
+            self.result = self._import()
+        except Exception as e:
+            self.error = e
+            self.progress = replace(self.progress, state=FAILED, eta_seconds=None)
+
+    def _import(self) -> Optional[UpsertResult]:
+        st = os.stat(self.path)
+        cp = self.resumable(self.path, self.kind, self.upsert) or Checkpoint(
+            kind=self.kind, upsert=self.upsert, size=st.st_size, mtime_ns=st.st_mtime_ns
+        )
+        if self.kind == "players":
+            self._team_ids = self.service.team_repo.list_ids()
+
+        if not cp.validated:
+            if not self._validate(st.st_size):
+                return None
+            cp.validated = True
+            cp.save(self.path)
+
+        if not self._write(cp, st.st_size):
+            return None
+
+        Checkpoint.discard(self.path)
+        self.progress = replace(self.progress, state=FINISHED, bytes_done=st.st_size, eta_seconds=None)
+        return UpsertResult(cp.inserted, cp.updated, cp.unchanged)
+
+    def _validate(self, size: int) -> bool:
+        started = time.perf_counter()
+        report = ValidationReport(self.path)
+        chunk: List[dict] = []
+        line = 2
+        rows = 0
+        pos = 0
+        header: List[str] = []
+
+        for header, row, pos in _records(self.path, 0):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                report.errors.extend(self._validate_rows(chunk, header, line).errors)
+                if report.errors and report.errors[0].line == 1:
+                    break  # missing columns, every chunk would report the same
+                line += len(chunk)
+                rows += len(chunk)
+                chunk = []
+                self._report(VALIDATING, rows, pos, size, 0, rows, started)
+                if self._cancel.is_set():
+                    self._report(CANCELLED, rows, pos, size, 0, rows, started)
+                    return False
+        if chunk and not (report.errors and report.errors[0].line == 1):
+            report.errors.extend(self._validate_rows(chunk, header, line).errors)
+
+        if not report.ok:
+            raise ImportValidationError(report)
+        return True
+
+    def _validate_rows(self, rows: List[dict], header: List[str], line: int) -> ValidationReport:
+        if self.kind == "teams":
+            return validate_team_rows(self.path, rows, header, first_line=line)
+        return validate_player_rows(self.path, rows, header, self._team_ids, first_line=line)
+
+    def _write(self, cp: Checkpoint, size: int) -> bool:
+        started = time.perf_counter()
+        resumed_rows = cp.inserted + cp.updated + cp.unchanged
+        planner = _UpsertPlanner(self.service, self.kind) if self.upsert else None
+
+        start_pos = cp.offset
+        chunk: List[dict] = []
+        header: List[str] = []
+        end = cp.offset
+        self._report(WRITING, resumed_rows, start_pos, size, start_pos, 0, started)
+
+        for header, row, pos in _records(self.path, cp.offset):
+            chunk.append(row)
+            end = pos
+            if len(chunk) >= self.chunk_rows:
+                self._commit(cp, chunk, header, planner, end)
+                chunk = []
+                rows = cp.inserted + cp.updated + cp.unchanged
+                self._report(WRITING, rows, end, size, start_pos, rows - resumed_rows, started)
+                if self._cancel.is_set():
+                    self._report(CANCELLED, rows, end, size, start_pos, rows - resumed_rows, started)
+                    return False
+        if chunk:
+            self._commit(cp, chunk, header, planner, end)
+        return True
+
+    def _commit(self, cp: Checkpoint, chunk: List[dict], header: List[str], planner, end: int) -> None:
+        report = self._validate_rows(chunk, header, cp.line)
+        if not report.ok:
+            # The file changed after the validation pass
+            raise ImportValidationError(report)
+
+        if planner is None:
+            self._repo().save_many(report.rows, [])
+            cp.inserted += len(report.rows)
+        else:
+            inserts, updates, unchanged = planner.plan(report.rows)
+            self._repo().save_many(inserts, updates)
+            planner.committed(inserts)
+            cp.inserted += len(inserts)
+            cp.updated += len(updates)
+            cp.unchanged += unchanged
+
+        cp.offset = end
+        cp.line += len(chunk)
+        cp.chunks += 1
+        cp.save(self.path)
+
+    def _repo(self):
+        return self.service.team_repo if self.kind == "teams" else self.service.player_repo
+
+    def _report(
+        self,
+        state: str,
+        rows: int,
+        pos: int,
+        size: int,
+        start_pos: int,
+        rows_this_run: int,
+        started: float,
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        rate = rows_this_run / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if state in (VALIDATING, WRITING) and elapsed > 0 and pos > start_pos:
+            eta = elapsed / (pos - start_pos) * (size - pos)
+        self.progress = ImportProgress(
+            state=state,
+            rows=rows,
+            bytes_done=pos,
+            bytes_total=size,
+            rows_per_sec=rate,
+            eta_seconds=eta,
+        )
+
+
+class _UpsertPlanner:
+    """
+    Per-chunk upsert planning against the existing rows (read once per run).
+    A key inserted by an earlier chunk of this run has no id in memory yet;
+    if it shows up again, the existing rows are simply read again.
+    """
+
+    def __init__(self, service: ImportService, kind: str):
+        self.service = service
+        self.kind = kind
+        if kind == "teams":
+            self.key, self.compare = service.team_key, TEAM_COMPARE
+        else:
+            self.key, self.compare = service.player_key, PLAYER_COMPARE
+        self._load()
+
+    def _load(self) -> None:
+        existing = (
+            self.service.team_repo.list(include_deleted=True, replica=False)
+            if self.kind == "teams"
+            else self.service.player_repo.list_all()
+        )
+        self.by_key: Dict[tuple, object] = {natural_key(e, self.key): e for e in existing}
+        self.pending: set = set()
+
+    def plan(self, rows: List) -> Tuple[List, List, int]:
+        if any(natural_key(r, self.key) in self.pending for r in rows):
+            self._load()
+        return plan_upsert_keyed(rows, self.by_key, self.key, self.compare)
+
+    def committed(self, inserts: List) -> None:
+        self.pending.update(natural_key(r, self.key) for r in inserts)
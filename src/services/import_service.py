@@ -1,60 +1,190 @@
 from __future__ import annotations
 
-import csv
+from dataclasses import dataclass, replace
 from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple, TypeVar
 
-from src.db_mysql import ValidationError
 from src.models.team import Team
 from src.models.player import Player
 from src.repositories.team_repository import TeamRepository
 from src.repositories.player_repository import PlayerRepository
+from src.services.import_validation import (
+    ImportValidationError,
+    ValidationReport,
+    validate_players_file,
+    validate_teams_file,
+)
+
+
+# Natural keys used by upsert imports (attribute names of the model)
+TEAM_NATURAL_KEY = ("name", "class_name")
+PLAYER_NATURAL_KEY = ("first_name", "last_name", "birth_date", "team_id")
+
+# Columns compared to decide whether a matched row needs an UPDATE; the only
+# columns an import changes on an existing row. A team's rating (Elo) and
+# is_deleted are taken from the file on insert only.
+TEAM_COMPARE = ("name", "class_name")
+PLAYER_COMPARE = ("team_id", "first_name", "last_name", "birth_date", "position")
+
+T = TypeVar("T")
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _key_part(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip().casefold()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def natural_key(obj: Any, fields: Sequence[str]) -> Tuple:
+    return tuple(_key_part(getattr(obj, f)) for f in fields)
+
+
+def merge_update(current: T, row: T, compare: Sequence[str]) -> T:
+    """
+    The existing row with the compare columns taken from the imported row;
+    its id and every other column are kept.
+    """
+    return replace(current, **{c: getattr(row, c) for c in compare})
+
+
+def plan_upsert(
+    incoming: List[T],
+    existing: List[T],
+    fields: Sequence[str],
+    compare: Sequence[str],
+) -> Tuple[List[T], List[T], int]:
+    """
+    Splits incoming rows into (inserts, updates, unchanged count) by natural key.
+    Rows repeated in the file collapse to the last one. Updates are the existing
+    rows with the compare columns changed (see merge_update).
+    """
+    by_key: Dict[Tuple, T] = {natural_key(e, fields): e for e in existing}
+    return plan_upsert_keyed(incoming, by_key, fields, compare)
+
+
+def plan_upsert_keyed(
+    incoming: List[T],
+    by_key: Dict[Tuple, T],
+    fields: Sequence[str],
+    compare: Sequence[str],
+) -> Tuple[List[T], List[T], int]:
+    """
+    plan_upsert against an already built {natural key: existing row} map.
+    """
+    deduped: Dict[Tuple, T] = {natural_key(r, fields): r for r in incoming}
+
+    inserts: List[T] = []
+    updates: List[T] = []
+    unchanged = 0
+    for key, row in deduped.items():
+        current = by_key.get(key)
+        if current is None:
+            inserts.append(row)
+        elif any(getattr(row, c) != getattr(current, c) for c in compare):
+            updates.append(merge_update(current, row, compare))
+        else:
+            unchanged += 1
+    return inserts, updates, unchanged
 
 
 class ImportService:
-    def __init__(self, team_repo: TeamRepository, player_repo: PlayerRepository):
+    def __init__(
+        self,
+        team_repo: TeamRepository,
+        player_repo: PlayerRepository,
+        team_key: Sequence[str] = TEAM_NATURAL_KEY,
+        player_key: Sequence[str] = PLAYER_NATURAL_KEY,
+    ):
         self.team_repo = team_repo
         self.player_repo = player_repo
+        self.team_key = tuple(team_key)
+        self.player_key = tuple(player_key)
+
+    # -------------------------
+    # Validation (whole file, before any write)
+    # -------------------------
+    def validate_teams_csv(self, path: str) -> ValidationReport[Team]:
+        return validate_teams_file(path)
+
+    def validate_players_csv(self, path: str) -> ValidationReport[Player]:
+        """
+        Team foreign keys are checked against one prefetched id set.
+        """
+        return validate_players_file(path, self.team_repo.list_ids())
 
+    @staticmethod
+    def _require_valid(report: ValidationReport[T]) -> List[T]:
+        if not report.ok:
+            raise ImportValidationError(report)
+        return report.rows
+
+    # -------------------------
+    # Plain imports (always insert)
+    # -------------------------
     def import_teams_csv(self, path: str) -> int:
         """
         Imports teams from CSV.
         Expected columns: name, class_name, rating
+        The file is validated first; nothing is written if any row is invalid.
         """
-        count = 0
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if not row.get("name") or not row.get("class_name"):
-                    raise ValidationError("Missing required team fields")
-
-                team = Team(
-                    team_id=None,
-                    name=row["name"].strip(),
-                    class_name=row["class_name"].strip(),
-                    rating=float(row["rating"]),
-                    is_deleted=False,
-                )
-                self.team_repo.insert(team)
-                count += 1
-        return count
+        teams = self._require_valid(self.validate_teams_csv(path))
+        self.team_repo.save_many(teams, [])
+        return len(teams)
 
     def import_players_csv(self, path: str) -> int:
         """
         Imports players from CSV.
         Expected columns: team_id, first_name, last_name, birth_date, position
+        The file is validated first; nothing is written if any row is invalid.
         """
-        count = 0
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                player = Player(
-                    player_id=None,
-                    team_id=int(row["team_id"]),
-                    first_name=row["first_name"].strip(),
-                    last_name=row["last_name"].strip(),
-                    birth_date=date.fromisoformat(row["birth_date"]),
-                    position=row["position"],
-                )
-                self.player_repo.insert(player)
-                count += 1
-        return count
+        players = self._require_valid(self.validate_players_csv(path))
+        self.player_repo.save_many(players, [])
+        return len(players)
+
+    # -------------------------
+    # Idempotent upsert imports (natural keys)
+    # -------------------------
+    def upsert_teams_csv(self, path: str) -> UpsertResult:
+        """
+        Re-runnable team import: rows are matched to existing teams by natural key
+        (default name + class_name). Existing teams are read in one query and the
+        changes are written in batched statements. The rating column only seeds
+        new teams; existing teams keep their rating and deleted flag.
+        """
+        incoming = self._require_valid(self.validate_teams_csv(path))
+        existing = self.team_repo.list(include_deleted=True, replica=False)
+
+        inserts, updates, unchanged = plan_upsert(
+            incoming, existing, self.team_key,
+            compare=TEAM_COMPARE,
+        )
+        self.team_repo.save_many(inserts, updates)
+        return UpsertResult(len(inserts), len(updates), unchanged)
+
+    def upsert_players_csv(self, path: str) -> UpsertResult:
+        """
+        Re-runnable player import keyed by natural key
+        (default first_name + last_name + birth_date + team_id).
+        """
+        incoming = self._require_valid(self.validate_players_csv(path))
+        existing = self.player_repo.list_all()
+
+        inserts, updates, unchanged = plan_upsert(
+            incoming, existing, self.player_key,
+            compare=PLAYER_COMPARE,
+        )
+        self.player_repo.save_many(inserts, updates)
+        return UpsertResult(len(inserts), len(updates), unchanged)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, TypeVar, get_args
+
+from src.db_mysql import ValidationError
+from src.models.player import Player, PlayerPosition
+from src.models.team import Team
+
+POSITIONS = frozenset(get_args(PlayerPosition))
+
+TEAM_COLUMNS = ("name", "class_name", "rating")
+PLAYER_COLUMNS = ("team_id", "first_name", "last_name", "birth_date", "position")
+
+# VARCHAR sizes from sql/create_tables.sql
+_MAX_LEN = {
+    "name": 100,
+    "class_name": 20,
+    "first_name": 50,
+    "last_name": 50,
+}
+
+T = TypeVar("T")
+
+
+@dataclass
+class RowError:
+    line: int  # line number in the file (header is line 1)
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}, {self.field}: {self.message}"
+
+
+@dataclass
+class ValidationReport(Generic[T]):
+    path: str
+    rows: List[T] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self, limit: int = 20) -> str:
+        lines = [str(e) for e in self.errors[:limit]]
+        if len(self.errors) > limit:
+            lines.append(f"... and {len(self.errors) - limit} more")
+        return "\n".join(lines)
+
+
+class ImportValidationError(ValidationError):
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(
+            f"{len(report.errors)} invalid value(s) in {report.path}, nothing was imported:\n"
+            + report.summary()
+        )
+
+
+class RowChecker:
+    """
+    Collects every problem of one row instead of stopping at the first one.
+    """
+
+    def __init__(self, row: dict, line: int, errors: List[RowError]):
+        self.row = row
+        self.line = line
+        self.errors = errors
+        self.failed = False
+
+    def error(self, name: str, message: str) -> None:
+        self.errors.append(RowError(self.line, name, message))
+        self.failed = True
+
+    def text(self, name: str) -> str:
+        value = (self.row.get(name) or "").strip()
+        if not value:
+            self.error(name, "required")
+        elif name in _MAX_LEN and len(value) > _MAX_LEN[name]:
+            self.error(name, f"longer than {_MAX_LEN[name]} characters")
+        return value
+
+    def convert(self, name: str, parse: Callable[[str], Any], expected: str) -> Any:
+        raw = (self.row.get(name) or "").strip()
+        if not raw:
+            self.error(name, "required")
+            return None
+        try:
+            return parse(raw)
+        except ValueError:
+            self.error(name, f"'{raw}' is not {expected}")
+            return None
+
+
+def _check_header(fieldnames: Optional[Iterable[str]], required: Iterable[str]) -> List[RowError]:
+    present = set(fieldnames or ())
+    return [RowError(1, c, "missing column") for c in required if c not in present]
+
+
+def validate_team_rows(
+    path: str,
+    rows: Iterable[Dict[str, str]],
+    fieldnames,
+    first_line: int = 2,
+) -> ValidationReport[Team]:
+    report: ValidationReport[Team] = ValidationReport(path)
+    report.errors.extend(_check_header(fieldnames, TEAM_COLUMNS))
+    if report.errors:
+        return report
+
+    for line, row in enumerate(rows, start=first_line):
+        c = RowChecker(row, line, report.errors)
+        name = c.text("name")
+        class_name = c.text("class_name")
+        rating = c.convert("rating", float, "a number")
+        if not c.failed:
+            report.rows.append(Team(None, name, class_name, rating, False))
+    return report
+
+
+def validate_player_rows(
+    path: str,
+    rows: Iterable[Dict[str, str]],
+    fieldnames,
+    team_ids: Set[int],
+    first_line: int = 2,
+) -> ValidationReport[Player]:
+    report: ValidationReport[Player] = ValidationReport(path)
+    report.errors.extend(_check_header(fieldnames, PLAYER_COLUMNS))
+    if report.errors:
+        return report
+
+    for line, row in enumerate(rows, start=first_line):
+        c = RowChecker(row, line, report.errors)
+        team_id = c.convert("team_id", int, "an integer")
+        if team_id is not None and team_id not in team_ids:
+            c.error("team_id", f"team {team_id} does not exist")
+        first_name = c.text("first_name")
+        last_name = c.text("last_name")
+        birth_date = c.convert("birth_date", date.fromisoformat, "a date (YYYY-MM-DD)")
+        position = (row.get("position") or "").strip()
+        if not position:
+            c.error("position", "required")
+        elif position not in POSITIONS:
+            c.error("position", f"'{position}' is not one of {', '.join(sorted(POSITIONS))}")
+        if not c.failed:
+            report.rows.append(Player(None, team_id, first_name, last_name, birth_date, position))
+    return report
+
+
+def validate_teams_file(path: str) -> ValidationReport[Team]:
+    """
+    Parses and checks the whole team CSV in one pass, without touching the database.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return validate_team_rows(path, reader, reader.fieldnames)
+
+
+def validate_players_file(path: str, team_ids: Set[int]) -> ValidationReport[Player]:
+    """
+    Parses and checks the whole player CSV in one pass; foreign keys are checked
+    against team_ids (prefetched once by the caller).
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return validate_player_rows(path, reader, reader.fieldnames, team_ids)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from src.db_mysql import DbError
+from src.repositories.match_repository import MatchRepository
+from src.services.discipline_service import DisciplineService
+from src.services.head_to_head_service import HeadToHeadService
+from src.services.rating_service import RatingService
+
+# Scheduled length of a match; after start_time + this the match counts as finished
+DEFAULT_MATCH_MINUTES = 50
+DEFAULT_SWEEP_SECONDS = 60
+SWEEP_BATCH = 500
+
+
+@dataclass
+class FinishResult:
+    # Home rating delta per match (None = the match had already been rated)
+    deltas: Dict[int, Optional[float]] = field(default_factory=dict)
+    # Matches whose hooks failed: {match_id: error}; the next sweep retries them
+    failed: Dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class SweepResult:
+    started: List[int] = field(default_factory=list)
+    finished: List[int] = field(default_factory=list)
+    recovered: List[int] = field(default_factory=list)
+    failed: Dict[int, str] = field(default_factory=dict)
+
+
+class MatchStatusService:
+    """
+    Match status engine: scheduled -> live at start_time, live -> finished
+    after the match duration.
+
+    Only these two transitions are made (cancelled and finished matches are
+    never touched), in batched UPDATEs over idx_match_status_start. Every
+    finished match goes through the same hooks as a manual finish (rating,
+    suspensions served, head-to-head); the hooks are idempotent.
+
+    The status is committed before the hooks run, so a hook that fails leaves
+    a finished but unrated match. Failures are collected per match (the rest
+    of the batch still runs) and every sweep first reprocesses finished
+    matches without rating history, served-suspensions marker or head-to-head
+    marker.
+    """
+
+    def __init__(
+        self,
+        match_repo: MatchRepository,
+        rating_service: RatingService,
+        discipline_service: DisciplineService,
+        h2h_service: HeadToHeadService,
+        match_duration: timedelta = timedelta(minutes=DEFAULT_MATCH_MINUTES),
+    ):
+        self.match_repo = match_repo
+        self.rating_service = rating_service
+        self.discipline_service = discipline_service
+        self.h2h_service = h2h_service
+        self.match_duration = match_duration
+
+    def finish(self, match_ids: Iterable[int]) -> FinishResult:
+        """
+        Manual finish of selected matches, then their hooks.
+        """
+        match_ids = list(match_ids)
+        self.match_repo.set_status_many(match_ids, "finished")
+        result = FinishResult()
+        self._run_hooks(match_ids, result)
+        return result
+
+    def delete(self, match_ids: Iterable[int]) -> int:
+        """
+        Deletes matches (MatchRepository.delete_many). If some of them were
+        finished, their rating and head-to-head contribution is removed by a
+        full rating replay and head-to-head rebuild (suspensions served in
+        them stay served). Returns deleted matches.
+        """
+        match_ids = set(match_ids)
+        finished = self.match_repo.delete_many(match_ids)
+        if finished:
+            self.rating_service.replay_all()
+            self.h2h_service.rebuild()
+        return len(match_ids)
+
+    def on_finished(self, match_id: int) -> Optional[float]:
+        delta = self.rating_service.apply_match(match_id)
+        self.discipline_service.on_match_finished(match_id)
+        self.h2h_service.on_match_finished(match_id)
+        return delta
+
+    def _run_hooks(self, match_ids: Iterable[int], result: FinishResult) -> None:
+        for match_id in match_ids:
+            try:
+                result.deltas[match_id] = self.on_finished(match_id)
+            except DbError as e:
+                result.failed[match_id] = str(e)
+
+    def sweep(self, now: Optional[datetime] = None, batch: int = SWEEP_BATCH) -> SweepResult:
+        now = now or datetime.now()
+        result = SweepResult()
+        hooks = FinishResult()
+
+        # Finished matches whose hooks failed earlier (one batch per sweep)
+        result.recovered = self.match_repo.list_unprocessed_finished(batch)
+        self._run_hooks(result.recovered, hooks)
+
+        while True:
+            ids = self.match_repo.advance_status("scheduled", "live", now, batch)
+            result.started.extend(ids)
+            if len(ids) < batch:
+                break
+
+        while True:
+            ids = self.match_repo.advance_status("live", "finished", now - self.match_duration, batch)
+            result.finished.extend(ids)
+            self._run_hooks(ids, hooks)
+            if len(ids) < batch:
+                break
+
+        result.failed = hooks.failed
+        return result
+
+
+class MatchStatusScheduler:
+    """
+    Runs MatchStatusService.sweep every interval on a daemon thread.
+    Errors (e.g. the database is down) are kept in last_error and the next
+    sweep simply tries again; so are matches whose finish hooks failed.
+    """
+
+    def __init__(
+        self,
+        service: MatchStatusService,
+        interval_seconds: float = DEFAULT_SWEEP_SECONDS,
+    ):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self.last_result: Optional[SweepResult] = None
+        self.last_error: Optional[Exception] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.last_result = self.service.sweep()
+                self.last_error = None
+            except DbError as e:
+                self.last_error = e
+            self._stop.wait(self.interval_seconds)
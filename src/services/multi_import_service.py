@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.db_mysql import ValidationError
+from src.services.import_service import (
+    PLAYER_COMPARE,
+    TEAM_COMPARE,
+    ImportService,
+    UpsertResult,
+    merge_update,
+    natural_key,
+)
+from src.services.import_validation import (
+    RowError,
+    ValidationReport,
+    validate_players_file,
+    validate_teams_file,
+)
+
+KINDS = ("teams", "players")
+
+# Below this many files the pool start-up costs more than it saves
+MIN_FILES_FOR_POOL = 4
+
+
+@dataclass
+class FileResult:
+    path: str
+    rows: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class MultiImportResult:
+    files: List[FileResult]
+    seconds: float
+
+    @property
+    def totals(self) -> UpsertResult:
+        return UpsertResult(
+            inserted=sum(f.inserted for f in self.files),
+            updated=sum(f.updated for f in self.files),
+            unchanged=sum(f.unchanged for f in self.files),
+        )
+
+    @property
+    def failed(self) -> List[FileResult]:
+        return [f for f in self.files if not f.ok]
+
+
+# on_progress(files_parsed, files_total, valid_rows_parsed)
+ProgressFn = Callable[[int, int, int], None]
+
+
+def _parse_file(args: Tuple[str, str, Optional[Set[int]]]) -> ValidationReport:
+    """
+    Worker: parses and validates one file. Module level so it can be pickled
+    by the process pool; it never touches the database. A file that cannot be
+    read is reported as a file-level error so the other files still import.
+    """
+    kind, path, team_ids = args
+    try:
+        if kind == "teams":
+            return validate_teams_file(path)
+        return validate_players_file(path, team_ids or set())
+    except (OSError, UnicodeDecodeError) as e:
+        return ValidationReport(path=path, errors=[RowError(0, "-", f"cannot read file: {e}")])
+
+
+class MultiFileImportService:
+    """
+    Imports many CSV files of one kind (e.g. one roster per class).
+
+    Files are parsed and validated in parallel on a process pool. A single
+    writer then consumes the reports in the order the files were given (not in
+    completion order), so the same input always produces the same result, and
+    writes all valid rows with batched statements in one transaction.
+    Files with any invalid row are reported and skipped as a whole.
+    """
+
+    def __init__(self, service: ImportService):
+        self.service = service
+
+    def import_files(
+        self,
+        kind: str,
+        paths: Sequence[str],
+        upsert: bool = True,
+        workers: Optional[int] = None,
+        on_progress: Optional[ProgressFn] = None,
+    ) -> MultiImportResult:
+        if kind not in KINDS:
+            raise ValidationError(f"Unknown import kind: {kind}")
+        if not paths:
+            raise ValidationError("No files selected.")
+
+        started = time.perf_counter()
+
+        # Foreign keys are checked in the workers against one prefetched set
+        team_ids = self.service.team_repo.list_ids() if kind == "players" else None
+        reports = self._parse_all(kind, paths, team_ids, workers, on_progress)
+
+        if kind == "teams":
+            repo, key = self.service.team_repo, self.service.team_key
+            compare = TEAM_COMPARE
+            existing = self.service.team_repo.list(include_deleted=True, replica=False) if upsert else []
+        else:
+            repo, key = self.service.player_repo, self.service.player_key
+            compare = PLAYER_COMPARE
+            existing = self.service.player_repo.list_all() if upsert else []
+
+        results = [FileResult(path=r.path, rows=len(r.rows), errors=r.errors) for r in reports]
+        valid = [(i, r) for i, r in enumerate(reports) if r.ok]
+
+        if not upsert:
+            to_insert = [row for _i, r in valid for row in r.rows]
+            for i, r in valid:
+                results[i].inserted = len(r.rows)
+            repo.save_many(to_insert, [])
+            return MultiImportResult(files=results, seconds=time.perf_counter() - started)
+
+        # Ordered merge: a key repeated in a later file (or later in the same file) wins
+        merged: Dict[Tuple, Tuple[int, object]] = {}
+        for i, r in valid:
+            for row in r.rows:
+                merged[natural_key(row, key)] = (i, row)
+
+        by_key = {natural_key(e, key): e for e in existing}
+        to_insert, to_update = [], []
+        for k, (i, row) in merged.items():
+            current = by_key.get(k)
+            if current is None:
+                to_insert.append(row)
+                results[i].inserted += 1
+            elif any(getattr(row, c) != getattr(current, c) for c in compare):
+                to_update.append(merge_update(current, row, compare))
+                results[i].updated += 1
+            else:
+                results[i].unchanged += 1
+
+        repo.save_many(to_insert, to_update)
+        return MultiImportResult(files=results, seconds=time.perf_counter() - started)
+
+    @staticmethod
+    def _parse_all(
+        kind: str,
+        paths: Sequence[str],
+        team_ids: Optional[Set[int]],
+        workers: Optional[int],
+        on_progress: Optional[ProgressFn],
+    ) -> List[ValidationReport]:
+        total = len(paths)
+        reports: List[Optional[ValidationReport]] = [None] * total
+        rows = 0
+
+        workers = workers or os.cpu_count() or 1
+        workers = max(1, min(workers, total))
+
+        if workers == 1 or total < MIN_FILES_FOR_POOL:
+            for i, path in enumerate(paths):
+                reports[i] = _parse_file((kind, path, team_ids))
+                rows += len(reports[i].rows)
+                if on_progress:
+                    on_progress(i + 1, total, rows)
+            return reports
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_parse_file, (kind, path, team_ids)): i for i, path in enumerate(paths)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                reports[i] = future.result()
+                rows += len(reports[i].rows)
+                if on_progress:
+                    on_progress(done, total, rows)
+        return reports
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.db_mysql import ConflictError, DbError, ValidationError, is_connection_error, is_retryable_error
+from src.models.match_event import MatchEvent
+from src.repositories.match_event_repository import MatchEventRepository
+from src.services.write_journal import JournalEntry, WriteJournal
+
+REPLAY_BATCH = 50
+DEFAULT_REPLAY_SECONDS = 5.0
+
+OP_GOAL = "goal"
+OP_EVENT = "event"
+
+
+@dataclass
+class ReplayResult:
+    applied: int = 0
+    rejected: int = 0
+    remaining: int = 0
+
+
+class OfflineEventWriter:
+    """
+    Event writes that keep working while the database is unreachable.
+
+    A write goes to the database directly; if the connection fails (see
+    is_connection_error) it is appended to the WriteJournal instead and the
+    caller gets None instead of an event id. While anything is pending, new
+    writes are journaled as well, so they reach the database in the order they
+    were made. Errors of the write itself (ValidationError, ...) are raised
+    as usual.
+
+    Every write carries a client-generated id (client_write table), so a
+    write whose commit outcome is unknown (link lost during commit) or an
+    entry replayed twice is applied only once.
+    """
+
+    def __init__(self, repo: MatchEventRepository, journal: WriteJournal):
+        self.repo = repo
+        self.journal = journal
+
+    def add_goal(
+        self,
+        match_id: int,
+        team_id: int,
+        player_id: Optional[int],
+        minute: int,
+        xg: Optional[float] = None,
+    ) -> Optional[int]:
+        self.repo.check_minute(minute)
+        args = {"match_id": match_id, "team_id": team_id, "player_id": player_id, "minute": minute, "xg": xg}
+        return self._write(OP_GOAL, args)
+
+    def insert_event(self, e: MatchEvent) -> Optional[int]:
+        self.repo.check_minute(e.minute)
+        args = {
+            "match_id": e.match_id,
+            "player_id": e.player_id,
+            "team_id": e.team_id,
+            "minute": e.minute,
+            "event_type": e.event_type,
+            "xg": e.xg,
+        }
+        return self._write(OP_EVENT, args)
+
+    def _write(self, op: str, args: dict) -> Optional[int]:
+        entry = self.journal.new_entry(op, args)
+        if self.journal.pending_count == 0:
+            try:
+                return self._apply_online(entry)
+            except DbError as e:
+                if not is_connection_error(e):
+                    raise
+
+        self.journal.append(entry)
+        return None
+
+    def _apply_online(self, entry: JournalEntry) -> int:
+        if entry.op == OP_GOAL:
+            return self.repo.add_goal_transaction(client_id=entry.client_id, **entry.args)
+        return self.repo.insert(self._event(entry), entry.client_id)
+
+    # -------------------------
+    # Replay
+    # -------------------------
+    def replay(self, batch_size: int = REPLAY_BATCH) -> ReplayResult:
+        """
+        Sends pending entries in order, batch_size per transaction. Inside a
+        batch every entry has its own savepoint: an entry the database refuses
+        (ValidationError, NotFoundError, a foreign key error, ...) is rolled
+        back alone and moved to the rejected file, the rest of the batch
+        commits. Conflicts and deadlocks run the batch again. Stops at the
+        first connection error; what was not committed stays pending.
+        """
+        result = ReplayResult()
+        while True:
+            batch = self.journal.pending(batch_size)
+            if not batch:
+                break
+            try:
+                outcome = self.repo.db.run_transaction(
+                    lambda cur: self._replay_batch(cur, batch),
+                    "journal_replay",
+                    "replay offline journal",
+                    retry_on=(ConflictError,),
+                )
+            except DbError as e:
+                if is_connection_error(e):
+                    break
+                raise
+
+            # Acknowledged only after the commit; a crash in between is
+            # harmless because the replay is deduplicated by client id
+            self.journal.ack(entry.client_id for entry, error in outcome if error is None)
+            for entry, error in outcome:
+                if error is None:
+                    result.applied += 1
+                else:
+                    self.journal.reject(entry, error)
+                    result.rejected += 1
+
+        result.remaining = self.journal.pending_count
+        return result
+
+    def _replay_batch(self, cur, batch: List[JournalEntry]) -> List[Tuple[JournalEntry, Optional[str]]]:
+        outcome = []
+        for entry in batch:
+            cur.execute("SAVEPOINT journal_entry")
+            try:
+                if entry.op == OP_GOAL:
+                    self.repo.add_goal(cur, client_id=entry.client_id, **entry.args)
+                elif entry.op == OP_EVENT:
+                    self.repo.insert_event(cur, self._event(entry), entry.client_id)
+                else:
+                    raise ValidationError(f"Unknown journal operation: {entry.op}")
+                outcome.append((entry, None))
+            except Exception as e:
+                if isinstance(e, ConflictError) or is_retryable_error(e) or is_connection_error(e):
+                    raise  # the whole batch is retried / kept pending
+                cur.execute("ROLLBACK TO SAVEPOINT journal_entry")
+                outcome.append((entry, str(e)))
+        return outcome
+
+    @staticmethod
+    def _event(entry: JournalEntry) -> MatchEvent:
+        return MatchEvent(event_id=None, created_at=None, **entry.args)
+
+
+class JournalReplayer:
+    """
+    Replays the journal every interval on a daemon thread while anything is
+    pending. Errors are kept in last_error and the next round tries again.
+    """
+
+    def __init__(self, writer: OfflineEventWriter, interval_seconds: float = DEFAULT_REPLAY_SECONDS):
+        self.writer = writer
+        self.interval_seconds = interval_seconds
+        self.last_result: Optional[ReplayResult] = None
+        self.last_error: Optional[Exception] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.writer.journal.pending_count:
+                try:
+                    self.last_result = self.writer.replay()
+                    self.last_error = None
+                except DbError as e:
+                    self.last_error = e
+            self._stop.wait(self.interval_seconds)
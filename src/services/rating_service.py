@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.db_mysql import ValidationError
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_rating_history_repository import TeamRatingHistoryRepository
+
+BASE_RATING = 1000.0
+K_FACTOR = 30.0
+# A win after overtime says less about the strength gap than a win in regular time
+OVERTIME_FACTOR = 0.75
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def goal_diff_multiplier(goal_diff: int) -> float:
+    """
+    World Football Elo margin multiplier: 1, 1.5, then (11 + n) / 8.
+    """
+    n = abs(goal_diff)
+    if n <= 1:
+        return 1.0
+    if n == 2:
+        return 1.5
+    return (11.0 + n) / 8.0
+
+
+def match_weight(home_goals: int, away_goals: int, is_overtime: bool) -> float:
+    weight = K_FACTOR * goal_diff_multiplier(home_goals - away_goals)
+    if is_overtime:
+        weight *= OVERTIME_FACTOR
+    return weight
+
+
+def actual_score(home_goals: int, away_goals: int) -> float:
+    if home_goals > away_goals:
+        return 1.0
+    if home_goals < away_goals:
+        return 0.0
+    return 0.5
+
+
+def rating_delta(
+    home_rating: float,
+    away_rating: float,
+    home_goals: int,
+    away_goals: int,
+    is_overtime: bool,
+) -> float:
+    """
+    Returns the rating change of the home team; the away team gets the negative value.
+    """
+    weight = match_weight(home_goals, away_goals, is_overtime)
+    return weight * (actual_score(home_goals, away_goals) - expected_score(home_rating, away_rating))
+
+
+@dataclass
+class ReplayResult:
+    matches: int
+    teams: int
+    seconds: float
+
+
+class RatingService:
+    def __init__(self, match_repo: MatchRepository, history_repo: TeamRatingHistoryRepository):
+        self.match_repo = match_repo
+        self.history_repo = history_repo
+
+    def apply_match(self, match_id: int) -> Optional[float]:
+        """
+        Incremental update after one match finished.
+        Returns the home team delta, or None if the match was already rated.
+        """
+        result = self.match_repo.get_result(match_id)
+        if result["status"] != "finished":
+            raise ValidationError("Rating can be updated only for finished matches.")
+
+        return self.history_repo.apply_match(
+            result,
+            lambda home_rating, away_rating: rating_delta(
+                home_rating,
+                away_rating,
+                result["home_goals"],
+                result["away_goals"],
+                result["is_overtime"],
+            ),
+        )
+
+    def replay_all(self) -> ReplayResult:
+        """
+        Recomputes all ratings from BASE_RATING over finished matches in chronological order
+        and rewrites the rating history.
+        Archived matches take part in the replay (ratings carry over from archived
+        tournaments), but their history stays in archive_team_rating_history.
+        """
+        started = time.perf_counter()
+        results = self.match_repo.list_finished_results(include_archived=True)
+
+        ratings, history = self.replay(results)
+        archived = {r["match_id"] for r in results if r["archived"]}
+        self.history_repo.replace_all(ratings, [h for h in history if h[1] not in archived])
+
+        return ReplayResult(
+            matches=len(results),
+            teams=len(ratings),
+            seconds=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def replay(results: List[dict]) -> tuple[Dict[int, float], List[tuple]]:
+        """
+        Pure replay over results (chronological). Returns (ratings, history rows).
+
+        Teams are mapped to dense indexes and per-match weights / actual scores are
+        precomputed column-wise, so the sequential part is a tight loop over lists.
+        """
+        index: Dict[int, int] = {}
+        for r in results:
+            index.setdefault(r["home_team_id"], len(index))
+            index.setdefault(r["away_team_id"], len(index))
+
+        home_idx = [index[r["home_team_id"]] for r in results]
+        away_idx = [index[r["away_team_id"]] for r in results]
+        weights = [match_weight(r["home_goals"], r["away_goals"], r["is_overtime"]) for r in results]
+        actual = [actual_score(r["home_goals"], r["away_goals"]) for r in results]
+
+        ratings = [BASE_RATING] * len(index)
+        history: List[tuple] = []
+        append = history.append
+
+        for i, r in enumerate(results):
+            h = home_idx[i]
+            a = away_idx[i]
+            home_before = ratings[h]
+            away_before = ratings[a]
+
+            expected = 1.0 / (1.0 + 10.0 ** ((away_before - home_before) / 400.0))
+            delta = weights[i] * (actual[i] - expected)
+
+            ratings[h] = home_before + delta
+            ratings[a] = away_before - delta
+
+            append((r["home_team_id"], r["match_id"], r["start_time"], home_before, ratings[h]))
+            append((r["away_team_id"], r["match_id"], r["start_time"], away_before, ratings[a]))
+
+        return {team_id: ratings[i] for team_id, i in index.items()}, history
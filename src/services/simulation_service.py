@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import exp
+from typing import Dict, List, Optional, Tuple
+
+from src.db_mysql import ValidationError
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_repository import TeamRepository
+from src.services.rating_service import BASE_RATING, expected_score
+from src.services.standings_service import POINTS_WIN, POINTS_DRAW, StandingsTable
+
+# Average goals of one team in one match, used when a team has no xG history
+AVG_GOALS = 1.3
+# Share of the expected goals taken from historical xG (the rest comes from Elo)
+XG_WEIGHT = 0.5
+MIN_GOALS = 0.05
+MAX_GOALS = 12
+
+DEFAULT_SIMULATIONS = 100_000
+
+
+@dataclass
+class SimulationResult:
+    simulations: int
+    seconds: float
+    team_ids: List[int]
+    # team_id -> probability of finishing 1st, 2nd, ... (len == number of teams)
+    positions: Dict[int, List[float]]
+
+    def win_probability(self, team_id: int) -> float:
+        return self.positions[team_id][0]
+
+    def expected_position(self, team_id: int) -> float:
+        return sum((i + 1) * p for i, p in enumerate(self.positions[team_id]))
+
+
+def poisson_cdf(lam: float, max_goals: int = MAX_GOALS) -> List[float]:
+    """
+    Cumulative Poisson table 0..max_goals; the last value is forced to 1.0
+    so bisect over a uniform sample always lands inside the table.
+    """
+    p = exp(-lam)
+    total = p
+    cdf = [total]
+    for k in range(1, max_goals + 1):
+        p *= lam / k
+        total += p
+        cdf.append(total)
+    cdf[-1] = 1.0
+    return cdf
+
+
+def _simulate_chunk(args) -> List[List[int]]:
+    """
+    Worker: runs n simulations and returns counts[team_index][position].
+    Module level so it can be pickled by the process pool.
+    """
+    base_points, base_gd, base_gf, fixtures, n, seed = args
+    rnd = random.Random(seed)
+    rand = rnd.random
+    n_teams = len(base_points)
+    counts = [[0] * n_teams for _ in range(n_teams)]
+    team_range = range(n_teams)
+
+    for _ in range(n):
+        points = base_points[:]
+        gd = base_gd[:]
+        gf = base_gf[:]
+
+        for h, a, home_cdf, away_cdf in fixtures:
+            hg = bisect_right(home_cdf, rand())
+            ag = bisect_right(away_cdf, rand())
+            gf[h] += hg
+            gf[a] += ag
+            gd[h] += hg - ag
+            gd[a] += ag - hg
+            if hg > ag:
+                points[h] += POINTS_WIN
+            elif hg < ag:
+                points[a] += POINTS_WIN
+            else:
+                points[h] += POINTS_DRAW
+                points[a] += POINTS_DRAW
+
+        # Unresolved ties are broken randomly (head-to-head is not simulated)
+        order = sorted(team_range, key=lambda t: (points[t], gd[t], gf[t], rand()), reverse=True)
+        for pos, t in enumerate(order):
+            counts[t][pos] += 1
+
+    return counts
+
+
+class SimulationService:
+    def __init__(
+        self,
+        match_repo: MatchRepository,
+        team_repo: TeamRepository,
+        event_repo: MatchEventRepository,
+    ):
+        self.match_repo = match_repo
+        self.team_repo = team_repo
+        self.event_repo = event_repo
+
+    def simulate_tournament(
+        self,
+        tournament_id: int,
+        simulations: int = DEFAULT_SIMULATIONS,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> SimulationResult:
+        """
+        Monte Carlo simulation of the remaining matches of a tournament.
+
+        Current standings come from finished matches, remaining matches are the
+        scheduled/live ones. Goals are Poisson samples with expected goals blended
+        from team ratings and historical xG.
+        """
+        if simulations <= 0:
+            raise ValidationError("Number of simulations must be positive.")
+
+        started = time.perf_counter()
+
+        finished = self.match_repo.list_finished_results(tournament_id, replica=True)
+        remaining = [
+            m for m in self.match_repo.list_by_tournament(tournament_id)
+            if m.status in ("scheduled", "live")
+        ]
+
+        team_ids = sorted(
+            {r["home_team_id"] for r in finished}
+            | {r["away_team_id"] for r in finished}
+            | {m.home_team_id for m in remaining}
+            | {m.away_team_id for m in remaining}
+        )
+        if not team_ids:
+            raise ValidationError("Tournament has no matches.")
+
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        points, gd, gf = self._current_table(finished, index)
+
+        ratings = {t.team_id: t.rating for t in self.team_repo.list(include_deleted=True)}
+        # Average per finished match: matches without xG events count as played
+        played = self.match_repo.finished_by_team(team_ids, replica=True)
+        xg_sums = self.event_repo.xg_totals_by_team(sorted({t for per in played.values() for t in per}))
+        xg = {
+            team_id: (xg_sum, sum(played[team_id].values()))
+            for team_id, xg_sum in xg_sums.items()
+            if team_id in played
+        }
+
+        fixtures = []
+        for m in remaining:
+            home_lam, away_lam = self.expected_goals(m.home_team_id, m.away_team_id, ratings, xg)
+            fixtures.append(
+                (index[m.home_team_id], index[m.away_team_id], poisson_cdf(home_lam), poisson_cdf(away_lam))
+            )
+
+        workers = workers or os.cpu_count() or 1
+        workers = max(1, min(workers, simulations))
+        seeder = random.Random(seed)
+        chunks = [
+            (points, gd, gf, fixtures, simulations // workers + (1 if i < simulations % workers else 0),
+             seeder.getrandbits(64))
+            for i in range(workers)
+        ]
+
+        if workers == 1:
+            partials = [_simulate_chunk(chunks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_simulate_chunk, chunks))
+
+        n_teams = len(team_ids)
+        positions: Dict[int, List[float]] = {}
+        for team_id, i in index.items():
+            totals = [sum(p[i][pos] for p in partials) for pos in range(n_teams)]
+            positions[team_id] = [c / simulations for c in totals]
+
+        return SimulationResult(
+            simulations=simulations,
+            seconds=time.perf_counter() - started,
+            team_ids=team_ids,
+            positions=positions,
+        )
+
+    @staticmethod
+    def _current_table(
+        finished: List[dict],
+        index: Dict[int, int],
+    ) -> Tuple[List[int], List[int], List[int]]:
+        n = len(index)
+        points, gd, gf = [0] * n, [0] * n, [0] * n
+        for row in StandingsTable(finished).rows.values():
+            i = index[row.team_id]
+            points[i] = row.points
+            gd[i] = row.goal_diff
+            gf[i] = row.goals_for
+        return points, gd, gf
+
+    @staticmethod
+    def expected_goals(
+        home_id: int,
+        away_id: int,
+        ratings: Dict[int, float],
+        xg: Dict[int, Tuple[float, int]],
+    ) -> Tuple[float, float]:
+        """
+        Elo share of 2 * AVG_GOALS, blended with each team's average xG per match.
+        """
+        p_home = expected_score(ratings.get(home_id, BASE_RATING), ratings.get(away_id, BASE_RATING))
+        home_lam = 2.0 * AVG_GOALS * p_home
+        away_lam = 2.0 * AVG_GOALS * (1.0 - p_home)
+
+        home_xg = xg.get(home_id)
+        if home_xg and home_xg[1] > 0:
+            home_lam = XG_WEIGHT * (home_xg[0] / home_xg[1]) + (1.0 - XG_WEIGHT) * home_lam
+
+        away_xg = xg.get(away_id)
+        if away_xg and away_xg[1] > 0:
+            away_lam = XG_WEIGHT * (away_xg[0] / away_xg[1]) + (1.0 - XG_WEIGHT) * away_lam
+
+        return max(home_lam, MIN_GOALS), max(away_lam, MIN_GOALS)
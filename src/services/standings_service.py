@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from src.repositories.match_repository import MatchRepository
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+@dataclass
+class StandingRow:
+    team_id: int
+    position: int = 0
+    played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    points: int = 0
+
+    @property
+    def goal_diff(self) -> int:
+        return self.goals_for - self.goals_against
+
+
+def _add_result(rows: Dict[int, StandingRow], home: int, away: int, hg: int, ag: int) -> None:
+    h = rows[home]
+    a = rows[away]
+    h.played += 1
+    a.played += 1
+    h.goals_for += hg
+    h.goals_against += ag
+    a.goals_for += ag
+    a.goals_against += hg
+    if hg > ag:
+        h.wins += 1
+        a.losses += 1
+        h.points += POINTS_WIN
+    elif hg < ag:
+        a.wins += 1
+        h.losses += 1
+        a.points += POINTS_WIN
+    else:
+        h.draws += 1
+        a.draws += 1
+        h.points += POINTS_DRAW
+        a.points += POINTS_DRAW
+
+
+def _sort_key(row: StandingRow) -> Tuple[int, int, int]:
+    return row.points, row.goal_diff, row.goals_for
+
+
+class StandingsTable:
+    """
+    League table of one tournament.
+
+    Order: points, goal difference, goals scored; teams still level are
+    separated by a head-to-head mini-table (points, goal difference, goals
+    among the tied teams only), applied recursively to every subgroup that
+    is still level. Mini-tables are cached per set of teams and built from an
+    in-memory pair index, so no tie needs another query.
+    """
+
+    def __init__(self, results: Iterable[dict], team_ids: Iterable[int] = ()):
+        # Teams without a finished match yet start with an all-zero row
+        self.rows: Dict[int, StandingRow] = {t: StandingRow(team_id=t) for t in team_ids}
+        # (low, high) -> [(home, away, home_goals, away_goals), ...]
+        self._pairs: Dict[Tuple[int, int], List[Tuple[int, int, int, int]]] = {}
+        self._mini_cache: Dict[FrozenSet[int], Dict[int, StandingRow]] = {}
+
+        for r in results:
+            home, away = r["home_team_id"], r["away_team_id"]
+            for team_id in (home, away):
+                if team_id not in self.rows:
+                    self.rows[team_id] = StandingRow(team_id=team_id)
+
+            _add_result(self.rows, home, away, r["home_goals"], r["away_goals"])
+
+            key = (home, away) if home < away else (away, home)
+            self._pairs.setdefault(key, []).append((home, away, r["home_goals"], r["away_goals"]))
+
+    def ordered(self) -> List[StandingRow]:
+        ordered: List[StandingRow] = []
+        for group in self._groups(list(self.rows), lambda t: _sort_key(self.rows[t])):
+            ordered.extend(self.rows[t] for t in self._resolve(group))
+
+        for i, row in enumerate(ordered, start=1):
+            row.position = i
+        return ordered
+
+    @staticmethod
+    def _groups(team_ids: List[int], key) -> List[List[int]]:
+        """
+        Sorts teams by key (descending) and splits them into groups of equal keys.
+        """
+        groups: List[List[int]] = []
+        last = None
+        for team_id in sorted(team_ids, key=key, reverse=True):
+            k = key(team_id)
+            if groups and k == last:
+                groups[-1].append(team_id)
+            else:
+                groups.append([team_id])
+                last = k
+        return groups
+
+    def _resolve(self, group: List[int]) -> List[int]:
+        if len(group) == 1:
+            return group
+
+        mini = self._mini_table(frozenset(group))
+        subgroups = self._groups(group, lambda t: _sort_key(mini[t]))
+
+        if len(subgroups) == 1:
+            # Head-to-head does not separate them; keep a stable order
+            return sorted(group)
+
+        resolved: List[int] = []
+        for sub in subgroups:
+            resolved.extend(self._resolve(sub))
+        return resolved
+
+    def _mini_table(self, teams: FrozenSet[int]) -> Dict[int, StandingRow]:
+        cached = self._mini_cache.get(teams)
+        if cached is not None:
+            return cached
+
+        mini = {t: StandingRow(team_id=t) for t in teams}
+        ordered = sorted(teams)
+        for i, low in enumerate(ordered):
+            for high in ordered[i + 1:]:
+                for home, away, hg, ag in self._pairs.get((low, high), ()):
+                    _add_result(mini, home, away, hg, ag)
+
+        self._mini_cache[teams] = mini
+        return mini
+
+
+class StandingsService:
+    def __init__(self, match_repo: MatchRepository):
+        self.match_repo = match_repo
+
+    def table(self, tournament_id: int) -> List[StandingRow]:
+        """
+        Builds the table from one query over the finished matches of the
+        tournament; every team with a match in it gets a row, played or not.
+        """
+        results = self.match_repo.list_finished_results(tournament_id, replica=True)
+        team_ids = self.match_repo.team_ids_by_tournament(tournament_id, replica=True)
+        return StandingsTable(results, team_ids).ordered()
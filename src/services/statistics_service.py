@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from src.models.player_stats import PlayerStats
+from src.models.team_stats import TeamStats
+from src.repositories.stats_repository import StatsRepository
+
+
+class StatisticsService:
+    """
+    Leaderboards and totals over the per-tournament rollup tables.
+    The rollups are maintained by MatchEventRepository on every event write,
+    so none of these reads touch match_event.
+    """
+
+    def __init__(self, stats_repo: StatsRepository):
+        self.stats_repo = stats_repo
+
+    def top_scorers(self, tournament_id: int, limit: int = 10) -> list[dict]:
+        return self.stats_repo.top_players(tournament_id, "goals", limit)
+
+    def most_carded(self, tournament_id: int, limit: int = 10) -> list[dict]:
+        return self.stats_repo.top_players(tournament_id, "cards", limit)
+
+    def team_totals(self, tournament_id: int) -> List[TeamStats]:
+        return self.stats_repo.list_team_stats(tournament_id)
+
+    def player_stats(self, tournament_id: int, player_id: int) -> PlayerStats:
+        return self.stats_repo.get_player_stats(tournament_id, player_id)
+
+    def rebuild(self, tournament_id: Optional[int] = None) -> None:
+        """
+        Recomputes the rollups from raw events (after migration or bulk loads).
+        """
+        self.stats_repo.rebuild(tournament_id)
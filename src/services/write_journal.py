@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+DEFAULT_JOURNAL_PATH = "offline_journal.jsonl"
+
+
+@dataclass
+class JournalEntry:
+    client_id: str
+    op: str
+    args: Dict[str, Any]
+    queued_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+
+class WriteJournal:
+    """
+    Append-only local journal of writes made while the database is unreachable.
+
+    One JSON object per line: an entry ({"id", "op", "args", "queued_at"}) or
+    an acknowledgement ({"ack": id}) written after the entry was committed to
+    the database. Every line is flushed and fsynced before append() returns,
+    so a queued write survives a crash or a dead battery. Pending entries are
+    the ones without an ack, in the order they were queued.
+
+    Entries the database refused at replay (e.g. the match was finished
+    meanwhile) are moved to <path>.rejected with the reason, for manual review.
+    Once nothing is pending the journal file is truncated.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self.rejected_path = path + ".rejected"
+        self._lock = threading.Lock()
+        self._pending: List[JournalEntry] = []
+        self.rejected_count = 0
+        self._load()
+
+    # -------------------------
+    # Queue
+    # -------------------------
+    @staticmethod
+    def new_entry(op: str, args: Dict[str, Any]) -> JournalEntry:
+        """
+        Entry with a fresh client id (not queued yet).
+        """
+        return JournalEntry(client_id=str(uuid.uuid4()), op=op, args=dict(args))
+
+    def append(self, entry: JournalEntry) -> None:
+        with self._lock:
+            self._write_lines(self.path, [self._entry_line(entry)])
+            self._pending.append(entry)
+
+    def pending(self, limit: int | None = None) -> List[JournalEntry]:
+        with self._lock:
+            return list(self._pending if limit is None else self._pending[:limit])
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def ack(self, client_ids: Iterable[str]) -> None:
+        done = set(client_ids)
+        if not done:
+            return
+        with self._lock:
+            self._write_lines(self.path, [json.dumps({"ack": cid}) for cid in sorted(done)])
+            self._pending = [e for e in self._pending if e.client_id not in done]
+            self._compact()
+
+    def reject(self, entry: JournalEntry, reason: str) -> None:
+        with self._lock:
+            line = json.dumps({**json.loads(self._entry_line(entry)), "error": reason}, ensure_ascii=False)
+            self._write_lines(self.rejected_path, [line])
+            self.rejected_count += 1
+        self.ack([entry.client_id])
+
+    # -------------------------
+    # File handling
+    # -------------------------
+    def _load(self) -> None:
+        if os.path.exists(self.rejected_path):
+            with open(self.rejected_path, "r", encoding="utf-8") as f:
+                self.rejected_count = sum(1 for line in f if line.strip())
+
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if text and not text.endswith("\n"):
+            # Torn last line of a crash: end it, so the next append starts a new line
+            self._write_lines(self.path, [""])
+
+        entries: Dict[str, JournalEntry] = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # the torn line: its write was never confirmed
+            if "ack" in data:
+                entries.pop(data["ack"], None)
+            else:
+                entries[data["id"]] = JournalEntry(data["id"], data["op"], data["args"], data["queued_at"])
+        self._pending = list(entries.values())
+        self._compact()
+
+    def _compact(self) -> None:
+        if not self._pending and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _entry_line(entry: JournalEntry) -> str:
+        return json.dumps(
+            {"id": entry.client_id, "op": entry.op, "args": entry.args, "queued_at": entry.queued_at},
+            ensure_ascii=False,
+        )
+
+    @staticmethod
+    def _write_lines(path: str, lines: List[str]) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
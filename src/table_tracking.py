@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, FrozenSet, Iterable, Optional, Set
+
+from mysql.connector import Error as MySqlError
+
+from src.query_cache import QueryCache, expand_views
+
+# One row per table with a counter that every committed write bumps
+VERSION_TABLE = "table_version"
+
+ER_NO_SUCH_TABLE = 1146
+
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "TRUNCATE", "ALTER", "DROP", "CREATE", "RENAME")
+_WRITE_TABLES = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE|VIEW)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?", re.IGNORECASE
+)
+# The assignments of an upsert name columns, not tables ("UPDATE yellows=...")
+_UPSERT_TAIL = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b.*", re.IGNORECASE | re.DOTALL)
+
+
+def write_tables(sql: str) -> Optional[FrozenSet[str]]:
+    """
+    Tables a statement may change: None for a read, an empty set for a write
+    whose tables could not be determined (the caller then clears everything).
+    Every table named in a write counts, so UPDATE ... JOIN also reports the
+    joined tables; that only costs a cache miss / an extra refresh.
+    """
+    words = sql.lstrip().split(None, 1)
+    if not words or words[0].upper() not in _WRITE_VERBS:
+        return None
+    return expand_views(_WRITE_TABLES.findall(_UPSERT_TAIL.sub("", sql)))
+
+
+def bump_versions(cur, tables: Iterable[str]) -> None:
+    """
+    One statement for all tables of a transaction (run after its commit);
+    sorted, so two bumps of the same rows lock them in the same order.
+    """
+    tables = sorted(t for t in tables if t != VERSION_TABLE)
+    if not tables:
+        return
+    cur.execute(
+        f"""
+        INSERT INTO {VERSION_TABLE} (table_name, version)
+        VALUES {", ".join(["(%s, 1)"] * len(tables))}
+        ON DUPLICATE KEY UPDATE version=version + 1
+        """,
+        tables,
+    )
+
+
+class TrackingConnection:
+    """
+    Connection proxy: cursors report the tables of every write statement.
+
+    With a cache, those tables are invalidated right away (so in-flight reads
+    do not store old data) and again after commit (drops anything another
+    connection cached in between, when it still read the old committed rows).
+    With bump=True, the table_version counters of the written tables are
+    bumped right after the commit, in a one-statement transaction of its own
+    (see ChangeNotifier): the few counter rows are shared by every client, so
+    they are never held locked for the length of a write transaction. A bump
+    that fails only loses the notification, the write is already committed.
+    If table_version does not exist (migration 008 not run), bumps are
+    switched off and on_no_version_table is called.
+    on_commit receives the written tables once they are committed.
+    """
+
+    def __init__(
+        self,
+        cnx,
+        cache: Optional[QueryCache],
+        bump: bool,
+        on_commit: Optional[Callable[[Set[str]], None]] = None,
+        on_no_version_table: Optional[Callable[[Exception], None]] = None,
+    ):
+        self._cnx = cnx
+        self._cache = cache
+        self._bump = bump
+        self._on_commit = on_commit
+        self._on_no_version_table = on_no_version_table
+        self._written: Set[str] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cnx, name)
+
+    def cursor(self, *args, **kwargs):
+        return TrackingCursor(self._cnx.cursor(*args, **kwargs), self)
+
+    def commit(self) -> None:
+        self._cnx.commit()
+        self._after_commit()
+
+    def rollback(self) -> None:
+        self._cnx.rollback()
+        self._written.clear()
+
+    def close(self) -> None:
+        self._cnx.close()
+
+    def written(self, sql: str) -> None:
+        tables = write_tables(sql)
+        if tables is None:
+            return
+        if not tables:
+            if self._cache is not None:
+                self._cache.clear()
+            return
+        self._written.update(tables)
+        if self._cache is not None:
+            self._cache.invalidate(tables)
+
+    def executed(self) -> None:
+        # In autocommit mode every statement is committed on its own
+        if self._cnx.autocommit and self._written:
+            self._after_commit()
+
+    def _after_commit(self) -> None:
+        if self._bump and self._written:
+            self._bump_versions()
+        self._flush()
+
+    def _bump_versions(self) -> None:
+        # Plain cursor: the counter update itself is not tracked
+        cur = self._cnx.cursor()
+        try:
+            bump_versions(cur, self._written)
+            if not self._cnx.autocommit:
+                self._cnx.commit()
+        except MySqlError as ex:
+            if not self._cnx.autocommit:
+                self._cnx.rollback()
+            # The write is committed already; other errors only lose this bump
+            if getattr(ex, "errno", None) == ER_NO_SUCH_TABLE:
+                self._bump = False
+                if self._on_no_version_table is not None:
+                    self._on_no_version_table(ex)
+        finally:
+            cur.close()
+
+    def _flush(self) -> None:
+        if self._written:
+            if self._cache is not None:
+                self._cache.invalidate(self._written)
+            if self._on_commit is not None:
+                self._on_commit(set(self._written))
+            self._written.clear()
+
+
+class TrackingCursor:
+    def __init__(self, cur, owner: TrackingConnection):
+        self._cur = cur
+        self._owner = owner
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._owner.written(operation)
+        result = self._cur.execute(operation, params, *args, **kwargs)
+        self._owner.executed()
+        return result
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._owner.written(operation)
+        result = self._cur.executemany(operation, seq_params, *args, **kwargs)
+        self._owner.executed()
+        return result
+
+    def close(self):
+        return self._cur.close()
@@ -0,0 +1,56 @@
+"""
+Archive job for finished tournaments.
+
+    python -m src.tools.archive status 3
+    python -m src.tools.archive archive 3 [--chunk 200]
+    python -m src.tools.archive restore 3
+
+archive moves the matches of tournament 3 (with events, referee links, rating
+history) to the archive_* tables in small transactions and can be stopped and
+run again at any time; restore moves them back. Needs migration 010.
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Optional, Sequence
+
+from src.db_mysql import Db, DbError
+from src.main import load_config
+from src.repositories.archive_repository import ARCHIVE_CHUNK, ArchiveRepository
+from src.services.archive_service import ArchiveService
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Archive / restore the matches of a finished tournament")
+    parser.add_argument("command", choices=("status", "archive", "restore"))
+    parser.add_argument("tournament_id", type=int)
+    parser.add_argument("--config", default="src/config.json")
+    parser.add_argument("--chunk", type=int, default=ARCHIVE_CHUNK, help="matches per transaction")
+    args = parser.parse_args(argv)
+
+    db = Db(load_config(args.config))
+    repo = ArchiveRepository(db)
+    service = ArchiveService(repo, chunk=args.chunk)
+
+    def progress(moved: int) -> None:
+        print(f"  {moved} matches moved")
+
+    try:
+        if args.command == "archive":
+            result = service.archive(args.tournament_id, progress)
+        elif args.command == "restore":
+            result = service.restore(args.tournament_id, progress)
+        else:
+            result = None
+
+        if result is not None:
+            print(f"{args.command}: {result.matches} matches in {result.chunks} transactions, {result.seconds:.1f} s")
+        counts = repo.counts(args.tournament_id)
+        print(f"Tournament {args.tournament_id}: {counts['hot']} hot matches, {counts['archived']} archived")
+
+    except DbError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Load test: N simulated scorekeepers working against the database at once.
+
+    python -m src.tools.load_test --clients 1,2,4,8,16 --duration 20
+
+Every client is a thread with its own connections (Db opens one per call, like
+the GUI) doing a weighted mix of add_goal_transaction, list_by_match,
+list_with_names and create_match_with_referees. For each N the run reports
+throughput, latency percentiles, InnoDB row lock waits, transaction retries
+(Db.metrics) and error rates, and the sweep ends with the saturation point:
+the first N whose throughput grew by less than --min-gain over the previous N.
+
+The seed step creates its own tournament, teams, players, a referee and live
+matches, and the run keeps writing into them. Point src/config.json (or
+--config) at a scratch database, not at the real tournament.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.db_mysql import Db, DbError
+from src.main import load_config
+from src.models.match import Match
+from src.models.player import Player
+from src.models.referee import Referee
+from src.models.team import Team
+from src.models.tournament import Tournament
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.player_repository import PlayerRepository
+from src.repositories.referee_repository import RefereeRepository
+from src.repositories.team_repository import TeamRepository
+from src.repositories.tournament_repository import TournamentRepository
+
+# Operation mix (relative weights): mostly scoring and reading, some scheduling
+DEFAULT_MIX = {
+    "add_goal": 40,
+    "list_by_match": 30,
+    "list_with_names": 20,
+    "create_match": 10,
+}
+DEFAULT_CLIENTS = (1, 2, 4, 8, 16, 32)
+DEFAULT_DURATION = 20.0
+DEFAULT_MIN_GAIN = 0.10
+
+SEED_TEAMS = 16
+SEED_PLAYERS_PER_TEAM = 8
+SEED_MATCHES = 8
+POSITIONS = ("GK", "DEF", "MID", "ATT")
+
+
+# -------------------------
+# Seed data
+# -------------------------
+@dataclass
+class Fixture:
+    tournament_id: int
+    referee_id: int
+    team_ids: List[int]
+    players_by_team: Dict[int, List[int]]
+    # (match_id, home_team_id, away_team_id) of the live matches goals go to
+    matches: List[tuple]
+
+
+def seed(
+    db: Db,
+    teams: int = SEED_TEAMS,
+    players_per_team: int = SEED_PLAYERS_PER_TEAM,
+    matches: int = SEED_MATCHES,
+) -> Fixture:
+    """
+    Creates a separate tournament with teams, players, one referee and live
+    matches between consecutive teams (all names tagged with the run time).
+    """
+    tag = datetime.now().strftime("%Y%m%d%H%M%S")
+    team_repo = TeamRepository(db)
+    player_repo = PlayerRepository(db)
+    match_repo = MatchRepository(db)
+
+    tournament_id = TournamentRepository(db).insert(
+        Tournament(None, f"Load test {tag}", date.today(), None, True)
+    )
+    referee_id = RefereeRepository(db).insert(
+        Referee(None, f"Load Test {tag}", f"load-test-{tag}@example.invalid", "external", True)
+    )
+
+    team_ids: List[int] = []
+    players_by_team: Dict[int, List[int]] = {}
+    for t in range(teams):
+        team_id = team_repo.insert(Team(None, f"LT {tag} {t + 1}", "LT", 1000.0, False))
+        team_ids.append(team_id)
+        players_by_team[team_id] = [
+            player_repo.insert(
+                Player(None, team_id, f"Player{p + 1}", f"Team{t + 1}", date(2008, 1, 1), POSITIONS[p % 4])
+            )
+            for p in range(players_per_team)
+        ]
+
+    live = []
+    for i in range(matches):
+        home, away = team_ids[(2 * i) % teams], team_ids[(2 * i + 1) % teams]
+        match_id = match_repo.create_match_with_referees(
+            Match(None, tournament_id, home, away, datetime.now(), "live", False), [referee_id]
+        )
+        live.append((match_id, home, away))
+
+    return Fixture(tournament_id, referee_id, team_ids, players_by_team, live)
+
+
+# -------------------------
+# Measurement
+# -------------------------
+@dataclass
+class OpStats:
+    latencies: List[float] = field(default_factory=list)  # seconds, successful calls
+    errors: Dict[str, int] = field(default_factory=dict)  # exception class -> count
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+
+@dataclass
+class StepResult:
+    clients: int
+    seconds: float
+    ops: Dict[str, OpStats]
+    row_lock_waits: int
+    row_lock_time_ms: int
+    tx_retries: int
+    tx_deadlocks: int
+    tx_lock_timeouts: int
+    tx_conflicts: int
+
+    @property
+    def calls(self) -> int:
+        return sum(s.calls for s in self.ops.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(sum(s.errors.values()) for s in self.ops.values())
+
+    @property
+    def throughput(self) -> float:
+        return (self.calls - self.errors) / self.seconds if self.seconds else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+    def latencies(self) -> List[float]:
+        return sorted(x for s in self.ops.values() for x in s.latencies)
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def _innodb_lock_status(db: Db) -> Dict[str, int]:
+    with db.conn() as cnx, db.cursor(cnx) as cur:
+        cur.execute("SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time')")
+        return {r["Variable_name"]: int(r["Value"]) for r in cur.fetchall()}
+
+
+def _tx_totals(db: Db) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for counts in db.metrics.snapshot().values():
+        for k, v in counts.items():
+            totals[k] = totals.get(k, 0) + v
+    return totals
+
+
+# -------------------------
+# Clients
+# -------------------------
+class _Client:
+    def __init__(self, db: Db, fixture: Fixture, mix: Dict[str, int], rng: random.Random):
+        self.fixture = fixture
+        self.rng = rng
+        self.match_repo = MatchRepository(db)
+        self.event_repo = MatchEventRepository(db)
+
+        self.ops: Dict[str, Callable[[], object]] = {
+            "add_goal": self.add_goal,
+            "list_by_match": self.list_by_match,
+            "list_with_names": self.match_repo.list_with_names,
+            "create_match": self.create_match,
+        }
+        self.names = [name for name in mix if mix[name] > 0]
+        self.weights = [mix[name] for name in self.names]
+
+    def next_op(self) -> str:
+        return self.rng.choices(self.names, weights=self.weights)[0]
+
+    def add_goal(self) -> None:
+        match_id, home, away = self.rng.choice(self.fixture.matches)
+        team_id = self.rng.choice((home, away))
+        player_id = self.rng.choice(self.fixture.players_by_team[team_id])
+        self.event_repo.add_goal_transaction(
+            match_id, team_id, player_id, self.rng.randint(1, 50), round(self.rng.random(), 2)
+        )
+
+    def list_by_match(self) -> None:
+        self.event_repo.list_by_match(self.rng.choice(self.fixture.matches)[0], self.fixture.tournament_id)
+
+    def create_match(self) -> None:
+        home, away = self.rng.sample(self.fixture.team_ids, 2)
+        self.match_repo.create_match_with_referees(
+            Match(None, self.fixture.tournament_id, home, away, datetime.now(), "scheduled", False),
+            [self.fixture.referee_id],
+        )
+
+
+def run_step(
+    db: Db,
+    fixture: Fixture,
+    clients: int,
+    duration: float,
+    mix: Dict[str, int] = DEFAULT_MIX,
+    seed_value: int = 0,
+) -> StepResult:
+    """Runs `clients` threads for `duration` seconds and collects their stats."""
+    stop = threading.Event()
+    per_client: List[Dict[str, OpStats]] = [{} for _ in range(clients)]
+
+    def worker(i: int) -> None:
+        client = _Client(db, fixture, mix, random.Random(seed_value * 1000 + i))
+        stats = per_client[i]
+        while not stop.is_set():
+            name = client.next_op()
+            op = stats.setdefault(name, OpStats())
+            started = time.perf_counter()
+            try:
+                client.ops[name]()
+                op.latencies.append(time.perf_counter() - started)
+            except DbError as e:
+                kind = type(e).__name__
+                op.errors[kind] = op.errors.get(kind, 0) + 1
+
+    locks_before = _innodb_lock_status(db)
+    tx_before = _tx_totals(db)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    stop.wait(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    locks_after = _innodb_lock_status(db)
+    tx_after = _tx_totals(db)
+
+    ops: Dict[str, OpStats] = {}
+    for stats in per_client:
+        for name, s in stats.items():
+            merged = ops.setdefault(name, OpStats())
+            merged.latencies.extend(s.latencies)
+            for kind, n in s.errors.items():
+                merged.errors[kind] = merged.errors.get(kind, 0) + n
+
+    def tx_delta(key: str) -> int:
+        return tx_after.get(key, 0) - tx_before.get(key, 0)
+
+    return StepResult(
+        clients=clients,
+        seconds=seconds,
+        ops=ops,
+        row_lock_waits=locks_after.get("Innodb_row_lock_waits", 0) - locks_before.get("Innodb_row_lock_waits", 0),
+        row_lock_time_ms=locks_after.get("Innodb_row_lock_time", 0) - locks_before.get("Innodb_row_lock_time", 0),
+        tx_retries=tx_delta("retries"),
+        tx_deadlocks=tx_delta("deadlocks"),
+        tx_lock_timeouts=tx_delta("lock_timeouts"),
+        tx_conflicts=tx_delta("conflicts"),
+    )
+
+
+def saturation_point(results: Sequence[StepResult], min_gain: float = DEFAULT_MIN_GAIN) -> Optional[int]:
+    """
+    First client count whose throughput is less than (1 + min_gain) times the
+    previous step's, i.e. where adding clients stopped paying off.
+    """
+    for prev, cur in zip(results, results[1:]):
+        if cur.throughput < prev.throughput * (1 + min_gain):
+            return cur.clients
+    return None
+
+
+# -------------------------
+# Report
+# -------------------------
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}"
+
+
+def format_step(r: StepResult) -> str:
+    lat = r.latencies()
+    lines = [
+        f"N={r.clients:<3} {r.throughput:8.1f} ops/s  "
+        f"p50 {_ms(percentile(lat, 50))} ms  p95 {_ms(percentile(lat, 95))} ms  p99 {_ms(percentile(lat, 99))} ms  "
+        f"errors {r.error_rate:.2%}  lock waits {r.row_lock_waits} ({r.row_lock_time_ms} ms)  "
+        f"retries {r.tx_retries} (deadlocks {r.tx_deadlocks}, timeouts {r.tx_lock_timeouts}, "
+        f"conflicts {r.tx_conflicts})"
+    ]
+    for name in sorted(r.ops):
+        s = r.ops[name]
+        op_lat = sorted(s.latencies)
+        errors = ", ".join(f"{k} {v}" for k, v in sorted(s.errors.items())) or "-"
+        lines.append(
+            f"    {name:<16} {s.calls:7d} calls  p50 {_ms(percentile(op_lat, 50))} ms  "
+            f"p95 {_ms(percentile(op_lat, 95))} ms  errors: {errors}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Concurrent scorekeeper load test")
+    parser.add_argument("--config", default="src/config.json")
+    parser.add_argument("--clients", default=",".join(map(str, DEFAULT_CLIENTS)),
+                        help="comma separated client counts to sweep")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per step")
+    parser.add_argument("--mix", default=None,
+                        help="operation weights, e.g. add_goal=40,list_by_match=30,list_with_names=20,create_match=10")
+    parser.add_argument("--matches", type=int, default=SEED_MATCHES, help="live matches the goals go to")
+    parser.add_argument("--min-gain", type=float, default=DEFAULT_MIN_GAIN)
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        for part in args.mix.split(","):
+            name, _, weight = part.partition("=")
+            if name.strip() not in DEFAULT_MIX:
+                parser.error(f"unknown operation in --mix: {name}")
+            mix[name.strip()] = int(weight)
+
+    db = Db(load_config(args.config))
+    print("Seeding load test data...")
+    fixture = seed(db, matches=args.matches)
+    print(f"Tournament {fixture.tournament_id}, {len(fixture.matches)} live matches")
+
+    results = []
+    for clients in (int(c) for c in args.clients.split(",")):
+        result = run_step(db, fixture, clients, args.duration, mix, args.seed)
+        results.append(result)
+        print(format_step(result))
+
+    point = saturation_point(results, args.min_gain)
+    best = max(results, key=lambda r: r.throughput)
+    print(f"\nPeak throughput {best.throughput:.1f} ops/s at N={best.clients}")
+    if point is None:
+        print("No saturation within the sweep (throughput still growing)")
+    else:
+        print(f"Saturation at N={point} (throughput gain below {args.min_gain:.0%})")
+
+
+if __name__ == "__main__":
+    main()
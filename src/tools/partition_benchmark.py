@@ -0,0 +1,275 @@
+"""
+Benchmark of match_event access paths, before and after partitioning.
+
+    python -m src.tools.partition_benchmark seed --tournaments 60 --matches 40 --events 30
+    python -m src.tools.partition_benchmark run --out before.json
+    mysql ... < sql/partition_match_event.sql
+    python -m src.tools.partition_benchmark run --out after.json
+    python -m src.tools.partition_benchmark compare before.json after.json
+
+seed generates finished tournaments ("Partition bench ...") with matches and
+events straight into the tables (batched INSERTs, no rollups). run times the
+per-match and per-tournament queries of the repositories on random seeded
+matches / tournaments (median and p95 in ms) and records the EXPLAIN of each
+query: with a partitioned match_event the "partitions" column must list a
+single partition. Point src/config.json (or --config) at a scratch database.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.db_mysql import Db, DbError
+from src.main import load_config
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.stats_repository import StatsRepository
+from src.tools.load_test import percentile
+
+BENCH_PREFIX = "Partition bench"
+BENCH_TEAMS = 16
+BENCH_PLAYERS_PER_TEAM = 10
+INSERT_BATCH = 1000
+
+DEFAULT_TOURNAMENTS = 60
+DEFAULT_MATCHES = 40
+DEFAULT_EVENTS = 30
+DEFAULT_REPEAT = 200
+REBUILD_REPEAT = 10
+
+EVENT_TYPES = ("goal", "goal", "goal", "own_goal", "yellow", "yellow", "red")
+
+
+# -------------------------
+# Seed data
+# -------------------------
+def seed(db: Db, tournaments: int, matches: int, events: int, rnd: random.Random) -> Dict[str, int]:
+    """
+    Teams and players once, then per tournament: matches (finished) and
+    events per match, each tournament in its own transaction.
+    """
+    tag = datetime.now().strftime("%Y%m%d%H%M%S")
+    with db.conn() as cnx, db.cursor(cnx) as cur:
+        team_ids: List[int] = []
+        players: Dict[int, List[int]] = {}
+        for t in range(BENCH_TEAMS):
+            cur.execute(
+                "INSERT INTO team (name, class_name, rating, is_deleted) VALUES (%s, %s, %s, 0)",
+                (f"PB {tag} {t + 1}", "PB", 1000.0),
+            )
+            team_id = int(cur.lastrowid)
+            team_ids.append(team_id)
+            players[team_id] = []
+            for p in range(BENCH_PLAYERS_PER_TEAM):
+                cur.execute(
+                    """
+                    INSERT INTO player (team_id, first_name, last_name, birth_date, position)
+                    VALUES (%s, %s, %s, %s, 'MID')
+                    """,
+                    (team_id, f"P{p + 1}", f"T{t + 1}", date(2008, 1, 1)),
+                )
+                players[team_id].append(int(cur.lastrowid))
+        cnx.commit()
+
+        total_events = 0
+        start = datetime(2020, 1, 1)
+        for i in range(tournaments):
+            cur.execute(
+                "INSERT INTO tournament (name, start_date, end_date, is_active) VALUES (%s, %s, %s, 0)",
+                (f"{BENCH_PREFIX} {tag} {i + 1}", (start + timedelta(days=30 * i)).date(), None),
+            )
+            tournament_id = int(cur.lastrowid)
+
+            rows = []
+            for m in range(matches):
+                home, away = rnd.sample(team_ids, 2)
+                cur.execute(
+                    """
+                    INSERT INTO matches (tournament_id, home_team_id, away_team_id, start_time, status)
+                    VALUES (%s, %s, %s, %s, 'finished')
+                    """,
+                    (tournament_id, home, away, start + timedelta(days=30 * i, hours=m)),
+                )
+                match_id = int(cur.lastrowid)
+                for _ in range(events):
+                    team_id = rnd.choice((home, away))
+                    rows.append((
+                        match_id, tournament_id, rnd.choice(players[team_id]), team_id,
+                        rnd.randint(1, 90), rnd.choice(EVENT_TYPES), round(rnd.random() * 0.6, 2),
+                    ))
+
+            for k in range(0, len(rows), INSERT_BATCH):
+                cur.executemany(
+                    """
+                    INSERT INTO match_event (match_id, tournament_id, player_id, team_id, minute, event_type, xg)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    rows[k:k + INSERT_BATCH],
+                )
+            cnx.commit()
+            total_events += len(rows)
+            print(f"  tournament {tournament_id}: {matches} matches, {len(rows)} events")
+
+    return {"tournaments": tournaments, "matches": tournaments * matches, "events": total_events}
+
+
+# -------------------------
+# Measurement
+# -------------------------
+def _samples(db: Db) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """Seeded tournament ids and (match_id, tournament_id) pairs."""
+    with db.conn() as cnx, db.cursor(cnx) as cur:
+        cur.execute(
+            """
+            SELECT m.match_id, m.tournament_id
+            FROM matches m
+            JOIN tournament t ON t.tournament_id = m.tournament_id
+            WHERE t.name LIKE %s
+            """,
+            (BENCH_PREFIX + "%",),
+        )
+        pairs = [(int(r["match_id"]), int(r["tournament_id"])) for r in cur.fetchall()]
+    if not pairs:
+        raise DbError("No benchmark data, run the seed command first")
+    return sorted({t for _m, t in pairs}), pairs
+
+
+def _explain(db: Db, sql: str, params: tuple) -> List[Dict[str, Any]]:
+    with db.conn() as cnx, db.cursor(cnx) as cur:
+        cur.execute("EXPLAIN " + sql, params)
+        return [
+            {k: r.get(k) for k in ("table", "partitions", "type", "key", "rows")}
+            for r in cur.fetchall()
+        ]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    values = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        values.append((time.perf_counter() - started) * 1000)
+    values.sort()
+    return {"median_ms": percentile(values, 50), "p95_ms": percentile(values, 95), "runs": repeat}
+
+
+def run(db: Db, repeat: int, rnd: random.Random) -> Dict[str, Any]:
+    tournaments, pairs = _samples(db)
+    event_repo = MatchEventRepository(db)
+    stats_repo = StatsRepository(db)
+
+    def per_tournament_query(sql: str) -> Callable[[], Any]:
+        def fn():
+            with db.conn() as cnx, db.cursor(cnx) as cur:
+                cur.execute(sql, (rnd.choice(tournaments),))
+                cur.fetchall()
+        return fn
+
+    def count_in_match():
+        match_id, tournament_id = rnd.choice(pairs)
+        with db.conn() as cnx, db.cursor(cnx) as cur:
+            cur.execute(
+                "SELECT COUNT(*) AS n FROM match_event WHERE tournament_id=%s AND match_id=%s AND event_type='goal'",
+                (tournament_id, match_id),
+            )
+            cur.fetchone()
+
+    team_totals = """
+        SELECT team_id, COUNT(*) AS events, SUM(event_type='goal') AS goals
+        FROM match_event
+        WHERE tournament_id=%s
+        GROUP BY team_id
+    """
+    match_id, tournament_id = pairs[0]
+
+    results = {
+        "list_by_match": _time(lambda: event_repo.list_by_match(*rnd.choice(pairs)), repeat),
+        "count_in_match": _time(count_in_match, repeat),
+        "tournament_team_totals": _time(per_tournament_query(team_totals), repeat),
+        "stats_rebuild": _time(lambda: stats_repo.rebuild(rnd.choice(tournaments)), REBUILD_REPEAT),
+    }
+    explain = {
+        "list_by_match": _explain(
+            db,
+            "SELECT event_id FROM match_event WHERE tournament_id=%s AND match_id=%s",
+            (tournament_id, match_id),
+        ),
+        "tournament_team_totals": _explain(db, team_totals, (tournament_id,)),
+    }
+    return {
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "tournaments": len(tournaments),
+        "matches": len(pairs),
+        "results": results,
+        "explain": explain,
+    }
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> str:
+    lines = [f"{'query':<24}{'before p50':>12}{'after p50':>12}{'before p95':>12}{'after p95':>12}{'speedup':>9}"]
+    for name, b in before["results"].items():
+        a = after["results"].get(name)
+        if a is None:
+            continue
+        speedup = b["median_ms"] / a["median_ms"] if a["median_ms"] else float("inf")
+        lines.append(
+            f"{name:<24}{b['median_ms']:>12.2f}{a['median_ms']:>12.2f}"
+            f"{b['p95_ms']:>12.2f}{a['p95_ms']:>12.2f}{speedup:>8.2f}x"
+        )
+    for label, data in (("before", before), ("after", after)):
+        for name, rows in data["explain"].items():
+            partitions = ", ".join(str(r["partitions"]) for r in rows)
+            lines.append(f"{label} EXPLAIN {name}: partitions={partitions}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="match_event partitioning benchmark")
+    parser.add_argument("--config", default="src/config.json")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_seed = sub.add_parser("seed", help="generate benchmark tournaments")
+    p_seed.add_argument("--tournaments", type=int, default=DEFAULT_TOURNAMENTS)
+    p_seed.add_argument("--matches", type=int, default=DEFAULT_MATCHES, help="matches per tournament")
+    p_seed.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="events per match")
+
+    p_run = sub.add_parser("run", help="measure and write the results as JSON")
+    p_run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    p_run.add_argument("--out", required=True)
+
+    p_cmp = sub.add_parser("compare", help="compare two run results")
+    p_cmp.add_argument("before")
+    p_cmp.add_argument("after")
+
+    args = parser.parse_args(argv)
+    rnd = random.Random(args.seed)
+
+    if args.command == "compare":
+        with open(args.before, "r", encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.after, "r", encoding="utf-8") as f:
+            after = json.load(f)
+        print(compare(before, after))
+        return
+
+    db = Db(load_config(args.config))
+    try:
+        if args.command == "seed":
+            print(seed(db, args.tournaments, args.matches, args.events, rnd))
+        else:
+            result = run(db, args.repeat, rnd)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, default=str)
+            for name, r in result["results"].items():
+                print(f"{name:<24} p50 {r['median_ms']:.2f} ms  p95 {r['p95_ms']:.2f} ms")
+            print(f"Written to {args.out}")
+    except DbError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,20 @@ import tkinter as tk
 from tkinter import ttk
 
 from src.ui.screens.home_screen import HomeScreen
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_rating_history_repository import TeamRatingHistoryRepository
+from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.head_to_head_repository import HeadToHeadRepository
+from src.services.rating_service import RatingService
+from src.services.discipline_service import DisciplineService
+from src.services.head_to_head_service import HeadToHeadService
+from src.services.match_status_service import MatchStatusService, MatchStatusScheduler
+from src.services.change_notifier import ChangeNotifier
+from src.services.offline_writer import JournalReplayer, OfflineEventWriter
+from src.services.write_journal import WriteJournal
+
+DISPATCH_MS = 500
 
 class App(tk.Tk):
     def __init__(self, db):
@@ -12,7 +26,55 @@ class App(tk.Tk):
         self.geometry("1100x650")
         self.minsize(950, 600)
 
+        # Writes of other clients (table_version polling); screens subscribe
+        self.changes = ChangeNotifier(db)
+
+        # Event writes survive a lost connection (local journal, replayed later)
+        self.offline = OfflineEventWriter(MatchEventRepository(db), WriteJournal())
+        self.replayer = JournalReplayer(self.offline)
+
+        self.var_journal = tk.StringVar()
+        ttk.Label(self, textvariable=self.var_journal, anchor="e", padding=(10, 2)).pack(side="bottom", fill="x")
+
         root = ttk.Frame(self)
         root.pack(fill="both", expand=True)
 
         HomeScreen(root, self).pack(fill="both", expand=True)
+
+        # Background status engine: scheduled -> live -> finished by start_time
+        match_repo = MatchRepository(db)
+        self.status_scheduler = MatchStatusScheduler(
+            MatchStatusService(
+                match_repo,
+                RatingService(match_repo, TeamRatingHistoryRepository(db)),
+                DisciplineService(DisciplineRepository(db)),
+                HeadToHeadService(HeadToHeadRepository(db), match_repo),
+            )
+        )
+        self.status_scheduler.start()
+        self.changes.start()
+        self.replayer.start()
+        self.after(DISPATCH_MS, self._dispatch_changes)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _dispatch_changes(self):
+        self.changes.dispatch()
+        self._show_journal()
+        self.after(DISPATCH_MS, self._dispatch_changes)
+
+    def _show_journal(self):
+        journal = self.offline.journal
+        parts = []
+        if journal.pending_count:
+            parts.append(f"Offline: {journal.pending_count} čeká na odeslání")
+        if journal.rejected_count:
+            parts.append(f"{journal.rejected_count} odmítnuto (viz {journal.rejected_path})")
+        if self.db.change_tracking_error:
+            parts.append(self.db.change_tracking_error)
+        self.var_journal.set(" | ".join(parts))
+
+    def _on_close(self):
+        self.replayer.stop()
+        self.changes.stop()
+        self.status_scheduler.stop()
+        self.destroy()
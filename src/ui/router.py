@@ -44,6 +44,24 @@ def show_page(container: ttk.Frame, app, key: str, on_test_db):
         page.grid(row=0, column=0, sticky="nsew")
         return
 
+    if key == "Standings":
+        from src.ui.screens.standings_screen import StandingsScreen
+        page = StandingsScreen(container, app)
+        page.grid(row=0, column=0, sticky="nsew")
+        return
+
+    if key == "Statistics":
+        from src.ui.screens.statistics_screen import StatisticsScreen
+        page = StatisticsScreen(container, app)
+        page.grid(row=0, column=0, sticky="nsew")
+        return
+
+    if key == "Simulation":
+        from src.ui.screens.simulation_screen import SimulationScreen
+        page = SimulationScreen(container, app)
+        page.grid(row=0, column=0, sticky="nsew")
+        return
+
     if key == "Reports":  # example reuse
         from src.ui.screens.match_events_screen import MatchEventsScreen
         page = MatchEventsScreen(container, app)
@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 from src.services.import_service import ImportService
+from src.services.multi_import_service import MultiFileImportService
+from src.services.import_job import ImportJob, Checkpoint, CANCELLED, VALIDATING
+from src.services.history_import_service import HistoryImportService
+from src.services.head_to_head_service import HeadToHeadService
+from src.services.rating_service import RatingService
+from src.services.export_service import ExportService, FORMATS
 from src.repositories.team_repository import TeamRepository
 from src.repositories.player_repository import PlayerRepository
+from src.repositories.tournament_repository import TournamentRepository
+from src.repositories.referee_repository import RefereeRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.head_to_head_repository import HeadToHeadRepository
+from src.repositories.team_rating_history_repository import TeamRatingHistoryRepository
 from src.db_mysql import DbError
 
 
@@ -18,6 +32,15 @@ class ImportScreen(ttk.Frame):
             TeamRepository(app.db),
             PlayerRepository(app.db),
         )
+        self.multi_service = MultiFileImportService(self.service)
+        self._worker: threading.Thread | None = None
+        self._outcome = None
+        self._progress = (0, 0, 0)
+        self._task: threading.Thread | None = None
+        self._task_outcome = None
+        self._task_progress: tuple[int, int, str] | None = None
+        self._task_buttons: list[ttk.Button] = []
+        self.job: ImportJob | None = None
 
         ttk.Label(self, text="Import data", font=("Arial", 20, "bold")).pack(anchor="w")
 
@@ -29,7 +52,69 @@ class ImportScreen(ttk.Frame):
         ttk.Radiobutton(box, text="Teams", variable=self.var_type, value="teams").pack(anchor="w")
         ttk.Radiobutton(box, text="Players", variable=self.var_type, value="players").pack(anchor="w")
 
-        ttk.Button(box, text="Select CSV file", command=self.select_file).pack(pady=8)
+        self.var_upsert = tk.IntVar(value=1)
+        ttk.Checkbutton(
+            box,
+            text="Upsert (update existing rows by natural key, no duplicates)",
+            variable=self.var_upsert,
+        ).pack(anchor="w", pady=(6, 0))
+
+        single = ttk.Frame(box)
+        single.pack(pady=8)
+        self.btn_single = ttk.Button(single, text="Select CSV file", command=self.select_file)
+        self.btn_single.grid(row=0, column=0)
+        self.btn_cancel = ttk.Button(single, text="Cancel", command=self.cancel_job, state="disabled")
+        self.btn_cancel.grid(row=0, column=1, padx=(10, 0))
+        self.btn_multi = ttk.Button(box, text="Select multiple CSV files", command=self.select_files)
+        self.btn_multi.pack()
+
+        self.progress = ttk.Progressbar(box, mode="determinate", length=300)
+        self.progress.pack(pady=(8, 0))
+        self.var_progress = tk.StringVar(value="")
+        ttk.Label(box, textvariable=self.var_progress).pack()
+
+        match_repo = MatchRepository(app.db)
+        self.history_service = HistoryImportService(
+            TournamentRepository(app.db),
+            TeamRepository(app.db),
+            PlayerRepository(app.db),
+            RefereeRepository(app.db),
+            match_repo,
+            MatchEventRepository(app.db),
+            HeadToHeadService(HeadToHeadRepository(app.db), match_repo),
+            RatingService(match_repo, TeamRatingHistoryRepository(app.db)),
+        )
+
+        history_box = ttk.LabelFrame(self, text="History import (CSV or JSON Lines)", padding=10)
+        history_box.pack(fill="x", pady=10)
+
+        history_kinds = (("referees", "Referees"), ("matches", "Matches"), ("events", "Match events"))
+        for col, (kind, text) in enumerate(history_kinds):
+            btn = ttk.Button(history_box, text=text, command=lambda k=kind: self.import_history(k))
+            btn.grid(row=0, column=col, padx=(10 if col else 0, 0))
+            self._task_buttons.append(btn)
+
+        self.export_service = ExportService(app.db)
+
+        export_box = ttk.LabelFrame(self, text="Export (all tables)", padding=10)
+        export_box.pack(fill="x", pady=10)
+
+        self.var_format = tk.StringVar(value=FORMATS[0])
+        ttk.Label(export_box, text="Format").grid(row=0, column=0, sticky="w")
+        ttk.Combobox(
+            export_box,
+            textvariable=self.var_format,
+            values=FORMATS,
+            state="readonly",
+            width=8,
+        ).grid(row=0, column=1, sticky="w", padx=(8, 0))
+
+        self.var_gzip = tk.IntVar(value=0)
+        ttk.Checkbutton(export_box, text="gzip", variable=self.var_gzip).grid(row=0, column=2, padx=(10, 0))
+
+        btn_export = ttk.Button(export_box, text="Select folder and export", command=self.export_all)
+        btn_export.grid(row=0, column=3, padx=(10, 0))
+        self._task_buttons.append(btn_export)
 
     def select_file(self):
         path = filedialog.askopenfilename(
@@ -39,13 +124,242 @@ class ImportScreen(ttk.Frame):
         if not path:
             return
 
+        kind = self.var_type.get()
+        upsert = bool(self.var_upsert.get())
+
+        cp = ImportJob.resumable(path, kind, upsert)
+        if cp is not None and not messagebox.askyesno(
+            "Resume import",
+            f"A previous import of this file stopped after {cp.inserted + cp.updated + cp.unchanged} rows.\n"
+            "Resume from there? (No starts over)",
+        ):
+            Checkpoint.discard(path)
+
+        try:
+            self.job = ImportJob(self.service, kind, path, upsert=upsert)
+        except DbError as e:
+            messagebox.showerror("Import error", str(e))
+            return
+
+        self.btn_single.configure(state="disabled")
+        self.btn_cancel.configure(state="normal")
+        self.progress.configure(maximum=1000, value=0)
+        self.var_progress.set("Starting...")
+        self.job.start()
+        self.after(200, self._poll_job)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.btn_cancel.configure(state="disabled")
+            self.var_progress.set("Cancelling after the current chunk...")
+
+    def _poll_job(self):
+        job = self.job
+        p = job.progress
+        self.progress.configure(value=int(p.fraction * 1000))
+
+        if job.is_running():
+            phase = "Validating" if p.state == VALIDATING else "Importing"
+            eta = f", ETA {p.eta_seconds:.0f} s" if p.eta_seconds is not None else ""
+            self.var_progress.set(f"{phase}: {p.rows} rows, {p.rows_per_sec:,.0f} rows/s{eta}")
+            self.after(200, self._poll_job)
+            return
+
+        self.btn_single.configure(state="normal")
+        self.btn_cancel.configure(state="disabled")
+
+        if job.error is not None:
+            self.var_progress.set("Import failed, it can be resumed")
+            messagebox.showerror("Import error", str(job.error))
+        elif p.state == CANCELLED:
+            self.var_progress.set(f"Cancelled after {p.rows} rows, it can be resumed")
+        else:
+            res = job.result
+            self.var_progress.set(f"Finished: {res.total} rows")
+            messagebox.showinfo(
+                "Import finished",
+                f"Inserted {res.inserted}, updated {res.updated}, unchanged {res.unchanged}",
+            )
+
+    def import_history(self, kind: str):
+        path = filedialog.askopenfilename(
+            title=f"Select {kind} file",
+            filetypes=[("CSV or JSON Lines", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        work = {
+            "referees": self.history_service.import_referees,
+            "matches": self.history_service.import_matches,
+            "events": self.history_service.import_events,
+        }[kind]
+        self._start_task(
+            lambda: work(path),
+            lambda res: self._history_done(kind, res),
+            f"Importing {kind}...",
+        )
+
+    def _history_done(self, kind: str, res):
+        if isinstance(res, Exception):
+            messagebox.showerror("Import error", str(res))
+            return
+
+        if kind == "referees":
+            msg = f"Inserted {res.inserted}, updated {res.updated}, unchanged {res.unchanged}"
+        elif kind == "matches":
+            msg = f"Imported {res.inserted} matches, skipped {res.unchanged} existing"
+        else:
+            msg = (
+                f"Imported {res.inserted} events, skipped {res.unchanged} "
+                f"(matches that already had events)"
+            )
+        messagebox.showinfo("Import finished", msg)
+
+    def _start_task(self, work, on_done, label: str):
+        """
+        Runs work() on a worker thread so long imports and exports do not block
+        Tk. on_done(result or exception) is called on the Tk thread. Work that
+        can count its steps reports them through _on_task_progress.
+        """
+        for btn in self._task_buttons:
+            btn.configure(state="disabled")
+        self.progress.configure(mode="indeterminate")
+        self.progress.start(50)
+        self.var_progress.set(label)
+        self._task_outcome = None
+        self._task_progress = None
+
+        self._task = threading.Thread(target=self._task_worker, args=(work,), daemon=True)
+        self._task.start()
+        self.after(100, self._poll_task, on_done)
+
+    def _task_worker(self, work):
+        try:
+            self._task_outcome = work()
+        except Exception as e:
+            self._task_outcome = e
+
+    def _on_task_progress(self, done: int, total: int, step: str):
+        # Called from the worker thread; only stored here, shown by _poll_task
+        self._task_progress = (done, total, step)
+
+    def _poll_task(self, on_done):
+        if self._task is not None and self._task.is_alive():
+            if self._task_progress is not None:
+                done, total, step = self._task_progress
+                self.progress.stop()
+                self.progress.configure(mode="determinate", maximum=total, value=done)
+                self.var_progress.set(f"{done} / {total} done, last: {step}")
+            self.after(100, self._poll_task, on_done)
+            return
+
+        self.progress.stop()
+        self.progress.configure(mode="determinate", value=0)
+        self.var_progress.set("")
+        for btn in self._task_buttons:
+            btn.configure(state="normal")
+        on_done(self._task_outcome)
+
+    def select_files(self):
+        paths = filedialog.askopenfilenames(
+            title="Select CSV files",
+            filetypes=[("CSV files", "*.csv")],
+        )
+        if not paths:
+            return
+
+        self.btn_multi.configure(state="disabled")
+        self.progress.configure(maximum=len(paths), value=0)
+        self.var_progress.set(f"Parsing 0 / {len(paths)} files...")
+        self._outcome = None
+        self._progress = (0, len(paths), 0)
+
+        # Parsing runs on a process pool; the writer must not block Tk either
+        self._worker = threading.Thread(
+            target=self._import_worker,
+            args=(self.var_type.get(), list(paths), bool(self.var_upsert.get())),
+            daemon=True,
+        )
+        self._worker.start()
+        self.after(100, self._poll)
+
+    def _import_worker(self, kind: str, paths: list[str], upsert: bool):
         try:
-            if self.var_type.get() == "teams":
-                count = self.service.import_teams_csv(path)
-                messagebox.showinfo("Import finished", f"Imported {count} teams")
+            self._outcome = self.multi_service.import_files(
+                kind,
+                paths,
+                upsert=upsert,
+                on_progress=self._on_progress,
+            )
+        except Exception as e:
+            self._outcome = e
+
+    def _on_progress(self, done: int, total: int, rows: int):
+        # Called from the worker thread; only stored here, shown by _poll
+        self._progress = (done, total, rows)
+
+    def _poll(self):
+        done, total, rows = self._progress
+        self.progress.configure(value=done)
+
+        if self._worker is not None and self._worker.is_alive():
+            if done < total:
+                self.var_progress.set(f"Parsing {done} / {total} files, {rows} valid rows...")
             else:
-                count = self.service.import_players_csv(path)
-                messagebox.showinfo("Import finished", f"Imported {count} players")
+                self.var_progress.set(f"Writing {rows} rows...")
+            self.after(100, self._poll)
+            return
 
-        except (DbError, ValueError) as e:
-            messagebox.showerror("Import error", str(e))
+        self.btn_multi.configure(state="normal")
+        outcome = self._outcome
+        if isinstance(outcome, Exception):
+            self.var_progress.set("")
+            messagebox.showerror("Import error", str(outcome))
+            return
+
+        totals = outcome.totals
+        self.var_progress.set(f"{len(outcome.files)} files in {outcome.seconds:.1f} s")
+
+        lines = [
+            f"Inserted {totals.inserted}, updated {totals.updated}, unchanged {totals.unchanged}",
+            "",
+        ]
+        for f in outcome.files:
+            name = os.path.basename(f.path)
+            if f.ok:
+                lines.append(f"{name}: {f.rows} rows")
+            else:
+                lines.append(f"{name}: SKIPPED, {len(f.errors)} error(s), first: {f.errors[0]}")
+
+        if outcome.failed:
+            messagebox.showwarning("Import finished with errors", "\n".join(lines))
+        else:
+            messagebox.showinfo("Import finished", "\n".join(lines))
+
+    def export_all(self):
+        directory = filedialog.askdirectory(title="Select export folder")
+        if not directory:
+            return
+
+        fmt = self.var_format.get()
+        compress = bool(self.var_gzip.get())
+        self._start_task(
+            lambda: self.export_service.export_all(
+                directory,
+                fmt=fmt,
+                compress=compress,
+                on_progress=self._on_task_progress,
+            ),
+            self._export_done,
+            "Exporting...",
+        )
+
+    def _export_done(self, results):
+        if isinstance(results, Exception):
+            messagebox.showerror("Export error", str(results))
+            return
+
+        lines = [f"{r.table}: {r.rows} rows ({r.rows_per_sec:,.0f} rows/s)" for r in results]
+        messagebox.showinfo("Export finished", "\n".join(lines))
@@ -76,7 +76,11 @@ class MatchEventsScreen(ttk.Frame):
         ]:
             self.tree.heading(col, text=txt)
 
+        self._shown_match: int | None = None
+        app.changes.subscribe(self, ("match_event",), self._reload_events)
+
     def load_events(self, match_id: int):
+        self._shown_match = match_id
         self.tree.delete(*self.tree.get_children())
         try:
             for e in self.repo.list_by_match(match_id):
@@ -94,6 +98,10 @@ class MatchEventsScreen(ttk.Frame):
         except DbError as e:
             messagebox.showerror("DB error", str(e))
 
+    def _reload_events(self):
+        if self._shown_match is not None:
+            self.load_events(self._shown_match)
+
     def add_event(self):
         try:
             match_id = int(self.var_match.get())
@@ -113,7 +121,13 @@ class MatchEventsScreen(ttk.Frame):
                 created_at=None,
             )
 
-            self.repo.insert(event)
+            if self.app.offline.insert_event(event) is None:
+                messagebox.showwarning(
+                    "Offline",
+                    "Databáze není dostupná. Událost je uložena v lokálním deníku "
+                    "a odešle se automaticky po obnovení spojení.",
+                )
+                return
             self.load_events(match_id)
 
         except ValueError:
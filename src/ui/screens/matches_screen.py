@@ -14,6 +14,13 @@ from src.repositories.match_repository import MatchRepository
 from src.repositories.tournament_repository import TournamentRepository
 from src.repositories.team_repository import TeamRepository
 from src.repositories.referee_repository import RefereeRepository
+from src.repositories.team_rating_history_repository import TeamRatingHistoryRepository
+from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.head_to_head_repository import HeadToHeadRepository
+from src.services.rating_service import RatingService
+from src.services.discipline_service import DisciplineService
+from src.services.head_to_head_service import HeadToHeadService
+from src.services.match_status_service import MatchStatusService
 
 STATUSES = ("scheduled", "live", "finished", "cancelled")
 
@@ -182,6 +189,15 @@ class MatchesScreen(ttk.Frame):
         self.tournament_repo = TournamentRepository(app.db)
         self.team_repo = TeamRepository(app.db)
         self.ref_repo = RefereeRepository(app.db)
+        self.rating_service = RatingService(self.match_repo, TeamRatingHistoryRepository(app.db))
+        self.discipline_service = DisciplineService(DisciplineRepository(app.db))
+        self.h2h_service = HeadToHeadService(HeadToHeadRepository(app.db), self.match_repo)
+        self.status_service = MatchStatusService(
+            self.match_repo,
+            self.rating_service,
+            self.discipline_service,
+            self.h2h_service,
+        )
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
@@ -195,9 +211,19 @@ class MatchesScreen(ttk.Frame):
         toolbar = ttk.Frame(header)
         toolbar.grid(row=0, column=1, sticky="e")
         ttk.Button(toolbar, text="Refresh", command=self.load_data).pack(side="right")
+        ttk.Button(toolbar, text="Změnit status", command=self.set_status_selected).pack(side="right", padx=(0, 8))
+        self.var_status = tk.StringVar(value="cancelled")
+        ttk.Combobox(
+            toolbar,
+            textvariable=self.var_status,
+            values=[s for s in STATUSES if s != "finished"],
+            state="readonly",
+            width=10,
+        ).pack(side="right", padx=(0, 4))
+        ttk.Button(toolbar, text="Ukončit zápas", command=self.finish_selected).pack(side="right", padx=(0, 8))
         ttk.Button(toolbar, text="Vytvořit zápas", command=self.create_match).pack(side="right", padx=(0, 8))
 
-        cols = ("id", "tournament", "home", "away", "start", "status", "ot")
+        cols = ("id", "tournament", "home", "away", "score", "start", "status", "ot")
         self.tree = ttk.Treeview(self, columns=cols, show="headings", height=18)
         self.tree.grid(row=1, column=0, sticky="nsew", pady=(10, 0))
 
@@ -205,6 +231,7 @@ class MatchesScreen(ttk.Frame):
         self.tree.heading("tournament", text="Turnaj")
         self.tree.heading("home", text="Home")
         self.tree.heading("away", text="Away")
+        self.tree.heading("score", text="Skóre")
         self.tree.heading("start", text="Start")
         self.tree.heading("status", text="Status")
         self.tree.heading("ot", text="OT")
@@ -213,6 +240,7 @@ class MatchesScreen(ttk.Frame):
         self.tree.column("tournament", width=220, anchor="w")
         self.tree.column("home", width=200, anchor="w")
         self.tree.column("away", width=200, anchor="w")
+        self.tree.column("score", width=70, anchor="center")
         self.tree.column("start", width=150, anchor="center")
         self.tree.column("status", width=90, anchor="center")
         self.tree.column("ot", width=60, anchor="center")
@@ -222,11 +250,15 @@ class MatchesScreen(ttk.Frame):
         self.tree.configure(yscrollcommand=sb.set)
 
         self.load_data()
+        app.changes.subscribe(self, ("matches", "tournament", "team"), self.load_data)
 
     def _clear(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
 
+    def _get_selected_ids(self) -> list[int]:
+        return [int(self.tree.item(item, "values")[0]) for item in self.tree.selection()]
+
     def load_data(self):
         try:
             self._clear()
@@ -240,6 +272,7 @@ class MatchesScreen(ttk.Frame):
                         r["tournament_name"],
                         r["home_team_name"],
                         r["away_team_name"],
+                        f"{r['home_goals']}:{r['away_goals']}",
                         r["start_time"],
                         r["status"],
                         "yes" if r["is_overtime"] else "no",
@@ -276,7 +309,70 @@ class MatchesScreen(ttk.Frame):
 
         try:
             new_id = self.match_repo.create_match_with_referees(match, referee_ids)
+            eligibility = self.discipline_service.eligibility(
+                match.tournament_id, [match.home_team_id, match.away_team_id]
+            )
+            h2h = self.h2h_service.between(match.home_team_id, match.away_team_id)
+            self.load_data()
+
+            msg = f"Zápas vytvořen (ID: {new_id})."
+            if h2h.matches:
+                msg += (
+                    f"\n\nVzájemné zápasy: {h2h.matches} "
+                    f"(V {h2h.wins} / R {h2h.draws} / P {h2h.losses}, skóre {h2h.goals_for}:{h2h.goals_against})"
+                )
+            if eligibility.suspended:
+                ids = ", ".join(str(pid) for pid in sorted(eligibility.suspended))
+                msg += f"\n\nSuspendovaní hráči (nesmí nastoupit): {ids}"
+            messagebox.showinfo("OK", msg)
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def finish_selected(self):
+        match_ids = self._get_selected_ids()
+        if not match_ids:
+            messagebox.showwarning("Pozor", "Vyber zápas v tabulce.")
+            return
+
+        if not messagebox.askyesno(
+            "Potvrzení", f"Ukončit {len(match_ids)} zápas(y) a přepočítat rating týmů?"
+        ):
+            return
+
+        try:
+            result = self.status_service.finish(match_ids)
+            self.load_data()
+
+            if result.failed:
+                errors = "\n".join(f"{mid}: {err}" for mid, err in sorted(result.failed.items()))
+                messagebox.showwarning(
+                    "Pozor",
+                    f"Ukončeno zápasů: {len(match_ids)}, přepočet selhal u {len(result.failed)} "
+                    f"(zopakuje se automaticky):\n{errors}",
+                )
+            elif len(match_ids) > 1:
+                applied = sum(1 for d in result.deltas.values() if d is not None)
+                messagebox.showinfo("OK", f"Ukončeno zápasů: {len(match_ids)} (rating započítán u {applied}).")
+            elif result.deltas[match_ids[0]] is None:
+                messagebox.showinfo("OK", "Zápas ukončen (rating už byl započítán).")
+            else:
+                messagebox.showinfo("OK", f"Zápas ukončen. Změna ratingu domácích: {result.deltas[match_ids[0]]:+.2f}")
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def set_status_selected(self):
+        match_ids = self._get_selected_ids()
+        if not match_ids:
+            messagebox.showwarning("Pozor", "Vyber zápas v tabulce.")
+            return
+
+        status = self.var_status.get()
+        if not messagebox.askyesno("Potvrzení", f"Nastavit status '{status}' u {len(match_ids)} zápas(ů)?"):
+            return
+
+        try:
+            changed = self.match_repo.set_status_many(match_ids, status)
             self.load_data()
-            messagebox.showinfo("OK", f"Zápas vytvořen (ID: {new_id}).")
+            messagebox.showinfo("OK", f"Status změněn u {changed} zápas(ů).")
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
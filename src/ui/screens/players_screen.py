@@ -3,7 +3,7 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from src.db_mysql import DbError
+from src.db_mysql import ConflictError, DbError
 from src.models.player import Player
 from src.models.team import Team
 from src.repositories.player_repository import PlayerRepository
@@ -75,6 +75,7 @@ class PlayersScreen(ttk.Frame):
         self.tree.bind("<Double-1>", lambda _e: self.edit_selected())
 
         self.load_teams()
+        app.changes.subscribe(self, ("player",), self.load_players)
 
     def _clear(self):
         for item in self.tree.get_children():
@@ -86,6 +87,9 @@ class PlayersScreen(ttk.Frame):
             return None
         return int(self.tree.item(sel[0], "values")[0])
 
+    def _get_selected_player_ids(self) -> list[int]:
+        return [int(self.tree.item(item, "values")[0]) for item in self.tree.selection()]
+
     def _get_selected_team_id(self) -> int | None:
         """
         Returns:
@@ -191,28 +195,31 @@ class PlayersScreen(ttk.Frame):
             last_name=dlg.result.last_name,
             birth_date=dlg.result.birth_date,
             position=dlg.result.position,
+            version=current.version,
         )
 
         try:
             self.player_repo.update(edited)
             self.load_players()
             messagebox.showinfo("OK", "Hráč upraven.")
+        except ConflictError as e:
+            messagebox.showwarning("Konflikt", f"Záznam mezitím upravil někdo jiný, načti ho znovu.\n\n{e}")
+            self.load_players()
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
 
     def delete_selected(self):
-        pid = self._get_selected_player_id()
-        if pid is None:
+        ids = self._get_selected_player_ids()
+        if not ids:
             messagebox.showwarning("Pozor", "Vyber hráče v tabulce.")
             return
 
-        if not messagebox.askyesno("Potvrzení", f"Opravdu smazat hráče ID {pid}?"):
+        if not messagebox.askyesno("Potvrzení", f"Opravdu smazat {len(ids)} hráč(e/ů)?"):
             return
 
         try:
-            self.player_repo.delete(pid)
+            deleted = self.player_repo.delete_many(ids)
             self.load_players()
-            messagebox.showinfo("OK", "Hráč smazán.")
+            messagebox.showinfo("OK", f"Smazáno hráčů: {deleted}.")
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
-
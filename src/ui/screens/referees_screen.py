@@ -108,6 +108,7 @@ class RefereesScreen(ttk.Frame):
             self.tree.heading(col, text=text)
 
         self.load_data()
+        app.changes.subscribe(self, ("referee",), self.load_data)
 
     def load_data(self):
         self.tree.delete(*self.tree.get_children())
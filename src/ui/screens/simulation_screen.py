@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.db_mysql import DbError
+from src.models.tournament import Tournament
+from src.repositories.match_event_repository import MatchEventRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_repository import TeamRepository
+from src.repositories.tournament_repository import TournamentRepository
+from src.services.simulation_service import SimulationService, DEFAULT_SIMULATIONS
+
+
+class SimulationScreen(ttk.Frame):
+    def __init__(self, parent, app):
+        super().__init__(parent, padding=10)
+        self.app = app
+
+        self.tournament_repo = TournamentRepository(app.db)
+        self.team_repo = TeamRepository(app.db)
+        self.service = SimulationService(
+            MatchRepository(app.db),
+            self.team_repo,
+            MatchEventRepository(app.db),
+        )
+
+        self.tournaments: list[Tournament] = []
+        self._worker: threading.Thread | None = None
+        self._outcome = None
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        ttk.Label(self, text="Simulace turnaje", font=("Arial", 20, "bold")).grid(row=0, column=0, sticky="w")
+
+        form = ttk.Frame(self)
+        form.grid(row=1, column=0, sticky="ew", pady=10)
+
+        ttk.Label(form, text="Turnaj").grid(row=0, column=0)
+        self.var_tournament = tk.StringVar(value="")
+        self.cb_tournament = ttk.Combobox(form, textvariable=self.var_tournament, state="readonly", width=40)
+        self.cb_tournament.grid(row=0, column=1, padx=(8, 0))
+
+        ttk.Label(form, text="Počet simulací").grid(row=0, column=2, padx=(10, 0))
+        self.var_sims = tk.StringVar(value=str(DEFAULT_SIMULATIONS))
+        ttk.Entry(form, textvariable=self.var_sims, width=10).grid(row=0, column=3, padx=(8, 0))
+
+        self.btn_run = ttk.Button(form, text="Spustit", command=self.run)
+        self.btn_run.grid(row=0, column=4, padx=(10, 0))
+
+        self.var_info = tk.StringVar(value="")
+        ttk.Label(form, textvariable=self.var_info).grid(row=0, column=5, padx=(10, 0))
+
+        cols = ("team", "rating", "win", "top3", "avg_pos")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=18)
+        self.tree.grid(row=2, column=0, sticky="nsew")
+
+        self.tree.heading("team", text="Tým")
+        self.tree.heading("rating", text="Rating")
+        self.tree.heading("win", text="Výhra %")
+        self.tree.heading("top3", text="Top 3 %")
+        self.tree.heading("avg_pos", text="Prům. pozice")
+
+        self.tree.column("team", width=260, anchor="w")
+        self.tree.column("rating", width=90, anchor="center")
+        self.tree.column("win", width=90, anchor="center")
+        self.tree.column("top3", width=90, anchor="center")
+        self.tree.column("avg_pos", width=110, anchor="center")
+
+        self.load_tournaments()
+
+    def load_tournaments(self):
+        try:
+            self.tournaments = self.tournament_repo.list()
+            self.cb_tournament["values"] = [f"{t.name} (ID {t.tournament_id})" for t in self.tournaments]
+            if self.tournaments:
+                self.cb_tournament.current(0)
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def run(self):
+        idx = self.cb_tournament.current()
+        if idx is None or idx < 0:
+            messagebox.showwarning("Pozor", "Vyber turnaj.")
+            return
+
+        try:
+            simulations = int(self.var_sims.get())
+        except ValueError:
+            messagebox.showerror("Chyba", "Počet simulací musí být celé číslo.")
+            return
+
+        tournament_id = int(self.tournaments[idx].tournament_id)
+
+        self.btn_run.configure(state="disabled")
+        self.var_info.set("Probíhá simulace...")
+        self._outcome = None
+
+        # The simulation takes seconds, keep Tk responsive
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            args=(tournament_id, simulations),
+            daemon=True,
+        )
+        self._worker.start()
+        self.after(100, self._poll)
+
+    def _run_worker(self, tournament_id: int, simulations: int):
+        try:
+            self._outcome = self.service.simulate_tournament(tournament_id, simulations)
+        except Exception as e:
+            self._outcome = e
+
+    def _poll(self):
+        if self._worker is not None and self._worker.is_alive():
+            self.after(100, self._poll)
+            return
+
+        self.btn_run.configure(state="normal")
+        outcome = self._outcome
+        if isinstance(outcome, Exception):
+            self.var_info.set("")
+            messagebox.showerror("Chyba", str(outcome))
+            return
+
+        self.var_info.set(f"{outcome.simulations} simulací za {outcome.seconds:.1f} s")
+        self._show(outcome)
+
+    def _show(self, result):
+        self.tree.delete(*self.tree.get_children())
+        try:
+            teams = {t.team_id: t for t in self.team_repo.list(include_deleted=True)}
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+            return
+
+        ordered = sorted(result.team_ids, key=result.expected_position)
+        for team_id in ordered:
+            t = teams.get(team_id)
+            dist = result.positions[team_id]
+            self.tree.insert(
+                "",
+                "end",
+                values=(
+                    f"{t.class_name} - {t.name}" if t else f"ID {team_id}",
+                    f"{t.rating:.0f}" if t else "",
+                    f"{dist[0] * 100:.1f}",
+                    f"{sum(dist[:3]) * 100:.1f}",
+                    f"{result.expected_position(team_id):.2f}",
+                ),
+            )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.db_mysql import DbError
+from src.models.tournament import Tournament
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_repository import TeamRepository
+from src.repositories.tournament_repository import TournamentRepository
+from src.services.standings_service import StandingsService
+
+
+class StandingsScreen(ttk.Frame):
+    def __init__(self, parent, app):
+        super().__init__(parent, padding=10)
+        self.app = app
+
+        self.tournament_repo = TournamentRepository(app.db)
+        self.team_repo = TeamRepository(app.db)
+        self.service = StandingsService(MatchRepository(app.db))
+
+        self.tournaments: list[Tournament] = []
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        header = ttk.Frame(self)
+        header.grid(row=0, column=0, sticky="ew")
+        header.columnconfigure(0, weight=1)
+
+        ttk.Label(header, text="Tabulka", font=("Arial", 20, "bold")).grid(row=0, column=0, sticky="w")
+        ttk.Button(header, text="Refresh", command=self.load_data).grid(row=0, column=1, sticky="e")
+
+        top = ttk.Frame(self)
+        top.grid(row=1, column=0, sticky="ew", pady=(10, 0))
+        ttk.Label(top, text="Turnaj:").pack(side="left")
+        self.var_tournament = tk.StringVar(value="")
+        self.cb_tournament = ttk.Combobox(top, textvariable=self.var_tournament, state="readonly", width=40)
+        self.cb_tournament.pack(side="left", padx=(8, 0))
+        self.cb_tournament.bind("<<ComboboxSelected>>", lambda _e: self.load_data())
+
+        cols = ("pos", "team", "played", "w", "d", "l", "score", "gd", "pts")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=18)
+        self.tree.grid(row=2, column=0, sticky="nsew", pady=(10, 0))
+
+        for key, text, width in [
+            ("pos", "#", 40), ("team", "Tým", 260), ("played", "Z", 50), ("w", "V", 50),
+            ("d", "R", 50), ("l", "P", 50), ("score", "Skóre", 80), ("gd", "+/-", 60), ("pts", "Body", 60),
+        ]:
+            self.tree.heading(key, text=text)
+            self.tree.column(key, width=width, anchor="w" if key == "team" else "center")
+
+        sb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        sb.grid(row=2, column=1, sticky="ns", pady=(10, 0))
+        self.tree.configure(yscrollcommand=sb.set)
+
+        self.load_tournaments()
+
+    def load_tournaments(self):
+        try:
+            self.tournaments = self.tournament_repo.list()
+            self.cb_tournament["values"] = [f"{t.name} (ID {t.tournament_id})" for t in self.tournaments]
+            if self.tournaments:
+                self.cb_tournament.current(0)
+            self.load_data()
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def load_data(self):
+        self.tree.delete(*self.tree.get_children())
+        idx = self.cb_tournament.current()
+        if idx is None or idx < 0 or idx >= len(self.tournaments):
+            return
+
+        try:
+            rows = self.service.table(int(self.tournaments[idx].tournament_id))
+            names = {t.team_id: f"{t.class_name} - {t.name}" for t in self.team_repo.list(include_deleted=True)}
+            for r in rows:
+                self.tree.insert(
+                    "",
+                    "end",
+                    values=(
+                        r.position,
+                        names.get(r.team_id, f"ID {r.team_id}"),
+                        r.played,
+                        r.wins,
+                        r.draws,
+                        r.losses,
+                        f"{r.goals_for}:{r.goals_against}",
+                        f"{r.goal_diff:+d}",
+                        r.points,
+                    ),
+                )
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
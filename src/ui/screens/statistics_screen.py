@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.db_mysql import DbError
+from src.models.tournament import Tournament
+from src.repositories.stats_repository import StatsRepository
+from src.repositories.team_repository import TeamRepository
+from src.repositories.tournament_repository import TournamentRepository
+from src.services.statistics_service import StatisticsService
+
+LEADERBOARD_SIZE = 20
+
+
+class StatisticsScreen(ttk.Frame):
+    def __init__(self, parent, app):
+        super().__init__(parent, padding=10)
+        self.app = app
+
+        self.tournament_repo = TournamentRepository(app.db)
+        self.team_repo = TeamRepository(app.db)
+        self.service = StatisticsService(StatsRepository(app.db))
+
+        self.tournaments: list[Tournament] = []
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        header = ttk.Frame(self)
+        header.grid(row=0, column=0, sticky="ew")
+        header.columnconfigure(0, weight=1)
+
+        ttk.Label(header, text="Statistiky", font=("Arial", 20, "bold")).grid(row=0, column=0, sticky="w")
+
+        toolbar = ttk.Frame(header)
+        toolbar.grid(row=0, column=1, sticky="e")
+        ttk.Button(toolbar, text="Refresh", command=self.load_data).pack(side="right")
+        ttk.Button(toolbar, text="Přepočítat", command=self.rebuild).pack(side="right", padx=(0, 8))
+
+        top = ttk.Frame(self)
+        top.grid(row=1, column=0, sticky="ew", pady=(10, 0))
+        ttk.Label(top, text="Turnaj:").pack(side="left")
+        self.var_tournament = tk.StringVar(value="")
+        self.cb_tournament = ttk.Combobox(top, textvariable=self.var_tournament, state="readonly", width=40)
+        self.cb_tournament.pack(side="left", padx=(8, 0))
+        self.cb_tournament.bind("<<ComboboxSelected>>", lambda _e: self.load_data())
+
+        tabs = ttk.Notebook(self)
+        tabs.grid(row=2, column=0, sticky="nsew", pady=(10, 0))
+
+        self.tree_scorers = self._make_tree(
+            tabs, "Střelci",
+            [("player", "Hráč", 220), ("team", "Tým", 180), ("goals", "Góly", 70),
+             ("xg", "xG", 70), ("matches", "Zápasy", 70)],
+        )
+        self.tree_cards = self._make_tree(
+            tabs, "Karty",
+            [("player", "Hráč", 220), ("team", "Tým", 180), ("reds", "Červené", 80),
+             ("yellows", "Žluté", 80)],
+        )
+        self.tree_teams = self._make_tree(
+            tabs, "Týmy",
+            [("team", "Tým", 220), ("goals", "Góly", 70), ("own_goals", "Vlastní", 70),
+             ("yellows", "Žluté", 70), ("reds", "Červené", 70), ("xg", "xG", 70)],
+        )
+
+        self.load_tournaments()
+
+    @staticmethod
+    def _make_tree(tabs: ttk.Notebook, title: str, columns: list[tuple[str, str, int]]) -> ttk.Treeview:
+        frame = ttk.Frame(tabs)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        tabs.add(frame, text=title)
+
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings", height=16)
+        tree.grid(row=0, column=0, sticky="nsew")
+        for key, text, width in columns:
+            tree.heading(key, text=text)
+            tree.column(key, width=width, anchor="w" if key in ("player", "team") else "center")
+        return tree
+
+    def _selected_tournament_id(self) -> int | None:
+        idx = self.cb_tournament.current()
+        if idx is None or idx < 0 or idx >= len(self.tournaments):
+            return None
+        return int(self.tournaments[idx].tournament_id)
+
+    def load_tournaments(self):
+        try:
+            self.tournaments = self.tournament_repo.list()
+            self.cb_tournament["values"] = [f"{t.name} (ID {t.tournament_id})" for t in self.tournaments]
+            if self.tournaments:
+                self.cb_tournament.current(0)
+            self.load_data()
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def load_data(self):
+        tournament_id = self._selected_tournament_id()
+        for tree in (self.tree_scorers, self.tree_cards, self.tree_teams):
+            tree.delete(*tree.get_children())
+        if tournament_id is None:
+            return
+
+        try:
+            for r in self.service.top_scorers(tournament_id, LEADERBOARD_SIZE):
+                self.tree_scorers.insert(
+                    "", "end",
+                    values=(f"{r['first_name']} {r['last_name']}", r["team_name"] or "",
+                            r["goals"], f"{r['xg_sum']:.2f}", r["matches_with_events"]),
+                )
+
+            for r in self.service.most_carded(tournament_id, LEADERBOARD_SIZE):
+                if not r["reds"] and not r["yellows"]:
+                    break
+                self.tree_cards.insert(
+                    "", "end",
+                    values=(f"{r['first_name']} {r['last_name']}", r["team_name"] or "",
+                            r["reds"], r["yellows"]),
+                )
+
+            names = {t.team_id: f"{t.class_name} - {t.name}" for t in self.team_repo.list(include_deleted=True)}
+            for s in self.service.team_totals(tournament_id):
+                self.tree_teams.insert(
+                    "", "end",
+                    values=(names.get(s.team_id, f"ID {s.team_id}"), s.goals, s.own_goals,
+                            s.yellows, s.reds, f"{s.xg_sum:.2f}"),
+                )
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def rebuild(self):
+        tournament_id = self._selected_tournament_id()
+        if tournament_id is None:
+            messagebox.showwarning("Pozor", "Vyber turnaj.")
+            return
+
+        try:
+            self.service.rebuild(tournament_id)
+            self.load_data()
+            messagebox.showinfo("OK", "Statistiky přepočítány z událostí zápasů.")
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
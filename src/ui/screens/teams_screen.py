@@ -3,9 +3,12 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from src.db_mysql import DbError
+from src.db_mysql import ConflictError, DbError
 from src.models.team import Team
 from src.repositories.team_repository import TeamRepository
+from src.repositories.match_repository import MatchRepository
+from src.repositories.team_rating_history_repository import TeamRatingHistoryRepository
+from src.services.rating_service import RatingService
 
 
 class TeamDialog(tk.Toplevel):
@@ -89,6 +92,7 @@ class TeamsScreen(ttk.Frame):
         super().__init__(parent, padding=10)
         self.app = app
         self.repo = TeamRepository(app.db)
+        self.rating_service = RatingService(MatchRepository(app.db), TeamRatingHistoryRepository(app.db))
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(2, weight=1)
@@ -103,6 +107,7 @@ class TeamsScreen(ttk.Frame):
         toolbar.grid(row=0, column=1, sticky="e")
 
         ttk.Button(toolbar, text="Refresh", command=self.load_data).pack(side="right")
+        ttk.Button(toolbar, text="Přepočítat rating", command=self.recompute_ratings).pack(side="right", padx=(0, 8))
         ttk.Button(toolbar, text="Restore", command=self.restore_selected).pack(side="right", padx=(0, 8))
         ttk.Button(toolbar, text="Soft delete", command=self.soft_delete_selected).pack(side="right", padx=(0, 8))
         ttk.Button(toolbar, text="Upravit", command=self.edit_selected).pack(side="right", padx=(0, 8))
@@ -143,6 +148,7 @@ class TeamsScreen(ttk.Frame):
         self.tree.bind("<Double-1>", lambda _e: self.edit_selected())
 
         self.load_data()
+        app.changes.subscribe(self, ("team",), self.load_data)
 
     def _clear(self):
         for item in self.tree.get_children():
@@ -154,6 +160,9 @@ class TeamsScreen(ttk.Frame):
             return None
         return int(self.tree.item(sel[0], "values")[0])
 
+    def _get_selected_ids(self) -> list[int]:
+        return [int(self.tree.item(item, "values")[0]) for item in self.tree.selection()]
+
     def load_data(self):
         try:
             self._clear()
@@ -210,40 +219,61 @@ class TeamsScreen(ttk.Frame):
             class_name=dlg.result.class_name,
             rating=dlg.result.rating,
             is_deleted=current.is_deleted,
+            version=current.version,
         )
 
         try:
             self.repo.update(edited)
             self.load_data()
             messagebox.showinfo("OK", "Tým upraven.")
+        except ConflictError as e:
+            messagebox.showwarning("Konflikt", f"Záznam mezitím upravil někdo jiný, načti ho znovu.\n\n{e}")
+            self.load_data()
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
 
     def soft_delete_selected(self):
-        team_id = self._get_selected_id()
-        if team_id is None:
+        team_ids = self._get_selected_ids()
+        if not team_ids:
             messagebox.showwarning("Pozor", "Vyber tým v tabulce.")
             return
 
-        if not messagebox.askyesno("Potvrzení", f"Opravdu soft-delete tým ID {team_id}?"):
+        if not messagebox.askyesno("Potvrzení", f"Opravdu soft-delete {len(team_ids)} tým(ů)?"):
             return
 
         try:
-            self.repo.soft_delete(team_id)
+            changed = self.repo.soft_delete_many(team_ids)
             self.load_data()
-            messagebox.showinfo("OK", "Tým byl označen jako smazaný (is_deleted=1).")
+            messagebox.showinfo("OK", f"Označeno jako smazané (is_deleted=1): {changed}.")
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
 
     def restore_selected(self):
-        team_id = self._get_selected_id()
-        if team_id is None:
+        team_ids = self._get_selected_ids()
+        if not team_ids:
             messagebox.showwarning("Pozor", "Vyber tým v tabulce.")
             return
 
         try:
-            self.repo.restore(team_id)
+            changed = self.repo.restore_many(team_ids)
+            self.load_data()
+            messagebox.showinfo("OK", f"Obnoveno (is_deleted=0): {changed}.")
+        except DbError as e:
+            messagebox.showerror("DB ERROR", str(e))
+
+    def recompute_ratings(self):
+        if not messagebox.askyesno(
+            "Potvrzení",
+            "Přepočítat rating všech týmů ze všech ukončených zápasů? Ruční úpravy ratingu budou přepsány.",
+        ):
+            return
+
+        try:
+            res = self.rating_service.replay_all()
             self.load_data()
-            messagebox.showinfo("OK", "Tým byl obnoven (is_deleted=0).")
+            messagebox.showinfo(
+                "OK",
+                f"Rating přepočítán: {res.matches} zápasů, {res.teams} týmů ({res.seconds:.2f} s).",
+            )
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
@@ -4,7 +4,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date
 
-from src.db_mysql import DbError, ValidationError
+from src.db_mysql import ConflictError, DbError, ValidationError
 from src.models.tournament import Tournament
 from src.repositories.tournament_repository import TournamentRepository
 
@@ -152,6 +152,7 @@ class TournamentsScreen(ttk.Frame):
         self.tree.bind("<Double-1>", lambda _e: self.edit_selected())
 
         self.load_data()
+        app.changes.subscribe(self, ("tournament",), self.load_data)
 
     def _clear(self):
         for item in self.tree.get_children():
@@ -219,12 +220,16 @@ class TournamentsScreen(ttk.Frame):
             start_date=dlg.result.start_date,
             end_date=dlg.result.end_date,
             is_active=dlg.result.is_active,
+            version=current.version,
         )
 
         try:
             self.repo.update(edited)
             self.load_data()
             messagebox.showinfo("OK", "Turnaj byl upraven.")
+        except ConflictError as e:
+            messagebox.showwarning("Konflikt", f"Záznam mezitím upravil někdo jiný, načti ho znovu.\n\n{e}")
+            self.load_data()
         except DbError as e:
             messagebox.showerror("DB ERROR", str(e))
 
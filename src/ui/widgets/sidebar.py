@@ -13,6 +13,9 @@ class Sidebar(ttk.Frame):
             ("Hráči", "Players"),
             ("Referees", "Referees"),
             ("Zápasy", "Matches"),
+            ("Tabulka", "Standings"),
+            ("Statistiky", "Statistics"),
+            ("Simulace", "Simulation"),
             ("Import", "Import"),
             ("Reporty", "Reports"),
         ]